@@ -0,0 +1,154 @@
+"""
+Measures the throughput, latency and peak memory of the client's search,
+predict and upload paths against a local FakeCitrinationServer, along
+with the client-side work of each: query serialization, search hit parsing
+and prediction request bodies.
+
+Usage:
+
+    python benchmarks/bench_client.py [--latency MS] [--hits N] [--only NAME ...] [--json]
+
+The client must be importable, e.g. installed with ``pip install -e .``
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+from pypif.util.case import keys_to_snake_case
+from requests.models import Response
+
+from citrination_client import CitrinationClient
+from citrination_client.base.response_handling import get_response_json
+from citrination_client.search import PifSearchHit, PifSearchResult, PifSystemReturningQuery, DataQuery, DatasetQuery, Filter
+from citrination_client.search.query_encoder import QueryEncoder, encode_query
+from citrination_client.search.result_decoder import decode_search_result
+from citrination_client.testing import FakeCitrinationServer, SyntheticCorpus
+
+from bench_query_pagination import build_deep_query
+from harness import measure, print_results
+
+
+def bench_query_encoder(args, client):
+    query = build_deep_query(args.properties)
+    return lambda: encode_query(query, sort_keys=True)
+
+
+def bench_query_encoder_stdlib(args, client):
+    query = build_deep_query(args.properties)
+    return lambda: json.dumps(query.as_dictionary(), cls=QueryEncoder, sort_keys=True)
+
+
+def bench_hit_parsing(args, client):
+    corpus = SyntheticCorpus(num_properties=args.properties)
+    hits = [corpus.hit(i) for i in range(args.page_size)]
+
+    def parse():
+        for hit in hits:
+            PifSearchHit(**keys_to_snake_case(hit)).system
+    return parse
+
+
+def _page_response(args):
+    corpus = SyntheticCorpus(num_properties=args.properties)
+    results = {"took": 1, "totalNumHits": args.hits, "maxScore": 1.0,
+               "hits": [corpus.hit(i) for i in range(args.page_size)]}
+    response = Response()
+    response.status_code = 200
+    response._content = json.dumps({"results": results}).encode("utf-8")
+    return response
+
+
+def bench_page_decoding(args, client):
+    response = _page_response(args)
+    return lambda: decode_search_result(PifSearchResult, get_response_json(response)["results"])
+
+
+def bench_page_decoding_stdlib(args, client):
+    response = _page_response(args)
+    return lambda: PifSearchResult(**keys_to_snake_case(response.json()["results"]))
+
+
+def bench_search_pagination(args, client):
+    query = PifSystemReturningQuery(
+        size=args.hits,
+        query=DataQuery(dataset=DatasetQuery(id=Filter(equal="1"))))
+    return lambda: client.search.pif_search(query)
+
+
+def bench_predict_body(args, client):
+    candidates = [{"Property {}".format(p): str(i + p) for p in range(args.properties)} for i in range(args.candidates)]
+    return lambda: json.dumps(client.models._get_predict_body(candidates))
+
+
+def bench_predict(args, client):
+    candidates = [{"Property {}".format(p): str(i + p) for p in range(args.properties)} for i in range(args.candidates)]
+    return lambda: client.models.predict("1", candidates)
+
+
+def bench_upload(args, client):
+    directory = tempfile.mkdtemp(prefix="citrination-bench-")
+    args.cleanup.append(directory)
+    contents = os.urandom(args.file_size)
+    for i in range(args.files):
+        with open(os.path.join(directory, "file_{}.json".format(i)), "wb") as f:
+            f.write(contents)
+    dataset = client.data.create_dataset(name="benchmark uploads")
+    return lambda: client.data.upload(dataset.id, directory, max_workers=args.upload_workers)
+
+
+BENCHMARKS = [
+    ("query_encoder", bench_query_encoder),
+    ("query_encoder_stdlib", bench_query_encoder_stdlib),
+    ("hit_parsing", bench_hit_parsing),
+    ("page_decoding", bench_page_decoding),
+    ("page_decoding_stdlib", bench_page_decoding_stdlib),
+    ("search_pagination", bench_search_pagination),
+    ("predict_body", bench_predict_body),
+    ("predict", bench_predict),
+    ("upload", bench_upload),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency per request, in milliseconds")
+    parser.add_argument("--hits", type=int, default=1000, help="Hits matched by each search")
+    parser.add_argument("--page-size", type=int, default=100, help="Hits returned per search request")
+    parser.add_argument("--properties", type=int, default=10, help="Properties per PIF and per candidate")
+    parser.add_argument("--candidates", type=int, default=500, help="Candidates per prediction")
+    parser.add_argument("--files", type=int, default=20, help="Files per directory upload")
+    parser.add_argument("--file-size", type=int, default=64 * 1024, help="Bytes per uploaded file")
+    parser.add_argument("--upload-workers", type=int, default=4, help="Concurrent file uploads")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per benchmark")
+    parser.add_argument("--only", nargs="+", choices=[name for name, _ in BENCHMARKS], help="Benchmarks to run")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+    args.cleanup = []
+
+    server = FakeCitrinationServer(
+        corpus=SyntheticCorpus(num_pifs=args.hits, num_properties=args.properties),
+        latency=args.latency / 1000.0, max_page_size=args.page_size,
+        rate_limit_rate=args.rate_limit_rate, retry_after=0, seed=0)
+    results = []
+    with server:
+        client = CitrinationClient("benchmark-key", server.url)
+        try:
+            for name, setup in BENCHMARKS:
+                if args.only and name not in args.only:
+                    continue
+                results.append(measure(name, setup(args, client), repeat=args.repeat))
+        finally:
+            for directory in args.cleanup:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps([result.as_dictionary() for result in results], indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
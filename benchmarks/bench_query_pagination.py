@@ -0,0 +1,82 @@
+"""
+Measures the client-side cost of preparing the request body for each page
+of a paginated search, comparing the old approach (deep copying the query
+and re-encoding it with the QueryEncoder on every page) with encoding the
+query once and patching only the pagination fields.
+
+Usage:
+
+    python benchmarks/bench_query_pagination.py [--properties N] [--pages N]
+
+The client must be importable, e.g. installed with ``pip install -e .``
+"""
+from copy import deepcopy
+import argparse
+import json
+import timeit
+
+from citrination_client.search import *
+from citrination_client.search.client import SearchClient
+from citrination_client.search.query_encoder import QueryEncoder
+
+
+def build_deep_query(num_properties):
+    """
+    Builds a PIF system query with a property query per name, each with
+    several nested field queries and filters.
+    """
+    properties = [
+        PropertyQuery(
+            name=FieldQuery(extract_as="name {}".format(i), filter=[Filter(equal="Property {}".format(i))]),
+            value=FieldQuery(extract_as="value {}".format(i), filter=[Filter(min=0.0, max=float(i)), Filter(exists=True)]),
+            units=FieldQuery(filter=[Filter(equal="eV"), Filter(equal="J")]),
+            conditions=ValueQuery(name=FieldQuery(filter=Filter(equal="Temperature")),
+                                  value=FieldQuery(filter=Filter(min=273, max=373))))
+        for i in range(num_properties)
+    ]
+    return PifSystemReturningQuery(
+        size=10000,
+        query=DataQuery(
+            dataset=DatasetQuery(id=[Filter(equal=str(i)) for i in range(20)]),
+            system=PifSystemQuery(
+                names=FieldQuery(filter=Filter(exists=True)),
+                chemical_formula=ChemicalFieldQuery(filter=ChemicalFilter(equal="CoSi")),
+                properties=properties)))
+
+
+def copy_and_encode_per_page(query, num_pages):
+    for page in range(num_pages):
+        sub_query = deepcopy(query)
+        sub_query.from_index = page * 100
+        json.dumps(sub_query, cls=QueryEncoder)
+
+
+def encode_once_and_patch(client, query, num_pages):
+    query_dict = client._encode_search_query(query)
+    for page in range(num_pages):
+        page_dict = dict(query_dict)
+        page_dict["from"] = page * 100
+        json.dumps(page_dict)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--properties", type=int, default=50, help="Property queries in the query tree")
+    parser.add_argument("--pages", type=int, default=100, help="Pages per search")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed searches")
+    args = parser.parse_args()
+
+    client = SearchClient("benchmark-key", "http://localhost")
+    query = build_deep_query(args.properties)
+
+    before = min(timeit.repeat(lambda: copy_and_encode_per_page(query, args.pages), number=1, repeat=args.repeat))
+    after = min(timeit.repeat(lambda: encode_once_and_patch(client, query, args.pages), number=1, repeat=args.repeat))
+
+    print("Query with {} property queries, {} pages per search".format(args.properties, args.pages))
+    print("  deepcopy + encode per page:  {:8.2f} ms per search".format(before * 1000))
+    print("  encode once + patch per page: {:8.2f} ms per search".format(after * 1000))
+    print("  speedup: {:.1f}x".format(before / after))
+
+
+if __name__ == "__main__":
+    main()
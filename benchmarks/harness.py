@@ -0,0 +1,80 @@
+"""
+Timing and memory measurement shared by the benchmarks.
+"""
+import gc
+import time
+import tracemalloc
+
+
+class BenchmarkResult(object):
+
+    def __init__(self, name, timings, peak_memory):
+        self.name = name
+        self.timings = sorted(timings)
+        self.peak_memory = peak_memory
+
+    @property
+    def ops_per_sec(self):
+        return len(self.timings) / sum(self.timings)
+
+    @property
+    def p50(self):
+        return percentile(self.timings, 50)
+
+    @property
+    def p99(self):
+        return percentile(self.timings, 99)
+
+    def as_dictionary(self):
+        return {
+            "name": self.name,
+            "ops_per_sec": self.ops_per_sec,
+            "p50_ms": self.p50 * 1000,
+            "p99_ms": self.p99 * 1000,
+            "peak_memory_kib": self.peak_memory / 1024.0
+        }
+
+
+def percentile(sorted_values, percent):
+    """
+    Returns the nearest-rank percentile of a sorted list.
+    """
+    rank = max(1, int(round(percent / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def measure(name, operation, repeat=20, warmup=2):
+    """
+    Times ``repeat`` calls of an operation after ``warmup`` untimed calls,
+    then runs it once more under tracemalloc to find its peak memory use.
+    Memory is traced separately because tracing slows allocation down.
+
+    :return: The timings and peak memory
+    :rtype: BenchmarkResult
+    """
+    for _ in range(warmup):
+        operation()
+
+    timings = []
+    gc.collect()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(name, timings, peak_memory)
+
+
+def print_results(results):
+    print("{:<24} {:>12} {:>10} {:>10} {:>14}".format("benchmark", "ops/sec", "p50 ms", "p99 ms", "peak mem KiB"))
+    for result in results:
+        print("{name:<24} {ops_per_sec:>12.1f} {p50_ms:>10.2f} {p99_ms:>10.2f} {peak_memory_kib:>14.0f}".format(
+            **result.as_dictionary()))
@@ -0,0 +1,5 @@
+from citrination_client.aio.base_client import AsyncBaseClient, AsyncIterator
+from citrination_client.aio.search_client import AsyncSearchClient
+from citrination_client.aio.data_client import AsyncDataClient
+from citrination_client.aio.models_client import AsyncModelsClient
+from citrination_client.aio.client import AsyncCitrinationClient
@@ -0,0 +1,126 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+# get_running_loop was added in Python 3.7; before then get_event_loop
+# returns the running loop when called from a coroutine
+_get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+# Returned by next() in place of StopIteration, which cannot be raised
+# through a future
+_EXHAUSTED = object()
+
+class AsyncBaseClient(object):
+    """
+    Base class for the asyncio clients. Each asyncio client wraps the
+    corresponding blocking client, so queries, results and errors are
+    exactly those of the blocking API, and runs each call on a bounded
+    pool of workers so that a single event loop can keep many requests
+    in flight at once.
+    """
+
+    def __init__(self, client, max_concurrency=DEFAULT_MAX_CONCURRENCY, executor=None):
+        """
+        Constructor.
+
+        :param client: The blocking client whose calls should be awaited
+        :type client: :class:`BaseClient`
+        :param max_concurrency: The maximum number of requests in flight at
+            once, used to size the worker pool if none is supplied
+        :type max_concurrency: int
+        :param executor: The worker pool to run requests on. Supply one to
+            share it between several clients.
+        :type executor: :class:`concurrent.futures.Executor`
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._client = client
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_concurrency)
+
+    @property
+    def client(self):
+        """
+        The blocking client wrapped by this client.
+        """
+        return self._client
+
+    async def _run(self, func, *args, **kwargs):
+        loop = _get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def close(self):
+        """
+        Releases the worker pool (if this client created it) and the
+        connections of the wrapped client.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+        self._client._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return repr(self._client)
+
+
+class AsyncIterator(object):
+    """
+    Iterates asynchronously over a generator of the blocking client, such
+    as the hits of :meth:`SearchClient.iter_pif_search`, using ``async for``.
+    The generator is created, and each item taken from it, on the worker
+    pool of the asyncio client, so the event loop is not blocked while a
+    page of results is requested. Errors of the blocking client are raised
+    from the iteration step that encounters them.
+    """
+
+    def __init__(self, client, func, *args, **kwargs):
+        """
+        Constructor.
+
+        :param client: The asyncio client whose worker pool should be used
+        :type client: :class:`AsyncBaseClient`
+        :param func: The method of the blocking client returning the generator
+        :param args: The positional arguments to call ``func`` with
+        :param kwargs: The keyword arguments to call ``func`` with
+        """
+        self._client = client
+        self._start = functools.partial(func, *args, **kwargs)
+        self._iterator = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._iterator is None:
+            self._iterator = await self._client._run(lambda: iter(self._start()))
+        item = await self._client._run(next, self._iterator, _EXHAUSTED)
+        if item is _EXHAUSTED:
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self):
+        """
+        Stops the iteration early, releasing any pages being prefetched.
+        """
+        close = getattr(self._iterator, "close", None)
+        if close is not None:
+            await self._client._run(close)
+
+    async def collect(self):
+        """
+        Iterates to the end.
+
+        :return: Every remaining item
+        :rtype: list
+        """
+        items = []
+        async for item in self:
+            items.append(item)
+        return items
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from citrination_client.aio.base_client import AsyncBaseClient, DEFAULT_MAX_CONCURRENCY
+from citrination_client.aio.search_client import AsyncSearchClient
+from citrination_client.aio.data_client import AsyncDataClient
+from citrination_client.aio.models_client import AsyncModelsClient
+from citrination_client.base.transport import Transport
+from citrination_client.client import _generate_lambda_proxy_method
+from citrination_client.util.credentials import get_preferred_credentials
+
+class AsyncCitrinationClient(object):
+    """
+    The asyncio counterpart of :class:`CitrinationClient`. Provides access to
+    awaitable versions of the search, data and models sub-clients, which
+    share one connection pool and one bounded pool of workers. As with the
+    blocking client, the methods of each sub-client are also available
+    directly on this class. Requires Python 3.5 or later.
+
+    Credentials are resolved in the same way as for :class:`CitrinationClient`.
+    """
+
+    def __init__(self, api_key=None, site=None, suppress_warnings=False, transport=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, search_cache=None, prediction_cache=None,
+                 pif_store=None):
+        """
+        Constructor.
+
+        :param api_key: Your API key for Citrination
+        :type api_key: str
+        :param site: The domain name of your Citrination deployment
+            (the default is https://citrination.com)
+        :type site: str
+        :param suppress_warnings: A flag allowing you to suppress warning
+            statements guarding against misuse printed to stdout.
+        :type suppress_warnings: bool
+        :param transport: The pooled HTTP transport shared by each of the
+            sub-clients. By default one is created with a connection per
+            unit of concurrency.
+        :type transport: :class:`Transport`
+        :param max_concurrency: The maximum number of requests in flight at
+            once, across all of the sub-clients
+        :type max_concurrency: int
+        :param search_cache: An optional cache for search results. See
+            :class:`SearchClient`.
+        :type search_cache: :class:`ResponseCache`
+        :param prediction_cache: An optional cache of predictions. See
+            :class:`ModelsClient`.
+        :type prediction_cache: :class:`PredictionCache`
+        :param pif_store: An optional local store of PIFs, filled by PIF
+            searches and PIF retrieval. See :class:`PifStore`.
+        :type pif_store: :class:`PifStore`
+        """
+        api_key, site = get_preferred_credentials(api_key, site)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        transport = transport or Transport(pool_maxsize=max_concurrency)
+        self._executor = ThreadPoolExecutor(max_concurrency)
+        self.models = AsyncModelsClient(api_key, site, suppress_warnings=suppress_warnings, transport=transport,
+                                        max_concurrency=max_concurrency, executor=self._executor,
+                                        prediction_cache=prediction_cache)
+        self.search = AsyncSearchClient(api_key, site, suppress_warnings=suppress_warnings, transport=transport,
+                                        max_concurrency=max_concurrency, executor=self._executor,
+                                        cache=search_cache, pif_store=pif_store)
+        self.data = AsyncDataClient(api_key, site, suppress_warnings=suppress_warnings, transport=transport,
+                                    max_concurrency=max_concurrency, executor=self._executor, pif_store=pif_store)
+        self._transport = transport
+
+        clients = [self.models, self.search, self.data]
+
+        for client in clients:
+            client_methods = [a for a in dir(client) if not a.startswith('_') and a not in dir(AsyncBaseClient)]
+            for method in client_methods:
+                setattr(self, method, _generate_lambda_proxy_method(client, method))
+
+    def close(self):
+        """
+        Waits for in flight requests to finish and releases the worker pool
+        and pooled connections.
+        """
+        self._executor.shutdown(wait=True)
+        self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        return "['models', 'search', 'data']"
@@ -0,0 +1,123 @@
+from citrination_client.aio.base_client import AsyncBaseClient, DEFAULT_MAX_CONCURRENCY
+from citrination_client.base.transport import Transport
+from citrination_client.data.client import DataClient
+
+class AsyncDataClient(AsyncBaseClient):
+    """
+    An asyncio counterpart of :class:`DataClient`.
+    """
+
+    def __init__(self, api_key, host="https://citrination.com", suppress_warnings=False, transport=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, executor=None, pif_store=None):
+        transport = transport or Transport(pool_maxsize=max_concurrency)
+        client = DataClient(api_key, host, suppress_warnings=suppress_warnings, transport=transport,
+                            pif_store=pif_store)
+        super(AsyncDataClient, self).__init__(client, max_concurrency=max_concurrency, executor=executor)
+
+    async def upload(self, dataset_id, source_path, dest_path=None, max_workers=1, retries=0, progress=None,
+                     checkpoint=None):
+        """
+        Upload a file or directory. See :meth:`DataClient.upload`.
+
+        :rtype: :class:`UploadResult`
+        """
+        return await self._run(self._client.upload, dataset_id, source_path, dest_path=dest_path,
+                               max_workers=max_workers, retries=retries, progress=progress,
+                               checkpoint=checkpoint)
+
+    async def sync(self, dataset_id, local_dir, dest_path=None, manifest_path=None, create_version=False,
+                   max_workers=4, retries=0, progress=None):
+        """
+        Uploads the new and changed files in a directory. See :meth:`DataClient.sync`.
+
+        :rtype: :class:`SyncResult`
+        """
+        return await self._run(self._client.sync, dataset_id, local_dir, dest_path=dest_path,
+                               manifest_path=manifest_path, create_version=create_version,
+                               max_workers=max_workers, retries=retries, progress=progress)
+
+    async def list_files(self, dataset_id, glob=".", is_dir=False):
+        """
+        List matched filenames in a dataset. See :meth:`DataClient.list_files`.
+
+        :rtype: list of strings
+        """
+        return await self._run(self._client.list_files, dataset_id, glob=glob, is_dir=is_dir)
+
+    async def matched_file_count(self, dataset_id, glob=".", is_dir=False):
+        """
+        Count the files matching a pattern in a dataset. See :meth:`DataClient.matched_file_count`.
+
+        :rtype: int
+        """
+        return await self._run(self._client.matched_file_count, dataset_id, glob=glob, is_dir=is_dir)
+
+    async def get_dataset_files(self, dataset_id, glob=".", is_dir=False, version_number=None):
+        """
+        Retrieves URLs for matched files in a dataset. See :meth:`DataClient.get_dataset_files`.
+
+        :rtype: list of :class:`DatasetFile`
+        """
+        return await self._run(self._client.get_dataset_files, dataset_id, glob=glob, is_dir=is_dir,
+                               version_number=version_number)
+
+    async def get_dataset_file(self, dataset_id, file_path, version=None):
+        """
+        Retrieves a single dataset file. See :meth:`DataClient.get_dataset_file`.
+
+        :rtype: :class:`DatasetFile`
+        """
+        return await self._run(self._client.get_dataset_file, dataset_id, file_path, version=version)
+
+    async def download_files(self, dataset_files, destination='.', max_workers=1, retries=0, progress=None,
+                             verify=True):
+        """
+        Downloads file(s) to a local destination. See :meth:`DataClient.download_files`.
+
+        :rtype: list of str
+        """
+        return await self._run(self._client.download_files, dataset_files, destination=destination,
+                               max_workers=max_workers, retries=retries, progress=progress, verify=verify)
+
+    async def get_pif(self, dataset_id, uid, dataset_version=None):
+        """
+        Retrieves a PIF from a given dataset. See :meth:`DataClient.get_pif`.
+
+        :rtype: :class:`Pif`
+        """
+        return await self._run(self._client.get_pif, dataset_id, uid, dataset_version=dataset_version)
+
+    async def get_pifs(self, dataset_id, uids, dataset_version=None, max_workers=8, use_search=None):
+        """
+        Retrieves many PIFs from a given dataset. See :meth:`DataClient.get_pifs`.
+
+        :return: The result for each UID, in order
+        :rtype: list of :class:`PifRetrievalResult`
+        """
+        return await self._run(lambda: list(self._client.get_pifs(
+            dataset_id, uids, dataset_version=dataset_version, max_workers=max_workers, use_search=use_search)))
+
+    async def create_dataset(self, name=None, description=None, public=False):
+        """
+        Create a new data set. See :meth:`DataClient.create_dataset`.
+
+        :rtype: :class:`Dataset`
+        """
+        return await self._run(self._client.create_dataset, name=name, description=description, public=public)
+
+    async def update_dataset(self, dataset_id, name=None, description=None, public=None):
+        """
+        Update a data set. See :meth:`DataClient.update_dataset`.
+
+        :rtype: :class:`Dataset`
+        """
+        return await self._run(self._client.update_dataset, dataset_id, name=name, description=description,
+                               public=public)
+
+    async def create_dataset_version(self, dataset_id):
+        """
+        Create a new data set version. See :meth:`DataClient.create_dataset_version`.
+
+        :rtype: :class:`DatasetVersion`
+        """
+        return await self._run(self._client.create_dataset_version, dataset_id)
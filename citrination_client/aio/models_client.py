@@ -0,0 +1,93 @@
+from citrination_client.aio.base_client import AsyncBaseClient, DEFAULT_MAX_CONCURRENCY
+from citrination_client.base.transport import Transport
+from citrination_client.models.client import ModelsClient
+
+class AsyncModelsClient(AsyncBaseClient):
+    """
+    An asyncio counterpart of :class:`ModelsClient`.
+    """
+
+    def __init__(self, api_key, webserver_host="https://citrination.com", suppress_warnings=False, transport=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, executor=None, prediction_cache=None):
+        transport = transport or Transport(pool_maxsize=max_concurrency)
+        client = ModelsClient(api_key, webserver_host, suppress_warnings=suppress_warnings, transport=transport,
+                              prediction_cache=prediction_cache)
+        super(AsyncModelsClient, self).__init__(client, max_concurrency=max_concurrency, executor=executor)
+
+    async def tsne(self, data_view_id):
+        """
+        Get the t-SNE projection. See :meth:`ModelsClient.tsne`.
+
+        :rtype: :class:`Tsne`
+        """
+        return await self._run(self._client.tsne, data_view_id)
+
+    async def predict(self, data_view_id, candidates, method="scalar", use_prior=True, as_batch=False):
+        """
+        Make predictions on candidates. See :meth:`ModelsClient.predict`.
+
+        :rtype: list of :class:`PredictionResult` or :class:`PredictionBatch`
+        """
+        return await self._run(self._client.predict, data_view_id, candidates, method=method, use_prior=use_prior,
+                               as_batch=as_batch)
+
+    async def batch_predict(self, data_view_id, candidates, method="scalar", use_prior=True, batch_size=1000,
+                            max_workers=4, retries=2, as_batch=False):
+        """
+        Make predictions on candidates in concurrent batches. See :meth:`ModelsClient.batch_predict`.
+
+        :rtype: list of :class:`PredictionResult` or :class:`PredictionBatch`
+        """
+        return await self._run(self._client.batch_predict, data_view_id, candidates, method=method,
+                               use_prior=use_prior, batch_size=batch_size, max_workers=max_workers, retries=retries,
+                               as_batch=as_batch)
+
+    async def submit_design_run(self, data_view_id, num_candidates, effort, target=None, constraints=[],
+                                sampler="Default"):
+        """
+        Submits a new experimental design run. See :meth:`ModelsClient.submit_design_run`.
+
+        :rtype: :class:`DesignRun`
+        """
+        return await self._run(self._client.submit_design_run, data_view_id, num_candidates, effort,
+                               target=target, constraints=constraints, sampler=sampler)
+
+    async def get_design_run_status(self, data_view_id, run_uuid):
+        """
+        Retrieves the status of a design run. See :meth:`ModelsClient.get_design_run_status`.
+
+        :rtype: :class:`ProcessStatus`
+        """
+        return await self._run(self._client.get_design_run_status, data_view_id, run_uuid)
+
+    async def get_design_run_results(self, data_view_id, run_uuid):
+        """
+        Retrieves the results of a design run. See :meth:`ModelsClient.get_design_run_results`.
+
+        :rtype: :class:`DesignResults`
+        """
+        return await self._run(self._client.get_design_run_results, data_view_id, run_uuid)
+
+    async def get_data_view(self, data_view_id):
+        """
+        Retrieves a summary of a data view. See :meth:`ModelsClient.get_data_view`.
+
+        :rtype: :class:`DataView`
+        """
+        return await self._run(self._client.get_data_view, data_view_id)
+
+    async def kill_design_run(self, data_view_id, run_uuid):
+        """
+        Kills an in progress design run. See :meth:`ModelsClient.kill_design_run`.
+
+        :return: The UUID of the design run
+        """
+        return await self._run(self._client.kill_design_run, data_view_id, run_uuid)
+
+    async def get_data_view_service_status(self, data_view_id):
+        """
+        Retrieves the status of a data view's services. See :meth:`ModelsClient.get_data_view_service_status`.
+
+        :rtype: :class:`DataViewStatus`
+        """
+        return await self._run(self._client.get_data_view_service_status, data_view_id)
@@ -0,0 +1,116 @@
+from citrination_client.aio.base_client import AsyncBaseClient, AsyncIterator, DEFAULT_MAX_CONCURRENCY
+from citrination_client.base.transport import Transport
+from citrination_client.search.client import SearchClient
+
+class AsyncSearchClient(AsyncBaseClient):
+    """
+    An asyncio counterpart of :class:`SearchClient`. Takes the same query
+    objects and returns the same result classes.
+    """
+
+    def __init__(self, api_key, webserver_host="https://citrination.com", suppress_warnings=False, transport=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, executor=None, cache=None, pif_store=None):
+        transport = transport or Transport(pool_maxsize=max_concurrency)
+        client = SearchClient(api_key, webserver_host, suppress_warnings=suppress_warnings, transport=transport,
+                              cache=cache, pif_store=pif_store)
+        super(AsyncSearchClient, self).__init__(client, max_concurrency=max_concurrency, executor=executor)
+
+    async def pif_search(self, pif_system_returning_query, max_workers=1):
+        """
+        Run a PIF query against Citrination. See :meth:`SearchClient.pif_search`.
+
+        :param pif_system_returning_query: The PIF system query to execute.
+        :type pif_system_returning_query: :class:`PifSystemReturningQuery`
+        :param max_workers: The number of result pages to request at once.
+        :type max_workers: int
+        :return: :class:`PifSearchResult` object with the results of the query.
+        :rtype: :class:`PifSearchResult`
+        """
+        return await self._run(self._client.pif_search, pif_system_returning_query, max_workers=max_workers)
+
+    async def dataset_search(self, dataset_returning_query, max_workers=1):
+        """
+        Run a dataset query against Citrination. See :meth:`SearchClient.dataset_search`.
+
+        :param dataset_returning_query: :class:`DatasetReturningQuery` to execute.
+        :type dataset_returning_query: :class:`DatasetReturningQuery`
+        :param max_workers: The number of result pages to request at once.
+        :type max_workers: int
+        :return: Dataset search result object with the results of the query.
+        :rtype: :class:`DatasetSearchResult`
+        """
+        return await self._run(self._client.dataset_search, dataset_returning_query, max_workers=max_workers)
+
+    def iter_pif_search(self, pif_system_returning_query, prefetch=True):
+        """
+        Run a PIF query against Citrination, iterating over the hits with
+        ``async for`` as their pages arrive. See :meth:`SearchClient.iter_pif_search`.
+
+        :param pif_system_returning_query: The PIF system query to execute.
+        :type pif_system_returning_query: :class:`PifSystemReturningQuery`
+        :param prefetch: Whether to request the next page of results while
+            the hits of the current page are being consumed.
+        :type prefetch: bool
+        :return: An asynchronous iterator of the hits matched by the query
+        :rtype: :class:`AsyncIterator` of :class:`PifSearchHit`
+        """
+        return AsyncIterator(self, self._client.iter_pif_search, pif_system_returning_query, prefetch=prefetch)
+
+    def iter_dataset_search(self, dataset_returning_query, prefetch=True):
+        """
+        Run a dataset query against Citrination, iterating over the hits with
+        ``async for`` as their pages arrive. See :meth:`SearchClient.iter_dataset_search`.
+
+        :param dataset_returning_query: :class:`DatasetReturningQuery` to execute.
+        :type dataset_returning_query: :class:`DatasetReturningQuery`
+        :param prefetch: Whether to request the next page of results while
+            the hits of the current page are being consumed.
+        :type prefetch: bool
+        :return: An asynchronous iterator of the hits matched by the query
+        :rtype: :class:`AsyncIterator` of :class:`DatasetSearchHit`
+        """
+        return AsyncIterator(self, self._client.iter_dataset_search, dataset_returning_query, prefetch=prefetch)
+
+    def iter_partitioned_pif_search(self, pif_system_returning_query, partitions=None, max_workers=4,
+                                    start=None, end=None):
+        """
+        Scan every record matched by a PIF query, however many there are,
+        iterating over the hits with ``async for``. Any requests needed to
+        split the query are made on the first iteration step.
+        See :meth:`SearchClient.iter_partitioned_pif_search`.
+
+        :param pif_system_returning_query: The PIF system query to execute.
+        :type pif_system_returning_query: :class:`PifSystemReturningQuery`
+        :param partitions: Disjoint sub-queries which together cover the query
+        :type partitions: list of :class:`PifSystemReturningQuery`
+        :param max_workers: The number of sub-queries to run at once
+        :type max_workers: int
+        :param start: When splitting automatically, the earliest update time
+            to scan from.
+        :type start: datetime or str
+        :param end: When splitting automatically, the update time to scan up
+            to.
+        :type end: datetime or str
+        :return: An asynchronous iterator of the hits matched by the query
+        :rtype: :class:`AsyncIterator` of :class:`PifSearchHit`
+        """
+        return AsyncIterator(self, self._client.iter_partitioned_pif_search, pif_system_returning_query,
+                             partitions=partitions, max_workers=max_workers, start=start, end=end)
+
+    async def pif_multi_search(self, multi_query):
+        """
+        Run each in a list of PIF queries against Citrination. See :meth:`SearchClient.pif_multi_search`.
+
+        :param multi_query: :class:`MultiQuery` object to execute.
+        :return: :class:`PifMultiSearchResult` object with the results of the query.
+        """
+        return await self._run(self._client.pif_multi_search, multi_query)
+
+    def generate_simple_chemical_query(self, *args, **kwargs):
+        """
+        Builds a query without contacting Citrination, so is not awaitable.
+        See :meth:`SearchClient.generate_simple_chemical_query`.
+
+        :rtype: :class:`PifSystemReturningQuery`
+        """
+        return self._client.generate_simple_chemical_query(*args, **kwargs)
@@ -0,0 +1,168 @@
+from citrination_client.aio import AsyncCitrinationClient, AsyncSearchClient
+from citrination_client.search import PifSystemReturningQuery, PifSearchResult, PifSearchHit
+from citrination_client.search import partition
+from citrination_client.models import PredictionResult
+from citrination_client.base.errors import UnauthorizedAccessException
+from citrination_client.testing import FakeCitrinationServer, SyntheticCorpus
+from citrination_client.util.cache import ResponseCache
+import asyncio
+import requests_mock
+import pytest
+
+site = "mock://citrination"
+
+def _run(coroutine):
+    """
+    Runs a coroutine to completion on a new event loop. asyncio.run needs
+    Python 3.7.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+def _pif_page(uids):
+    return {
+        "results": {
+            "took": 2,
+            "totalNumHits": len(uids),
+            "hits": [{"id": uid, "extracted": {"name": uid}} for uid in uids]
+        }
+    }
+
+def test_awaitable_pif_search():
+    """
+    Tests that an awaited PIF search returns the same result class as
+    the blocking client
+    """
+    client = AsyncSearchClient("mykey", site)
+    with requests_mock.Mocker() as m:
+        m.post(site + "/api/search/pif_search", json=_pif_page(["a", "b"]))
+        result = _run(client.pif_search(PifSystemReturningQuery(size=2)))
+    client.close()
+    assert isinstance(result, PifSearchResult)
+    assert [hit.id for hit in result.hits] == ["a", "b"]
+
+def test_concurrent_requests_across_subclients():
+    """
+    Tests that requests to several sub-clients can be gathered on
+    one event loop
+    """
+    async def run(client):
+        return await asyncio.gather(
+            client.search.pif_search(PifSystemReturningQuery(size=1)),
+            client.models.predict("42", [{"x": 1}]),
+            client.predict("42", [{"x": 2}])
+        )
+
+    client = AsyncCitrinationClient("mykey", site, max_concurrency=4)
+    with requests_mock.Mocker() as m:
+        m.post(site + "/api/search/pif_search", json=_pif_page(["a"]))
+        m.post(site + "/api/data_views/42/predict", json={"candidates": [{"y": [1.0, 0.1]}]})
+        search_result, first, second = _run(run(client))
+    client.close()
+    assert search_result.hits[0].id == "a"
+    assert isinstance(first[0], PredictionResult)
+    assert second[0].get_value("y").value == 1.0
+
+def test_subclients_share_transport():
+    """
+    Tests that the sub-clients send their requests through one
+    connection pool sized for the configured concurrency
+    """
+    client = AsyncCitrinationClient("mykey", site, max_concurrency=8)
+    transport = client.search.client._transport
+    assert client.models.client._transport is transport
+    assert client.data.client._transport is transport
+    assert transport.pool_maxsize == 8
+    client.close()
+
+def test_errors_are_raised_when_awaited():
+    """
+    Tests that the exceptions of the blocking client surface from
+    the awaited call
+    """
+    client = AsyncSearchClient("mykey", site)
+    with requests_mock.Mocker() as m:
+        m.post(site + "/api/search/pif_search", status_code=401)
+        with pytest.raises(UnauthorizedAccessException):
+            _run(client.pif_search(PifSystemReturningQuery(size=1)))
+    client.close()
+
+
+def test_async_iteration_over_pif_search(serve_pif_search):
+    """
+    Tests that the hits of a PIF search can be iterated over with
+    async for, one page at a time
+    """
+    async def run(client):
+        ids = []
+        async for hit in client.iter_pif_search(PifSystemReturningQuery(), prefetch=False):
+            assert isinstance(hit, PifSearchHit)
+            ids.append(hit.id)
+        return ids
+
+    server = serve_pif_search(["a", "b", "c", "d", "e"], 2, lambda uid: {"id": uid})
+    client = AsyncCitrinationClient("mykey", site)
+    ids = _run(run(client))
+    client.close()
+    assert ids == ["a", "b", "c", "d", "e"]
+    assert server.call_count == 3
+
+def test_errors_are_raised_when_iterating():
+    """
+    Tests that the exceptions of the blocking client surface from the
+    iteration step which encounters them
+    """
+    async def run(client):
+        async for hit in client.iter_pif_search(PifSystemReturningQuery()):
+            pass
+
+    client = AsyncSearchClient("mykey", site)
+    with requests_mock.Mocker() as m:
+        m.post(site + "/api/search/pif_search", status_code=401)
+        with pytest.raises(UnauthorizedAccessException):
+            _run(run(client))
+    client.close()
+
+def test_async_partitioned_scan():
+    """
+    Tests that a scan split by dataset can be collected asynchronously
+    """
+    with FakeCitrinationServer(corpus=SyntheticCorpus(num_pifs=60, num_properties=1), max_page_size=25) as fake:
+        client = AsyncSearchClient("mykey", fake.url)
+        partitions = partition.partition_by_dataset(PifSystemReturningQuery(), [1, 2])
+        hits = _run(client.iter_partitioned_pif_search(PifSystemReturningQuery(), partitions=partitions).collect())
+        client.close()
+    assert sorted(hit.system.uid for hit in hits) == sorted("pif-{}".format(i) for i in range(60))
+
+def test_closing_iteration_early(serve_pif_search):
+    """
+    Tests that an iteration can be abandoned part way through
+    """
+    async def run(client):
+        hits = client.iter_pif_search(PifSystemReturningQuery())
+        first = await hits.__anext__()
+        await hits.aclose()
+        return first
+
+    serve_pif_search(["a", "b", "c"], 1, lambda uid: {"id": uid})
+    client = AsyncSearchClient("mykey", site)
+    assert _run(run(client)).id == "a"
+    client.close()
+
+def test_search_cache_is_passed_through(serve_pif_search):
+    """
+    Tests that the search cache given to the asyncio client is used by
+    its search sub-client
+    """
+    server = serve_pif_search(["a", "b"], 10, lambda uid: {"id": uid})
+    cache = ResponseCache()
+    client = AsyncCitrinationClient("mykey", site, search_cache=cache)
+    first = _run(client.pif_search(PifSystemReturningQuery(size=2)))
+    calls = server.call_count
+    second = _run(client.search.pif_search(PifSystemReturningQuery(size=2)))
+    client.close()
+    assert server.call_count == calls
+    assert [hit.id for hit in second.hits] == [hit.id for hit in first.hits]
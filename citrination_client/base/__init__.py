@@ -1,2 +1,8 @@
 from .base_client import BaseClient
+from .transport import Transport
+from .retry import RetryPolicy, RetryBudget
+from .rate_limiter import RateLimiter
+from .instrumentation import RequestEvent, RequestHook
+from .prometheus_hook import PrometheusHook
+from .opentelemetry_hook import OpenTelemetryHook
 from .errors import *
\ No newline at end of file
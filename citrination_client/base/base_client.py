@@ -1,8 +1,12 @@
 import requests
 import json
 from citrination_client.util.quote_finder import quote
-from citrination_client.base.response_handling import raise_on_response, check_general_success, check_for_rate_limiting, get_response_json
+from citrination_client.base.response_handling import raise_on_response, check_general_success, get_response_json
 from citrination_client.base.errors import *
+from citrination_client.base.transport import Transport
+from citrination_client.base.instrumentation import RequestEvent
+
+import time
 
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
@@ -10,12 +14,25 @@ requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
 DEFAULT_FAILURE_MESSAGE = "There was an error communicating with Citrination"
 
+_timer = getattr(time, "perf_counter", time.time)
+
+def _body_size(data):
+    if data is None:
+        return 0
+    if isinstance(data, bytes):
+        return len(data)
+    return len(data.encode("utf-8"))
+
+def _emit(hooks, name, event):
+    for hook in hooks:
+        getattr(hook, name)(event)
+
 class BaseClient(object):
     """
     Base class that holds the universal constructor, utilities, etc
     """
 
-    def __init__(self, api_key, webserver_host, api_members=[], suppress_warnings=False):
+    def __init__(self, api_key, webserver_host, api_members=[], suppress_warnings=False, transport=None):
         """
         Constructor.
 
@@ -28,6 +45,9 @@ class BaseClient(object):
         :param suppress_warnings: A flag indicating whether or not warning
             messages to stdout should be printed
         :type suppress_warnings: bool
+        :param transport: The pooled HTTP transport to send requests through.
+            A new one is created if none is supplied.
+        :type transport: :class:`Transport`
         """
         if api_key == None or len(api_key) == 0:
             raise CitrinationClientError("API key must be present to instantiate the client")
@@ -40,6 +60,7 @@ class BaseClient(object):
         self.suppress_warnings = suppress_warnings
         self.api_url = webserver_host + '/api'
         self.api_members = api_members
+        self._transport = transport or Transport()
 
     # ==== Private Utilities ===
 
@@ -69,6 +90,59 @@ class BaseClient(object):
         else:
             return self.headers
 
+    def _send(self, method, route, headers, data=None, idempotent=None, failure_message=None):
+        """
+        Sends a request through the transport, retrying it according to the
+        transport's retry policy, and checks the response. Each attempt waits
+        for the transport's rate limiter, if it has one, and is reported to
+        the transport's hooks.
+
+        :param idempotent: Whether the request can safely be repeated. By
+            default this is decided by the method.
+        :return: The response to the last attempt, once it has been checked
+            for errors
+        """
+        url = self._get_qualified_route(route)
+        rate_limiter = self._transport.rate_limiter
+        hooks = self._transport.hooks
+
+        def request():
+            if rate_limiter is None:
+                return self._transport.request(method, url, headers=headers, data=data, verify=False)
+            with rate_limiter:
+                return self._transport.request(method, url, headers=headers, data=data, verify=False)
+
+        if not hooks:
+            response = self._transport.retry_policy.execute(request, method, idempotent)
+            return self._handle_response(response, failure_message)
+
+        event = RequestEvent(method, route, bytes_sent=_body_size(data))
+
+        def send():
+            event._start_attempt()
+            _emit(hooks, "before_request", event)
+            start = _timer()
+            try:
+                response = request()
+            except Exception as e:
+                event._record_error(e, _timer() - start)
+                raise
+            event._record_response(response, _timer() - start)
+            _emit(hooks, "after_response", event)
+            return response
+
+        def on_retry(attempt, outcome, delay):
+            event._record_retry(delay)
+            _emit(hooks, "on_retry", event)
+
+        try:
+            response = self._transport.retry_policy.execute(send, method, idempotent, on_retry)
+            return self._handle_response(response, failure_message)
+        except Exception as e:
+            event._record_error(e)
+            _emit(hooks, "on_error", event)
+            raise
+
     def _get(self, route, headers=None, failure_message=None):
         """
         Execute a post request and return the result
@@ -76,24 +150,22 @@ class BaseClient(object):
         :return:
         """
         headers = self._get_headers(headers)
-        response_lambda = (lambda: requests.get(self._get_qualified_route(route), headers=headers, verify=False))
-        response = check_for_rate_limiting(response_lambda(), response_lambda)
-        return self._handle_response(response, failure_message)
+        return self._send("GET", route, headers=headers, failure_message=failure_message)
 
-    def _post_json(self, route, data, headers=None, failure_message=None):
-        return self._post(route, json.dumps(data), headers)
+    def _post_json(self, route, data, headers=None, failure_message=None, idempotent=False):
+        return self._post(route, json.dumps(data), headers, idempotent=idempotent)
 
-    def _post(self, route, data, headers=None, failure_message=None):
+    def _post(self, route, data, headers=None, failure_message=None, idempotent=False):
         """
         Execute a post request and return the result
         :param data:
         :param headers:
+        :param idempotent: Whether the request only reads data, so can be
+            retried after a server error or a lost connection
         :return:
         """
         headers = self._get_headers(headers)
-        response_lambda = (lambda: requests.post(self._get_qualified_route(route), headers=headers, data=data, verify=False))
-        response = check_for_rate_limiting(response_lambda(), response_lambda)
-        return self._handle_response(response, failure_message)
+        return self._send("POST", route, headers=headers, data=data, idempotent=idempotent, failure_message=failure_message)
 
     def _put_json(self, route, data, headers=None, failure_message=None):
         return self._put(route, json.dumps(data), headers)
@@ -106,9 +178,7 @@ class BaseClient(object):
         :return:
         """
         headers = self._get_headers(headers)
-        response_lambda = (lambda: requests.put(self._get_qualified_route(route), headers=headers, data=data, verify=False))
-        response = check_for_rate_limiting(response_lambda(), response_lambda)
-        return self._handle_response(response, failure_message)
+        return self._send("PUT", route, headers=headers, data=data, failure_message=failure_message)
 
     def _delete(self, route, headers=None, failure_message=None):
         """
@@ -117,9 +187,7 @@ class BaseClient(object):
         :return:
         """
         headers = self._get_headers(headers)
-        response_lambda = (lambda: requests.delete(self._get_qualified_route(route), headers=headers, verify=False))
-        response = check_for_rate_limiting(response_lambda(), response_lambda)
-        return self._handle_response(response, failure_message)
+        return self._send("DELETE", route, headers=headers, failure_message=failure_message)
 
     def __repr__(self):
-        return "{}".format(self.api_members)
\ No newline at end of file
+        return "{}".format(self.api_members)
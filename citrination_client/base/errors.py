@@ -39,3 +39,8 @@ class RateLimitingException(CitrinationClientError):
 
     def __init__(self, message="Rate limit hit, throttle requests", server_response=None):
         super(RateLimitingException, self).__init__(message)
+
+class ChecksumMismatchException(CitrinationClientError):
+
+    def __init__(self, message="Downloaded file does not match its checksum", server_response=None):
+        super(ChecksumMismatchException, self).__init__(message)
@@ -0,0 +1,209 @@
+import re
+
+# Path segments which identify a resource rather than a route, such as
+# dataset IDs, version numbers and design run UUIDs
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$")
+
+# Segments after which the rest of a route names a record or a file: PIF
+# UIDs follow "pif", and file paths, which may hold slashes, follow "file"
+# or "files". These are replaced by one placeholder, as each distinct value
+# would otherwise become a new metric label.
+_NAMED_SEGMENTS = {
+    "pif": "{uid}",
+    "file": "{path}",
+    "files": "{path}",
+}
+
+# The took field is near the start of a search response, so it is found
+# without decoding the whole body
+_TOOK = re.compile(br'"took"\s*:\s*(\d+(?:\.\d+)?)')
+_TOOK_SEARCH_LENGTH = 512
+
+class RequestEvent(object):
+    """
+    Describes a request to Citrination as it is sent, retried and answered.
+    One event is created for each request a client makes, and the same
+    event is passed to each hook call for that request, updated as the
+    request progresses.
+    """
+
+    def __init__(self, method, route, bytes_sent=0):
+        """
+        Constructor.
+
+        :param method: The HTTP method of the request
+        :type method: str
+        :param route: The API route requested, e.g. datasets/12/version
+        :type route: str
+        :param bytes_sent: The size of the request body
+        :type bytes_sent: int
+        """
+        self._method = method
+        self._route = route
+        self._bytes_sent = bytes_sent
+        self._attempt = 0
+        self._status_code = None
+        self._bytes_received = None
+        self._latency = None
+        self._server_took = None
+        self._delay = None
+        self._error = None
+
+    @property
+    def method(self):
+        return self._method
+
+    @property
+    def route(self):
+        return self._route
+
+    @property
+    def route_template(self):
+        """
+        The route with IDs, PIF UIDs and file paths replaced by placeholders,
+        e.g. datasets/{id}/version/{id}/pif/{uid}, suitable as a metric label.
+        """
+        segments = self._route.split("/")
+        template = []
+        for i, segment in enumerate(segments):
+            template.append("{id}" if _ID_SEGMENT.match(segment) else segment)
+            placeholder = _NAMED_SEGMENTS.get(segment)
+            if placeholder is not None and i + 1 < len(segments):
+                template.append(placeholder)
+                break
+        return "/".join(template)
+
+    @property
+    def bytes_sent(self):
+        return self._bytes_sent
+
+    @property
+    def attempt(self):
+        """
+        The number of the current attempt, from 1.
+        """
+        return self._attempt
+
+    @property
+    def retries(self):
+        """
+        The number of times the request has been retried.
+        """
+        return max(0, self._attempt - 1)
+
+    @property
+    def status_code(self):
+        """
+        The status code of the response to the current attempt, or None if
+        it has not been answered.
+        """
+        return self._status_code
+
+    @property
+    def bytes_received(self):
+        return self._bytes_received
+
+    @property
+    def latency(self):
+        """
+        Seconds between sending the current attempt and receiving its response.
+        """
+        return self._latency
+
+    @property
+    def server_took(self):
+        """
+        Milliseconds Citrination reported spending on the request, for the
+        routes which report it (such as searches), or None.
+        """
+        return self._server_took
+
+    @property
+    def delay(self):
+        """
+        Seconds waited before the next attempt, once a retry is scheduled.
+        """
+        return self._delay
+
+    @property
+    def error(self):
+        """
+        The exception raised by the current attempt or by the request, if any.
+        """
+        return self._error
+
+    def _start_attempt(self):
+        self._attempt += 1
+        self._status_code = None
+        self._bytes_received = None
+        self._latency = None
+        self._server_took = None
+        self._delay = None
+        self._error = None
+
+    def _record_response(self, response, latency):
+        content = response.content or b""
+        self._status_code = response.status_code
+        self._bytes_received = len(content)
+        self._latency = latency
+        match = _TOOK.search(content[:_TOOK_SEARCH_LENGTH])
+        self._server_took = float(match.group(1)) if match else None
+
+    def _record_retry(self, delay):
+        self._delay = delay
+
+    def _record_error(self, error, latency=None):
+        self._error = error
+        if latency is not None:
+            self._latency = latency
+
+class RequestHook(object):
+    """
+    Receives instrumentation events for the requests made by the clients
+    sharing a :class:`Transport`. Subclasses override the events they are
+    interested in.
+
+    Hooks are called on the thread making the request, so should be quick
+    and thread safe. An exception raised by a hook is raised to the caller
+    of the client method.
+    """
+
+    def before_request(self, event):
+        """
+        Called before each attempt to send a request.
+
+        :param event: The request
+        :type event: :class:`RequestEvent`
+        """
+        pass
+
+    def after_response(self, event):
+        """
+        Called when an attempt receives a response, whatever its status.
+
+        :param event: The request, with the status, size, latency and server
+            time of the response
+        :type event: :class:`RequestEvent`
+        """
+        pass
+
+    def on_retry(self, event):
+        """
+        Called when an attempt failed and the request is about to be retried.
+
+        :param event: The request, with the response or error of the failed
+            attempt and the delay before the next
+        :type event: :class:`RequestEvent`
+        """
+        pass
+
+    def on_error(self, event):
+        """
+        Called when a request fails, either because an attempt raised an
+        error which is not retried or because of the status of the final
+        response.
+
+        :param event: The request, with the error raised
+        :type event: :class:`RequestEvent`
+        """
+        pass
@@ -0,0 +1,73 @@
+from citrination_client.base.instrumentation import RequestHook
+from citrination_client.util.optional import import_optional
+
+import threading
+
+class OpenTelemetryHook(RequestHook):
+    """
+    Records an OpenTelemetry client span for each attempt to send a request
+    to Citrination. Requires the ``opentelemetry-api`` package, and an SDK to
+    export the spans.
+
+    Spans are named after the method and route template, e.g.
+    ``GET datasets/{id}/version``, and carry the route, status, body sizes,
+    retry count and the time Citrination reported spending.
+    """
+
+    def __init__(self, tracer=None):
+        """
+        Constructor.
+
+        :param tracer: The tracer to create spans with. Defaults to the
+            tracer named ``citrination_client`` of the global provider.
+        :type tracer: opentelemetry.trace.Tracer
+        """
+        self._trace = import_optional("opentelemetry.trace", "opentelemetry-api")
+        self._tracer = tracer or self._trace.get_tracer("citrination_client")
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def before_request(self, event):
+        span = self._tracer.start_span(
+            "{} {}".format(event.method, event.route_template),
+            kind=self._trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": event.method,
+                "url.path": event.route,
+                "http.request.body.size": event.bytes_sent,
+                "http.request.resend_count": event.retries
+            })
+        with self._lock:
+            self._spans[event] = span
+
+    def after_response(self, event):
+        span = self._pop_span(event)
+        if span is None:
+            return
+        span.set_attribute("http.response.status_code", event.status_code)
+        span.set_attribute("http.response.body.size", event.bytes_received)
+        if event.server_took is not None:
+            span.set_attribute("citrination.server_took_ms", event.server_took)
+        if event.status_code >= 400:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end()
+
+    def on_retry(self, event):
+        # An attempt which raised has no response, so its span is still open
+        if event.error is not None:
+            self._end_with_error(event)
+
+    def on_error(self, event):
+        self._end_with_error(event)
+
+    def _end_with_error(self, event):
+        span = self._pop_span(event)
+        if span is None:
+            return
+        span.record_exception(event.error)
+        span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(event.error)))
+        span.end()
+
+    def _pop_span(self, event):
+        with self._lock:
+            return self._spans.pop(event, None)
@@ -0,0 +1,76 @@
+from citrination_client.base.instrumentation import RequestHook
+from citrination_client.util.optional import import_optional
+
+class PrometheusHook(RequestHook):
+    """
+    Records Prometheus counters and histograms for the requests made to
+    Citrination, labelled by method and route template. Requires the
+    ``prometheus_client`` package.
+
+    The metrics are:
+
+    * ``<namespace>_requests_total``: responses, by method, route and status
+    * ``<namespace>_request_latency_seconds``: time to receive each response
+    * ``<namespace>_server_took_seconds``: time Citrination reported spending
+    * ``<namespace>_request_bytes_total`` and ``<namespace>_response_bytes_total``
+    * ``<namespace>_retries_total``: retries, by method and route
+    * ``<namespace>_errors_total``: failed requests, by method, route and error
+    """
+
+    def __init__(self, registry=None, namespace="citrination_client", buckets=None):
+        """
+        Constructor.
+
+        :param registry: The registry to create the metrics in. Defaults to
+            the global registry of ``prometheus_client``.
+        :type registry: prometheus_client.CollectorRegistry
+        :param namespace: The prefix of the metric names
+        :type namespace: str
+        :param buckets: The upper bounds of the latency histogram buckets,
+            in seconds. Defaults to the ``prometheus_client`` buckets.
+        :type buckets: list of float
+        """
+        prometheus_client = import_optional("prometheus_client")
+        kwargs = {"namespace": namespace}
+        if registry is not None:
+            kwargs["registry"] = registry
+        histogram_kwargs = dict(kwargs)
+        if buckets is not None:
+            histogram_kwargs["buckets"] = buckets
+
+        self._requests = prometheus_client.Counter(
+            "requests_total", "Responses received from Citrination",
+            ["method", "route", "status"], **kwargs)
+        self._latency = prometheus_client.Histogram(
+            "request_latency_seconds", "Seconds between sending a request and receiving its response",
+            ["method", "route"], **histogram_kwargs)
+        self._server_took = prometheus_client.Histogram(
+            "server_took_seconds", "Seconds Citrination reported spending on a request",
+            ["method", "route"], **histogram_kwargs)
+        self._bytes_sent = prometheus_client.Counter(
+            "request_bytes_total", "Bytes sent in request bodies",
+            ["method", "route"], **kwargs)
+        self._bytes_received = prometheus_client.Counter(
+            "response_bytes_total", "Bytes received in response bodies",
+            ["method", "route"], **kwargs)
+        self._retries = prometheus_client.Counter(
+            "retries_total", "Requests retried",
+            ["method", "route"], **kwargs)
+        self._errors = prometheus_client.Counter(
+            "errors_total", "Requests which failed",
+            ["method", "route", "error"], **kwargs)
+
+    def after_response(self, event):
+        route = event.route_template
+        self._requests.labels(event.method, route, str(event.status_code)).inc()
+        self._latency.labels(event.method, route).observe(event.latency)
+        if event.server_took is not None:
+            self._server_took.labels(event.method, route).observe(event.server_took / 1000.0)
+        self._bytes_sent.labels(event.method, route).inc(event.bytes_sent)
+        self._bytes_received.labels(event.method, route).inc(event.bytes_received)
+
+    def on_retry(self, event):
+        self._retries.labels(event.method, event.route_template).inc()
+
+    def on_error(self, event):
+        self._errors.labels(event.method, event.route_template, type(event.error).__name__).inc()
@@ -0,0 +1,201 @@
+from time import sleep
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class RateLimiter(object):
+    """
+    A client-side token bucket which paces the requests sent to Citrination,
+    so that clients stay under the server's rate limit instead of being
+    answered with 429s and retrying.
+
+    Each request takes a token from the bucket, waiting for one if it is
+    empty. Tokens are added at ``rate`` per second, up to ``burst`` tokens.
+    The number of requests in flight at once can also be capped.
+
+    A limiter given to a :class:`Transport` applies to every sub-client
+    sharing that transport. To share one rate between several processes,
+    such as the workers of a pool, give each of them a limiter with the same
+    ``path``: the bucket is then kept in that file, under a file lock.
+    """
+
+    def __init__(self, rate, burst=None, max_concurrency=None, path=None):
+        """
+        Constructor.
+
+        :param rate: The number of requests allowed per second
+        :type rate: float
+        :param burst: The number of requests which can be sent at once after
+            a quiet period. Defaults to one second's worth of requests.
+        :type burst: int
+        :param max_concurrency: The most requests which may be in flight at
+            once in this process, or None for no limit
+        :type max_concurrency: int
+        :param path: The path of a file holding a bucket shared with other
+            processes, or None to keep the bucket in memory. Shared buckets
+            need ``fcntl``, so are not available on Windows.
+        :type path: str
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is None:
+            burst = max(1, rate)
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self._rate = float(rate)
+        self._burst = float(burst)
+        self._max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        if path is None:
+            self._bucket = _MemoryBucket(self._rate, self._burst)
+        else:
+            if fcntl is None:
+                raise ValueError("Buckets shared between processes are not supported on this platform")
+            self._bucket = _FileBucket(path, self._rate, self._burst)
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @property
+    def burst(self):
+        return self._burst
+
+    @property
+    def max_concurrency(self):
+        return self._max_concurrency
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent. Every call must be followed by a
+        call to :func:`release` once the request has completed.
+        """
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            while True:
+                wait = self._bucket.take()
+                if wait <= 0:
+                    return
+                sleep(wait)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self):
+        """
+        Marks a request as completed.
+        """
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+# Buckets in memory are timed with a clock which is not moved by changes to
+# the system time. Buckets shared through a file must use wall time, as
+# monotonic clocks are not comparable between processes. time.monotonic
+# needs Python 3.3.
+_monotonic_clock = getattr(time, "monotonic", time.time)
+
+def _wall_clock():
+    return time.time()
+
+def _refill(tokens, updated, now, rate, burst):
+    """
+    Adds the tokens earned since the bucket was last updated.
+    """
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+def _take(tokens, rate):
+    """
+    Takes a token if one is available.
+
+    :return: The tokens left, and the seconds to wait for a token if none
+        was available
+    :rtype: (float, float)
+    """
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+class _MemoryBucket(object):
+
+    def __init__(self, rate, burst):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated = _monotonic_clock()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            # Read under the lock, so that updates are made in time order
+            now = max(_monotonic_clock(), self._updated)
+            self._tokens = _refill(self._tokens, self._updated, now, self._rate, self._burst)
+            self._updated = now
+            self._tokens, wait = _take(self._tokens, self._rate)
+            return wait
+
+class _FileBucket(object):
+    """
+    A bucket kept as JSON in a file, so that it can be shared by processes.
+    The file is opened for each token taken, rather than held open, so that
+    forked processes do not share the open file and with it the lock.
+    """
+
+    def __init__(self, path, rate, burst):
+        self._path = path
+        self._rate = rate
+        self._burst = burst
+        # flock does not exclude threads using the same open file, and the
+        # file is reopened per take, so threads are serialized here too
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                # Read under the lock, so that updates are made in time
+                # order. The wall clock can be set back, so time never runs
+                # backwards from the last update, or the time since would be
+                # counted again.
+                now = _wall_clock()
+                tokens, updated = self._read(fd, now)
+                now = max(now, updated)
+                tokens, wait = _take(_refill(tokens, updated, now, self._rate, self._burst), self._rate)
+                data = json.dumps({"tokens": tokens, "updated": now}).encode("utf-8")
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, data)
+                return wait
+            finally:
+                os.close(fd)
+
+    def _read(self, fd, now):
+        contents = b""
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                break
+            contents += chunk
+        try:
+            state = json.loads(contents.decode("utf-8"))
+            return float(state["tokens"]), float(state["updated"])
+        except (ValueError, KeyError, TypeError):
+            # A new, or corrupted, bucket starts full
+            return self._burst, now
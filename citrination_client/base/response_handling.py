@@ -1,6 +1,11 @@
 from citrination_client.base.errors import *
 from time import sleep
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def check_for_rate_limiting(response, response_lambda, timeout=1, attempts=0):
     """
     Takes an initial response, and a way to repeat the request that produced it and retries the request with an increasing sleep period between requests if rate limiting resposne codes are encountered.
@@ -16,14 +21,17 @@ def check_for_rate_limiting(response, response_lambda, timeout=1, attempts=0):
     :type timeout: int
     :param attempts: the number of the retry being executed
     :type attempts: int
+
+    The clients no longer use this, and instead retry requests with the
+    :class:`RetryPolicy` of their transport.
     """
-    if attempts >= 3:
-        raise RateLimitingException()
-    if response.status_code == 429:
+    while response.status_code == 429:
+        if attempts >= 3:
+            raise RateLimitingException()
         sleep(timeout)
-        new_timeout = timeout + 1
-        new_attempts = attempts + 1
-        return check_for_rate_limiting(response_lambda(timeout, attempts), response_lambda, timeout=new_timeout, attempts=new_attempts)
+        response = response_lambda(timeout, attempts)
+        timeout += 1
+        attempts += 1
     return response
 
 def check_general_success(response, failure_message):
@@ -34,6 +42,20 @@ def check_general_success(response, failure_message):
     return response
 
 def get_response_json(response):
+    """
+    Parses the JSON body of a response, with orjson if it is installed.
+
+    :param response: A response from Citrination
+    :type response: requests.Response
+    :return: The parsed body
+    """
+    if orjson is not None and response.content:
+        try:
+            return orjson.loads(response.content)
+        except ValueError:
+            # Bodies which are not UTF-8, or not JSON, are left to requests,
+            # which detects their encoding and raises its own errors
+            pass
     return response.json()
 
 def raise_on_response(response):
@@ -0,0 +1,252 @@
+from citrination_client.base.errors import RateLimitingException
+
+from email.utils import mktime_tz, parsedate_tz
+from time import sleep
+import random
+import requests
+import threading
+import time
+
+# Status codes for which a request is retried: rate limiting, and server
+# errors which are usually transient. Cloudflare returns 524 when
+# Citrination takes too long to respond.
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504, 524])
+
+# Methods which can be repeated without changing the outcome, so which are
+# retried after a server error or a lost connection
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+class RetryBudget(object):
+    """
+    Limits retries to a share of the requests made, so that when Citrination
+    is failing every request, clients do not multiply its load by retrying
+    all of them. Each request deposits ``ratio`` of a retry into the budget
+    and each retry withdraws one.
+    """
+
+    def __init__(self, ratio=0.2, initial_retries=10, max_retries=100):
+        """
+        Constructor.
+
+        :param ratio: The number of retries earned per request
+        :type ratio: float
+        :param initial_retries: The number of retries available before any
+            requests have been made
+        :type initial_retries: int
+        :param max_retries: The most retries which can be saved up
+        :type max_retries: int
+        """
+        self._ratio = ratio
+        self._max_retries = max_retries
+        self._balance = float(min(initial_retries, max_retries))
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self):
+        """
+        The number of retries currently available.
+        """
+        return self._balance
+
+    def deposit(self):
+        """
+        Records a request.
+        """
+        with self._lock:
+            self._balance = min(self._balance + self._ratio, self._max_retries)
+
+    def withdraw(self):
+        """
+        Takes a retry from the budget.
+
+        :return: Whether a retry was available
+        :rtype: bool
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+class RetryPolicy(object):
+    """
+    Decides which requests to Citrination are retried and how long to wait
+    before each retry.
+
+    Rate limited requests are always retried, as Citrination did not act on
+    them. Server errors, timeouts and lost connections are only retried for
+    idempotent requests, which are those with an idempotent method and the
+    read-only searches and predictions which the clients mark as such.
+    Waits grow exponentially with each attempt, with random jitter so that
+    many clients do not retry in step, and a ``Retry-After`` header sent by
+    Citrination is honoured.
+    """
+
+    def __init__(self, max_attempts=4, backoff_factor=1.0, max_backoff=30.0, jitter=True,
+                 retry_statuses=RETRY_STATUSES, respect_retry_after=True, budget=None):
+        """
+        Constructor.
+
+        :param max_attempts: The maximum number of times a request is sent,
+            including the first
+        :type max_attempts: int
+        :param backoff_factor: Seconds to wait before the first retry. Each
+            later retry waits twice as long as the one before it.
+        :type backoff_factor: float
+        :param max_backoff: The longest wait between attempts, in seconds
+        :type max_backoff: float
+        :param jitter: Whether to wait a random time between zero and the
+            backoff, rather than the full backoff
+        :type jitter: bool
+        :param retry_statuses: The response status codes to retry
+        :type retry_statuses: set of int
+        :param respect_retry_after: Whether to wait for the time given by a
+            ``Retry-After`` header, up to ``max_backoff``
+        :type respect_retry_after: bool
+        :param budget: A budget limiting retries to a share of requests, or
+            None to retry every eligible request
+        :type budget: :class:`RetryBudget`
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self._max_attempts = max_attempts
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._retry_statuses = frozenset(retry_statuses)
+        self._respect_retry_after = respect_retry_after
+        self._budget = budget
+
+    @property
+    def max_attempts(self):
+        return self._max_attempts
+
+    @property
+    def budget(self):
+        return self._budget
+
+    def is_retryable(self, status_code, method, idempotent=None):
+        """
+        Indicates whether a response status warrants a retry.
+
+        :param status_code: The status code of the response
+        :type status_code: int
+        :param method: The HTTP method of the request
+        :type method: str
+        :param idempotent: Whether the request can safely be repeated. By
+            default this is decided by the method.
+        :type idempotent: bool
+        :rtype: bool
+        """
+        if status_code not in self._retry_statuses:
+            return False
+        return status_code == 429 or _is_idempotent(method, idempotent)
+
+    def backoff(self, attempt, response=None):
+        """
+        Computes the time to wait before a retry.
+
+        :param attempt: The number of attempts made so far, from 1
+        :type attempt: int
+        :param response: The response to the last attempt, if there was one
+        :type response: requests.Response
+        :return: Seconds to wait
+        :rtype: float
+        """
+        if self._respect_retry_after and response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self._max_backoff)
+        delay = min(self._backoff_factor * (2 ** (attempt - 1)), self._max_backoff)
+        return random.uniform(0, delay) if self._jitter else delay
+
+    def wait(self, attempt, response=None):
+        """
+        Sleeps for the backoff before a retry.
+
+        :param attempt: The number of attempts made so far, from 1
+        :type attempt: int
+        :param response: The response to the last attempt, if there was one
+        :type response: requests.Response
+        :return: The seconds waited
+        :rtype: float
+        """
+        delay = self.backoff(attempt, response)
+        sleep(delay)
+        return delay
+
+    def execute(self, send, method="GET", idempotent=None, on_retry=None):
+        """
+        Sends a request, retrying it according to the policy.
+
+        :param send: A callable which sends the request and returns the response
+        :type send: function
+        :param method: The HTTP method of the request
+        :type method: str
+        :param idempotent: Whether the request can safely be repeated. By
+            default this is decided by the method.
+        :type idempotent: bool
+        :param on_retry: A callable invoked before each retry with the number
+            of attempts made, the response or exception of the last attempt,
+            and the time waited
+        :type on_retry: function
+        :return: The response to the last attempt
+        :rtype: requests.Response
+        :raises RateLimitingException: If the request is still rate limited
+            after the last attempt
+        """
+        if self._budget is not None:
+            self._budget.deposit()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = send()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not _is_idempotent(method, idempotent) or not self._may_retry(attempt):
+                    raise
+                self._wait(attempt, None, e, on_retry)
+                continue
+
+            if not self.is_retryable(response.status_code, method, idempotent):
+                return response
+            if not self._may_retry(attempt):
+                if response.status_code == 429:
+                    raise RateLimitingException()
+                return response
+            self._wait(attempt, response, response, on_retry)
+
+    def _may_retry(self, attempt):
+        if attempt >= self._max_attempts:
+            return False
+        return self._budget is None or self._budget.withdraw()
+
+    def _wait(self, attempt, response, outcome, on_retry):
+        delay = self.backoff(attempt, response)
+        if on_retry is not None:
+            on_retry(attempt, outcome, delay)
+        sleep(delay)
+
+def _is_idempotent(method, idempotent):
+    if idempotent is not None:
+        return idempotent
+    return method.upper() in IDEMPOTENT_METHODS
+
+def _parse_retry_after(value):
+    """
+    Parses a Retry-After header, which is either a number of seconds or an
+    HTTP date.
+
+    :return: Seconds to wait, or None if there is no valid header
+    :rtype: float
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, mktime_tz(parsed) - time.time())
@@ -0,0 +1,209 @@
+from citrination_client import CitrinationClient
+from citrination_client.base import BaseClient, Transport, RetryPolicy, RequestEvent, RequestHook
+from citrination_client.base.errors import CitrinationClientError
+from citrination_client.base import retry
+from citrination_client.data import routes as data_routes
+import requests
+import requests_mock
+import pytest
+
+site = "mock://citrination"
+url = site + "/api/datasets/12/version"
+
+class RecordingHook(RequestHook):
+    """
+    Records each event as the name of the hook method and a snapshot of
+    the event's fields
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def _record(self, name, event):
+        self.calls.append((name, {
+            "attempt": event.attempt,
+            "status_code": event.status_code,
+            "bytes_sent": event.bytes_sent,
+            "bytes_received": event.bytes_received,
+            "server_took": event.server_took,
+            "latency": event.latency,
+            "delay": event.delay,
+            "error": event.error
+        }))
+
+    def before_request(self, event):
+        self._record("before_request", event)
+
+    def after_response(self, event):
+        self._record("after_response", event)
+
+    def on_retry(self, event):
+        self._record("on_retry", event)
+
+    def on_error(self, event):
+        self._record("on_error", event)
+
+@pytest.fixture
+def hook(monkeypatch):
+    monkeypatch.setattr(retry, "sleep", lambda seconds: None)
+    return RecordingHook()
+
+def _client(hook, **policy_args):
+    transport = Transport(retry_policy=RetryPolicy(jitter=False, **policy_args), hooks=[hook])
+    return BaseClient("mykey", site, transport=transport), transport
+
+def test_successful_request_events(hook):
+    """
+    Tests that a successful request reports its size, status, latency and
+    the time Citrination took
+    """
+    client, transport = _client(hook)
+    body = '{"results": {"took": 17, "hits": []}}'
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.post(url, text=body)
+        client._post("datasets/12/version", '{"q": 1}')
+    assert [name for name, _ in hook.calls] == ["before_request", "after_response"]
+    response = hook.calls[1][1]
+    assert response["attempt"] == 1
+    assert response["status_code"] == 200
+    assert response["bytes_sent"] == 8
+    assert response["bytes_received"] == len(body)
+    assert response["server_took"] == 17
+    assert response["latency"] >= 0
+
+def test_retried_request_events(hook):
+    """
+    Tests that a retry is reported between the attempts, with the delay
+    before the next attempt
+    """
+    client, transport = _client(hook)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, [{"status_code": 503}, {"status_code": 200, "json": {}}])
+        client._get("datasets/12/version")
+    assert [name for name, _ in hook.calls] == [
+        "before_request", "after_response", "on_retry", "before_request", "after_response"]
+    assert hook.calls[2][1]["status_code"] == 503
+    assert hook.calls[2][1]["delay"] == 1
+    assert hook.calls[4][1]["attempt"] == 2
+    assert hook.calls[4][1]["server_took"] is None
+
+def test_connection_error_events(hook):
+    """
+    Tests that an error raised while sending is reported to the retry
+    hook and, once no retries are left, to the error hook
+    """
+    client, transport = _client(hook, max_attempts=2)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, exc=requests.exceptions.ConnectionError)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client._get("datasets/12/version")
+    assert [name for name, _ in hook.calls] == [
+        "before_request", "on_retry", "before_request", "on_error"]
+    assert isinstance(hook.calls[1][1]["error"], requests.exceptions.ConnectionError)
+    assert isinstance(hook.calls[3][1]["error"], requests.exceptions.ConnectionError)
+
+def test_error_status_events(hook):
+    """
+    Tests that a response which the client raises an error for is reported
+    to the error hook after the response hook
+    """
+    client, transport = _client(hook)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, status_code=404)
+        with pytest.raises(CitrinationClientError):
+            client._get("datasets/12/version")
+    assert [name for name, _ in hook.calls] == ["before_request", "after_response", "on_error"]
+    assert isinstance(hook.calls[2][1]["error"], CitrinationClientError)
+
+def test_route_template():
+    """
+    Tests that IDs and UUIDs in routes are replaced by placeholders
+    """
+    assert RequestEvent("GET", "datasets/12/version/3/files").route_template == "datasets/{id}/version/{id}/files"
+    event = RequestEvent("GET", "data_views/4/design/0d9b9a4f-4c3e-4b43-9f6b-1e2a5d0c9b11/status")
+    assert event.route_template == "data_views/{id}/design/{id}/status"
+    assert RequestEvent("POST", "search/pif_search").route_template == "search/pif_search"
+
+def test_route_template_hides_uids_and_paths():
+    """
+    Tests that PIF UIDs and file paths, which are unbounded, are replaced
+    by placeholders so they do not become metric labels
+    """
+    assert RequestEvent("GET", data_routes.pif_dataset_uid(12, "abc-1")).route_template == "datasets/{id}/pif/{uid}"
+    assert RequestEvent("GET", data_routes.pif_dataset_version_uid(12, 3, "abc-1")).route_template == \
+        "datasets/{id}/version/{id}/pif/{uid}"
+    assert RequestEvent("GET", data_routes.file_dataset_path(12, "a/b c.json")).route_template == \
+        "datasets/{id}/file/{path}"
+    assert RequestEvent("GET", data_routes.file_dataset_version_path(12, 3, "data/7/x.csv")).route_template == \
+        "datasets/{id}/version/{id}/files/{path}"
+    assert RequestEvent("GET", "datasets/12/version/3/files").route_template == "datasets/{id}/version/{id}/files"
+
+def test_hooks_added_to_shared_transport(hook):
+    """
+    Tests that a hook added to the transport of a client receives the
+    requests of each of its sub-clients
+    """
+    transport = Transport()
+    client = CitrinationClient("mykey", site, transport=transport)
+    transport.add_hook(hook)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.post(site + "/api/datasets/1/list_filepaths", json={"files": []})
+        m.post(site + "/api/data_views/42/predict", json={"candidates": [{"y": [1.0, 0.1]}]})
+        client.data.list_files(1)
+        client.models.predict("42", [{"x": 1}])
+    assert len([name for name, _ in hook.calls if name == "after_response"]) == 2
+
+def test_prometheus_hook(hook):
+    """
+    Tests that the Prometheus hook counts responses, retries and bytes by
+    route template
+    """
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from citrination_client.base import PrometheusHook
+
+    registry = prometheus_client.CollectorRegistry()
+    transport = Transport(retry_policy=RetryPolicy(jitter=False), hooks=[PrometheusHook(registry=registry)])
+    client = BaseClient("mykey", site, transport=transport)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, [{"status_code": 503}, {"status_code": 200, "text": '{"took": 250}'}])
+        client._get("datasets/12/version")
+
+    def value(name, **labels):
+        return registry.get_sample_value("citrination_client_" + name, labels)
+
+    route = {"method": "GET", "route": "datasets/{id}/version"}
+    assert value("requests_total", status="503", **route) == 1
+    assert value("requests_total", status="200", **route) == 1
+    assert value("retries_total", **route) == 1
+    assert value("request_latency_seconds_count", **route) == 2
+    assert value("server_took_seconds_sum", **route) == 0.25
+    assert value("response_bytes_total", **route) == len('{"took": 250}')
+
+def test_opentelemetry_hook(hook):
+    """
+    Tests that the OpenTelemetry hook records a client span per attempt,
+    marking failed attempts as errors
+    """
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.trace import StatusCode
+    from citrination_client.base import OpenTelemetryHook
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    otel_hook = OpenTelemetryHook(tracer=provider.get_tracer("test"))
+    transport = Transport(retry_policy=RetryPolicy(jitter=False, max_attempts=3), hooks=[otel_hook])
+    client = BaseClient("mykey", site, transport=transport)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, [{"exc": requests.exceptions.ConnectionError}, {"status_code": 500},
+                    {"status_code": 200, "json": {}}])
+        client._get("datasets/12/version")
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["GET datasets/{id}/version"] * 3
+    assert [span.status.status_code for span in spans] == [StatusCode.ERROR, StatusCode.ERROR, StatusCode.UNSET]
+    assert [span.attributes["http.request.resend_count"] for span in spans] == [0, 1, 2]
+    assert spans[2].attributes["http.response.status_code"] == 200
@@ -0,0 +1,154 @@
+from citrination_client import CitrinationClient
+from citrination_client.base import Transport, RateLimiter
+from citrination_client.base import rate_limiter
+import json
+import multiprocessing
+import requests_mock
+import threading
+import pytest
+import os
+
+site = "mock://citrination"
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Replaces the clock with one which only advances when the limiter
+    sleeps, and records each sleep
+    """
+    class FakeClock(object):
+        def __init__(self):
+            self.now = 1000.0
+            self.sleeps = []
+
+        def sleep(self, seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "_monotonic_clock", lambda: fake.now)
+    monkeypatch.setattr(rate_limiter, "_wall_clock", lambda: fake.now)
+    monkeypatch.setattr(rate_limiter, "sleep", fake.sleep)
+    return fake
+
+def test_burst_is_sent_without_waiting(clock):
+    """
+    Tests that a full bucket lets a burst of requests through at once
+    """
+    limiter = RateLimiter(rate=2, burst=5)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release()
+    assert clock.sleeps == []
+
+def test_requests_are_paced_at_rate(clock):
+    """
+    Tests that once the bucket is empty, requests wait for tokens to be
+    added at the configured rate
+    """
+    limiter = RateLimiter(rate=4, burst=1)
+    start = clock.now
+    for _ in range(9):
+        with limiter:
+            pass
+    assert clock.now - start == pytest.approx(2.0)
+
+def test_concurrency_is_capped():
+    """
+    Tests that no more than max_concurrency requests are in flight at once
+    """
+    limiter = RateLimiter(rate=1000, burst=1000, max_concurrency=2)
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+    hold = threading.Event()
+
+    def request():
+        with limiter:
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            hold.wait(0.05)
+            with lock:
+                state["in_flight"] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert state["peak"] == 2
+
+def test_invalid_arguments():
+    """
+    Tests that the rate, burst and concurrency are validated
+    """
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        RateLimiter(rate=1, burst=0.5)
+    with pytest.raises(ValueError):
+        RateLimiter(rate=1, max_concurrency=0)
+
+def test_file_bucket_is_shared(tmpdir, clock):
+    """
+    Tests that limiters with the same path draw from the same bucket
+    """
+    path = str(tmpdir.join("bucket"))
+    first = RateLimiter(rate=1, burst=2, path=path)
+    second = RateLimiter(rate=1, burst=2, path=path)
+    first.acquire()
+    second.acquire()
+    assert clock.sleeps == []
+    first.acquire()
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+def _take_tokens(path, count):
+    limiter = RateLimiter(rate=0.001, burst=1000, path=path)
+    for _ in range(count):
+        limiter.acquire()
+        limiter.release()
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork to share a bucket between processes")
+def test_file_bucket_ignores_the_clock_going_back(tmpdir, clock):
+    """
+    Tests that when the wall clock is set back, the time between the last
+    update and the new time is not counted again once the clock catches up
+    """
+    limiter = RateLimiter(rate=1, burst=1, path=str(tmpdir.join("bucket")))
+    limiter.acquire()
+    clock.now -= 5
+    assert limiter._bucket.take() == pytest.approx(1.0)
+    clock.now += 5.5
+    assert limiter._bucket.take() == pytest.approx(0.5)
+
+def test_file_bucket_is_shared_between_processes(tmpdir):
+    """
+    Tests that tokens taken by several processes at once are each
+    counted once in the shared bucket file
+    """
+    path = str(tmpdir.join("bucket"))
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_take_tokens, args=(path, 50)) for _ in range(4)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+    with open(path) as f:
+        assert json.load(f)["tokens"] == pytest.approx(800, abs=1)
+
+def test_subclients_share_limiter(clock):
+    """
+    Tests that the sub-clients of a client draw from the one limiter of
+    their shared transport
+    """
+    transport = Transport(rate_limiter=RateLimiter(rate=1, burst=2))
+    client = CitrinationClient("mykey", site, transport=transport)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.post(site + "/api/datasets/1/list_filepaths", json={"files": []})
+        m.post(site + "/api/data_views/42/predict", json={"candidates": [{"y": [1.0, 0.1]}]})
+        client.data.list_files(1)
+        client.models.predict("42", [{"x": 1}])
+        assert clock.sleeps == []
+        client.data.list_files(1)
+        assert clock.sleeps == [pytest.approx(1.0)]
@@ -1,9 +1,11 @@
-from citrination_client.base.response_handling import raise_on_response, check_general_success, check_for_rate_limiting, _check_response_for_version_mismatch
+from citrination_client.base.response_handling import raise_on_response, check_general_success, check_for_rate_limiting, _check_response_for_version_mismatch, get_response_json
+from citrination_client.base import response_handling
 from citrination_client.base.errors import *
 from requests.models import Response
 import requests
 import requests_mock
 import json
+import pytest
 
 response_exceptions = [{
         "code": requests.codes.server_error,
@@ -108,4 +110,29 @@ def test_success_does_not_trigger_rate_limiting_retry():
     response.status_code = 200
     response_lambda = (lambda t, a: 1/0) # will throw exception
     checked_resp = check_for_rate_limiting(response, response_lambda)
-    assert response == checked_resp
\ No newline at end of file
+    assert response == checked_resp
+def _json_response(content):
+    response = Response()
+    response.status_code = 200
+    response._content = content
+    return response
+
+def test_response_json_is_parsed_with_and_without_orjson(monkeypatch):
+    """
+    Tests that response bodies parse to the same values whether or not
+    orjson is installed
+    """
+    content = json.dumps({"results": {"hits": [{"name": u"\u00c5ngstr\u00f6m", "value": 1.5}]}}).encode("utf-8")
+    parsed = get_response_json(_json_response(content))
+    monkeypatch.setattr(response_handling, "orjson", None)
+    assert get_response_json(_json_response(content)) == parsed == json.loads(content.decode("utf-8"))
+
+def test_response_json_falls_back_to_requests():
+    """
+    Tests that bodies orjson cannot parse are decoded by requests, which
+    detects their encoding and raises a ValueError for invalid JSON
+    """
+    content = json.dumps({"value": 1}).encode("utf-16")
+    assert get_response_json(_json_response(content)) == {"value": 1}
+    with pytest.raises(ValueError):
+        get_response_json(_json_response(b"not json"))
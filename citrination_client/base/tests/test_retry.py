@@ -0,0 +1,148 @@
+from citrination_client.base import BaseClient, Transport, RetryPolicy, RetryBudget
+from citrination_client.base.errors import CitrinationServerErrorException, RateLimitingException
+from citrination_client.base import retry
+import requests
+import requests_mock
+import pytest
+
+site = "mock://citrination"
+url = site + "/api/some/route"
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Records the waits between attempts instead of sleeping
+    """
+    waits = []
+    monkeypatch.setattr(retry, "sleep", waits.append)
+    return waits
+
+def _client(**policy_args):
+    transport = Transport(retry_policy=RetryPolicy(**policy_args))
+    return BaseClient("mykey", site, transport=transport), transport
+
+def test_backoff_grows_exponentially_up_to_cap():
+    """
+    Tests that without jitter each wait doubles until it reaches the
+    maximum backoff
+    """
+    policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1, 2, 3, 3]
+
+def test_jitter_stays_within_backoff():
+    """
+    Tests that a jittered wait is never longer than the exponential backoff
+    """
+    policy = RetryPolicy(backoff_factor=1, max_backoff=30)
+    for _ in range(100):
+        assert 0 <= policy.backoff(3) <= 4
+
+def test_retry_after_is_honoured(sleeps):
+    """
+    Tests that a rate limited request waits for the time given in the
+    Retry-After header before it is retried
+    """
+    client, transport = _client()
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, [
+            {"status_code": 429, "headers": {"Retry-After": "7"}},
+            {"status_code": 200, "json": {"ok": True}}
+        ])
+        assert client._get("some/route").json() == {"ok": True}
+    assert sleeps == [7]
+
+def test_retry_after_is_capped():
+    """
+    Tests that a Retry-After header, in seconds or as a date, is not
+    waited for longer than the maximum backoff
+    """
+    policy = RetryPolicy(max_backoff=10)
+    response = requests.Response()
+    response.headers["Retry-After"] = "120"
+    assert policy.backoff(1, response) == 10
+    response.headers["Retry-After"] = "Wed, 21 Oct 2099 07:28:00 GMT"
+    assert policy.backoff(1, response) == 10
+
+def test_server_errors_are_retried_for_idempotent_requests(sleeps):
+    """
+    Tests that GETs, and POSTs marked as idempotent, are retried after a
+    server error
+    """
+    client, transport = _client()
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, [{"status_code": 524}, {"status_code": 200, "json": {}}])
+        m.post(url, [{"status_code": 503}, {"status_code": 200, "json": {}}])
+        client._get("some/route")
+        client._post("some/route", "{}", idempotent=True)
+        assert m.call_count == 4
+    assert len(sleeps) == 2
+
+def test_server_errors_are_not_retried_for_other_posts(sleeps):
+    """
+    Tests that a POST which may have changed data is not repeated after a
+    server error
+    """
+    client, transport = _client()
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.post(url, status_code=500)
+        with pytest.raises(CitrinationServerErrorException):
+            client._post("some/route", "{}")
+        assert m.call_count == 1
+    assert sleeps == []
+
+def test_connection_errors_are_retried(sleeps):
+    """
+    Tests that an idempotent request is retried after a lost connection
+    """
+    client, transport = _client()
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, [{"exc": requests.exceptions.ConnectionError}, {"status_code": 200, "json": {}}])
+        client._get("some/route")
+        assert m.call_count == 2
+
+def test_exhausted_rate_limiting_raises(sleeps):
+    """
+    Tests that a request which is rate limited on every attempt raises a
+    RateLimitingException
+    """
+    client, transport = _client(max_attempts=3)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.post(url, status_code=429)
+        with pytest.raises(RateLimitingException):
+            client._post("some/route", "{}")
+        assert m.call_count == 3
+    assert len(sleeps) == 2
+
+def test_budget_limits_retries(sleeps):
+    """
+    Tests that once the retry budget is spent, failing requests are no
+    longer retried
+    """
+    budget = RetryBudget(ratio=0, initial_retries=2)
+    client, transport = _client(budget=budget)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get(url, status_code=503)
+        with pytest.raises(CitrinationServerErrorException):
+            client._get("some/route")
+        assert m.call_count == 3
+        with pytest.raises(CitrinationServerErrorException):
+            client._get("some/route")
+        assert m.call_count == 4
+    assert budget.balance == 0
+
+def test_on_retry_is_called(sleeps):
+    """
+    Tests that the retry callback receives the attempt number, the
+    failed response and the wait
+    """
+    policy = RetryPolicy(jitter=False)
+    responses = [requests.Response(), requests.Response()]
+    responses[0].status_code = 502
+    responses[1].status_code = 200
+    calls = []
+    result = policy.execute(lambda: responses.pop(0), on_retry=lambda *args: calls.append(args))
+    assert result.status_code == 200
+    assert len(calls) == 1
+    assert calls[0][0] == 1
+    assert calls[0][1].status_code == 502
+    assert calls[0][2] == 1
@@ -0,0 +1,61 @@
+from citrination_client import CitrinationClient
+from citrination_client.base import BaseClient, Transport
+import requests_mock
+import pytest
+
+def test_subclients_share_transport():
+    """
+    Tests that each of the sub-clients built by the top level client
+    send their requests through the same pooled transport
+    """
+    client = CitrinationClient("mykey", "mock://citrination")
+    transport = client.search._transport
+    assert client.models._transport is transport
+    assert client.data._transport is transport
+
+def test_supplied_transport_is_used():
+    """
+    Tests that a transport passed into the top level client is handed
+    to each of the sub-clients
+    """
+    transport = Transport(pool_maxsize=4)
+    client = CitrinationClient("mykey", "mock://citrination", transport=transport)
+    assert client.search._transport is transport
+    assert client.models._transport is transport
+    assert client.data._transport is transport
+
+def test_requests_go_through_session():
+    """
+    Tests that the base client sends its requests over the transport
+    session, with the configured timeouts attached
+    """
+    transport = Transport(connect_timeout=3, read_timeout=20)
+    client = BaseClient("mykey", "mock://citrination", transport=transport)
+    with requests_mock.Mocker(session=transport.session) as m:
+        m.get("mock://citrination/api/some/route", json={"ok": True})
+        response = client._get("some/route")
+        assert response.json() == {"ok": True}
+        assert m.last_request.timeout == (3, 20)
+        assert m.last_request.headers["X-API-Key"] == "mykey"
+
+def test_no_timeout_by_default():
+    """
+    Tests that a transport configured without timeouts does not
+    impose one
+    """
+    assert Transport().timeout is None
+
+def test_disabling_keep_alive():
+    """
+    Tests that turning keep-alive off asks the server to close the
+    connection after each request
+    """
+    transport = Transport(keep_alive=False)
+    assert transport.session.headers["Connection"] == "close"
+
+def test_pool_sizes_must_be_positive():
+    """
+    Tests that a transport cannot be built with an empty connection pool
+    """
+    with pytest.raises(ValueError):
+        Transport(pool_maxsize=0)
@@ -0,0 +1,162 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from citrination_client.base.retry import RetryPolicy
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+class Transport(object):
+    """
+    A pooled, keep-alive HTTP transport. A single transport can be shared
+    by several clients (the sub-clients of a :class:`CitrinationClient`
+    share one by default) so that TCP and TLS connections are reused across
+    every request they make, instead of a new connection being opened per
+    call.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, connect_timeout=None, read_timeout=None, session=None,
+                 retry_policy=None, rate_limiter=None, hooks=None):
+        """
+        Constructor.
+
+        :param pool_connections: The number of hosts for which a connection
+            pool is kept
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of connections kept alive
+            per host
+        :type pool_maxsize: int
+        :param pool_block: Whether requests should block waiting for a free
+            connection once ``pool_maxsize`` connections to a host are in
+            use, rather than opening (and discarding) extra connections
+        :type pool_block: bool
+        :param keep_alive: Whether connections should be kept open between
+            requests
+        :type keep_alive: bool
+        :param connect_timeout: Seconds to wait for a connection to be
+            established, or None to wait forever
+        :type connect_timeout: float
+        :param read_timeout: Seconds to wait for the server to send data,
+            or None to wait forever
+        :type read_timeout: float
+        :param session: An existing session to send requests through. If
+            supplied, the pool settings are mounted onto it.
+        :type session: requests.Session
+        :param retry_policy: The policy deciding which requests are retried
+            and how long to wait between attempts. By default rate limited
+            requests, and idempotent requests which fail with a server error
+            or a lost connection, are tried up to four times.
+        :type retry_policy: :class:`RetryPolicy`
+        :param rate_limiter: A limiter pacing the requests made to Citrination
+            by every client sharing this transport, or None to send requests
+            without pacing
+        :type rate_limiter: :class:`RateLimiter`
+        :param hooks: Hooks receiving instrumentation events for the requests
+            made to Citrination by every client sharing this transport
+        :type hooks: list of :class:`RequestHook`
+        """
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError("Connection pool sizes must be at least 1")
+
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._keep_alive = keep_alive
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._hooks = tuple(hooks or ())
+
+        self._session = session or requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if not keep_alive:
+            self._session.headers["Connection"] = "close"
+
+    @property
+    def session(self):
+        return self._session
+
+    @property
+    def pool_connections(self):
+        return self._pool_connections
+
+    @property
+    def pool_maxsize(self):
+        return self._pool_maxsize
+
+    @property
+    def keep_alive(self):
+        return self._keep_alive
+
+    @property
+    def retry_policy(self):
+        return self._retry_policy
+
+    @property
+    def rate_limiter(self):
+        return self._rate_limiter
+
+    @property
+    def hooks(self):
+        return self._hooks
+
+    def add_hook(self, hook):
+        """
+        Adds a hook receiving instrumentation events for the requests made
+        to Citrination.
+
+        :param hook: The hook to add
+        :type hook: :class:`RequestHook`
+        """
+        self._hooks = self._hooks + (hook,)
+
+    @property
+    def timeout(self):
+        """
+        The timeout passed along with each request, in the form accepted
+        by requests: None, or a (connect, read) tuple.
+        """
+        if self._connect_timeout is None and self._read_timeout is None:
+            return None
+        return (self._connect_timeout, self._read_timeout)
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request over the pooled session.
+
+        :param method: The HTTP method, e.g. "GET"
+        :type method: str
+        :param url: The fully qualified URL to request
+        :type url: str
+        :param kwargs: Any other keyword arguments accepted by
+            :func:`requests.Session.request`
+        :return: The response
+        :rtype: requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        """
+        Closes every pooled connection.
+        """
+        self._session.close()
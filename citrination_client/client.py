@@ -1,6 +1,7 @@
 from citrination_client.models import ModelsClient
 from citrination_client.search import SearchClient
 from citrination_client.data import DataClient
+from citrination_client.base.transport import Transport
 from citrination_client.util.credentials import get_preferred_credentials
 
 """
@@ -21,7 +22,8 @@ class CitrinationClient(object):
     via direct parameterization, environment variables, or a .citrination credentials file. See the tutorial on client Initialization for more information.
     """
 
-    def __init__(self, api_key=None, site=None, suppress_warnings=False):
+    def __init__(self, api_key=None, site=None, suppress_warnings=False, transport=None, search_cache=None,
+                 prediction_cache=None, pif_store=None):
         """
         Constructor.
 
@@ -33,11 +35,28 @@ class CitrinationClient(object):
         :param suppress_warnings: A flag allowing you to suppress warning
             statements guarding against misuse printed to stdout.
         :type suppress_warnings: bool
+        :param transport: The pooled HTTP transport shared by each of the
+            sub-clients. Supply one to configure pool sizes, keep-alive and
+            timeouts; a default one is created otherwise.
+        :type transport: :class:`Transport`
+        :param search_cache: An optional cache for search results. See
+            :class:`SearchClient`.
+        :type search_cache: :class:`ResponseCache`
+        :param prediction_cache: An optional cache of predictions. See
+            :class:`ModelsClient`.
+        :type prediction_cache: :class:`PredictionCache`
+        :param pif_store: An optional local store of PIFs, filled by PIF
+            searches and PIF retrieval. See :class:`PifStore`.
+        :type pif_store: :class:`PifStore`
         """
         api_key, site = get_preferred_credentials(api_key, site)
-        self.models = ModelsClient(api_key, site, suppress_warnings=suppress_warnings)
-        self.search = SearchClient(api_key, site, suppress_warnings=suppress_warnings)
-        self.data = DataClient(api_key, site, suppress_warnings=suppress_warnings)
+        transport = transport or Transport()
+        self.models = ModelsClient(api_key, site, suppress_warnings=suppress_warnings, transport=transport,
+                                   prediction_cache=prediction_cache)
+        self.search = SearchClient(api_key, site, suppress_warnings=suppress_warnings, transport=transport,
+                                   cache=search_cache, pif_store=pif_store)
+        self.data = DataClient(api_key, site, suppress_warnings=suppress_warnings, transport=transport,
+                               pif_store=pif_store)
 
         clients = [self.models, self.search, self.data]
 
@@ -0,0 +1,61 @@
+from citrination_client.data import DataClient
+from citrination_client.search import SearchClient
+import requests_mock
+import pytest
+import sys
+
+collect_ignore = []
+
+# The asyncio client uses async/await syntax
+if sys.version_info < (3, 5):
+    collect_ignore.append("aio")
+
+# The site the clients of the fixtures below talk to
+MOCK_SITE = "mock://citrination"
+
+@pytest.fixture
+def mock_api():
+    """
+    Intercepts every request; tests register the routes they use on it
+    """
+    with requests_mock.Mocker() as m:
+        yield m
+
+@pytest.fixture
+def data_client():
+    return DataClient("mykey", MOCK_SITE)
+
+@pytest.fixture
+def search_client():
+    return SearchClient("mykey", MOCK_SITE)
+
+@pytest.fixture
+def serve_pif_search(mock_api):
+    """
+    Stands in for the PIF search route, serving pages of a list of records.
+    Returns a function which registers the route, taking the records, the
+    server's page size limit, a function building the JSON hit of a
+    record and optionally a function deciding whether a record matches the
+    first data query of the request.
+    """
+    def serve(records, page_limit, hit, matches=None, took=3, site=MOCK_SITE):
+        def serve_page(request, context):
+            body = request.json()
+            matched = records
+            if matches is not None:
+                data_query = body.get("query", [{}])[0]
+                matched = [r for r in records if matches(r, data_query)]
+            from_index = body.get("from") or 0
+            size = body.get("size")
+            size = page_limit if size is None else min(size, page_limit)
+            return {
+                "results": {
+                    "took": took,
+                    "totalNumHits": len(matched),
+                    "hits": [hit(r) for r in matched[from_index:from_index + size]]
+                }
+            }
+
+        mock_api.post(site + "/api/search/pif_search", json=serve_page)
+        return mock_api
+    return serve
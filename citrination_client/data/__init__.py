@@ -1,5 +1,10 @@
 from citrination_client.data.dataset import Dataset
 from citrination_client.data.dataset_file import DatasetFile
 from citrination_client.data.upload_result import UploadResult
+from citrination_client.data.upload_checkpoint import UploadCheckpoint
+from citrination_client.data.sync_result import SyncResult
+from citrination_client.data.sync_manifest import SyncManifest
+from citrination_client.data.pif_retrieval_result import PifRetrievalResult
+from citrination_client.data.pif_store import PifStore
 from citrination_client.data.dataset_version import DatasetVersion
 from citrination_client.data.client import DataClient
\ No newline at end of file
@@ -3,18 +3,65 @@ from citrination_client.base.errors import *
 from citrination_client.data import *
 from citrination_client.data import routes as routes
 
+from citrination_client.search import DataQuery, DatasetQuery, Filter, PifSystemQuery, PifSystemReturningQuery
+from citrination_client.search import routes as search_routes
+from citrination_client.search.query_encoder import encode_query
+from citrination_client.util.files import file_digest, replace
+
 from pypif import pif
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from six import string_types
+import json
 import os
-import shutil
+import re
 import requests
+import time
+
+# Errors recorded as the failure of a file when uploading a directory
+UPLOAD_ERRORS = (CitrinationClientError, ValueError, IOError, requests.exceptions.RequestException)
+
+# Errors which are not worth attempting the upload of a file again after
+UNRETRYABLE_UPLOAD_ERRORS = (UnauthorizedAccessException, FeatureUnavailableException, ValueError)
+
+# Errors recorded as the failure of a file when downloading
+DOWNLOAD_ERRORS = (CitrinationClientError, IOError, requests.exceptions.RequestException)
+
+# Errors after which the download of a file is worth attempting again
+RETRYABLE_DOWNLOAD_ERRORS = (
+    CitrinationServerErrorException,
+    ChecksumMismatchException,
+    requests.exceptions.RequestException
+)
+
+# Seconds to wait before the first retry of a failed download
+DOWNLOAD_RETRY_DELAY = 1
+
+# Bytes written to disk at a time when downloading a file
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# The number of PIFs from which get_pifs retrieves them through search by default
+SEARCH_PIFS_THRESHOLD = 10
+
+# The number of PIFs get_pifs retrieves per search
+SEARCH_PIFS_BATCH_SIZE = 100
+
+# The name of the manifest sync keeps in the synced directory by default
+SYNC_MANIFEST_NAME = ".citrination_sync_{}.json"
+
+# Seconds to wait before the first retry of a failed file upload; later
+# retries wait proportionally longer
+UPLOAD_RETRY_DELAY = 1
 
 class DataClient(BaseClient):
     """
     Client encapsulating data management behavior.
     """
 
-    def __init__(self, api_key, host="https://citrination.com", suppress_warnings=False):
+    def __init__(self, api_key, host="https://citrination.com", suppress_warnings=False, transport=None,
+                 pif_store=None):
         """
         Constructor.
 
@@ -25,30 +72,69 @@ class DataClient(BaseClient):
         :param suppress_warnings: Whether or not usage warnings should be
             printed to stdout
         :type suppress_warnings: bool
+        :param transport: The pooled HTTP transport to send requests through
+        :type transport: :class:`Transport`
+        :param pif_store: A local store of PIFs. PIFs of a given dataset
+            version are then read from it when present, and stored in it
+            when retrieved.
+        :type pif_store: :class:`PifStore`
         """
         members = [
             "upload",
+            "sync",
             "list_files",
             "matched_file_count",
             "get_dataset_files",
             "get_dataset_file",
             "download_files",
+            "get_pifs",
             "create_dataset",
             "create_dataset_version"
         ]
-        super(DataClient, self).__init__(api_key, host, members, suppress_warnings=suppress_warnings)
+        super(DataClient, self).__init__(api_key, host, members, suppress_warnings=suppress_warnings, transport=transport)
+        self._pif_store = pif_store
 
-    def upload(self, dataset_id, source_path, dest_path=None):
+    def upload(self, dataset_id, source_path, dest_path=None, max_workers=1, retries=0, progress=None,
+               checkpoint=None):
         """
-        Upload a file, specifying source and dest paths a file (acts as the scp command).asdfasdf
+        Upload a file, specifying source and dest paths a file (acts as the scp command).
+
+        If the source path is a directory, every file in it is uploaded, up to
+        ``max_workers`` at a time, and a failure to upload one file is
+        recorded in the result rather than raised.
 
-        :param source_path: The path to the file on the source host asdf
+        Each file is sent in a single request to a URL presigned by
+        Citrination, so a failed transfer of a file starts over. To resume
+        an interrupted upload of a directory, pass a checkpoint: files it
+        records as uploaded, and which have not changed since, are skipped.
+
+        :param source_path: The path to the file on the source host
         :type source_path: str
         :param dest_path: The path to the file where the contents of the upload will be written (on the dest host)
         :type dest_path: str
+        :param max_workers: The number of files to upload at once
+        :type max_workers: int
+        :param retries: The number of times the upload of a file is attempted
+            again after it fails
+        :type retries: int
+        :param progress: A callable invoked after each file is uploaded or
+            fails, with the number of files done, the total number of files
+            and the path of the file
+        :type progress: function
+        :param checkpoint: A checkpoint, or the path of a checkpoint file,
+            recording the files which have been uploaded
+        :type checkpoint: :class:`UploadCheckpoint` or str
         :return: The result of the upload process
         :rtype: :class:`UploadResult`
         """
+        if max_workers < 1:
+            raise CitrinationClientError("max_workers must be at least 1")
+        if retries < 0:
+            raise CitrinationClientError("retries must not be negative")
+
+        if checkpoint is not None and not isinstance(checkpoint, UploadCheckpoint):
+            checkpoint = UploadCheckpoint(checkpoint)
+
         upload_result = UploadResult()
         source_path = str(source_path)
         if not dest_path:
@@ -56,35 +142,154 @@ class DataClient(BaseClient):
         else:
             dest_path = str(dest_path)
         if os.path.isdir(source_path):
+            uploads = []
             for path, subdirs, files in os.walk(source_path):
                 for name in files:
                     path_without_root_dir = path.split("/")[-1:] + [name]
-                    current_dest_path = os.path.join(dest_path, *path_without_root_dir)
-                    current_source_path = os.path.join(path, name)
-                    try:
-                        if self.upload(dataset_id, current_source_path, current_dest_path).successful():
-                            upload_result.add_success(current_source_path)
-                        else:
-                            upload_result.add_failure(current_source_path,"Upload failure")
-                    except (CitrinationClientError, ValueError) as e:
-                        upload_result.add_failure(current_source_path, e.message)
+                    uploads.append((os.path.join(path, name), os.path.join(dest_path, *path_without_root_dir)))
+            self._upload_files(dataset_id, uploads, upload_result, max_workers, retries, progress, checkpoint)
             return upload_result
         elif os.path.isfile(source_path):
-            file_data = { "dest_path": str(dest_path), "src_path": str(source_path)}
-            j = self._get_success_json(self._post_json(routes.upload_to_dataset(dataset_id), data=file_data))
-            s3url = _get_s3_presigned_url(j)
-            with open(source_path, 'rb') as f:
-                r = requests.put(s3url, data=f, headers=j["required_headers"])
-                if r.status_code == 200:
-                    data = {'s3object': j['url']['path'], 's3bucket': j['bucket']}
-                    self._post_json(routes.update_file(j['file_id']), data=data)
-                    upload_result.add_success(source_path)
-                    return upload_result
-                else:
-                    raise CitrinationClientError("Failure to upload {} to Citrination".format(source_path))
+            self._upload_file_with_retries(dataset_id, source_path, dest_path, retries, checkpoint)
+            upload_result.add_success(source_path)
+            if progress is not None:
+                progress(1, 1, source_path)
+            return upload_result
         else:
             raise ValueError("No file at specified path {}".format(source_path))
 
+    def sync(self, dataset_id, local_dir, dest_path=None, manifest_path=None, create_version=False, max_workers=4,
+             retries=0, progress=None):
+        """
+        Uploads the files in a local directory which are new or have changed
+        since they were last synced to a dataset. The content hash of each
+        synced file is kept in a manifest file, and files whose hash matches
+        the manifest and which are listed in the dataset are skipped.
+
+        :param dataset_id: The ID of the dataset to sync the files to
+        :type dataset_id: int
+        :param local_dir: The directory to sync
+        :type local_dir: str
+        :param dest_path: The directory in the dataset to sync the files to.
+            By default this is the name of the local directory.
+        :type dest_path: str
+        :param manifest_path: The path of the manifest file. By default it is
+            kept in the local directory, and is not itself uploaded.
+        :type manifest_path: str
+        :param create_version: Whether to create a new version of the dataset
+            once the files have been uploaded, if any were
+        :type create_version: bool
+        :param max_workers: The number of files to upload at once
+        :type max_workers: int
+        :param retries: The number of times the upload of a file is attempted
+            again after it fails
+        :type retries: int
+        :param progress: A callable invoked after each file is uploaded or
+            fails. See :meth:`upload`.
+        :type progress: function
+        :return: The files uploaded, failed and skipped, and the new version
+        :rtype: :class:`SyncResult`
+        """
+        if max_workers < 1:
+            raise CitrinationClientError("max_workers must be at least 1")
+        if retries < 0:
+            raise CitrinationClientError("retries must not be negative")
+        local_dir = str(local_dir)
+        if not os.path.isdir(local_dir):
+            raise ValueError("No directory at specified path {}".format(local_dir))
+        if dest_path is None:
+            dest_path = os.path.basename(os.path.normpath(local_dir))
+        if manifest_path is None:
+            manifest_path = os.path.join(local_dir, SYNC_MANIFEST_NAME.format(dataset_id))
+
+        manifest = SyncManifest(manifest_path, dataset_id)
+        remote_paths = set(self.list_files(dataset_id))
+        sync_result = SyncResult()
+        uploads = []
+        hashes = {}
+        for path, subdirs, files in os.walk(local_dir):
+            for name in files:
+                source_path = os.path.join(path, name)
+                if os.path.abspath(source_path) == os.path.abspath(manifest_path):
+                    continue
+                relative_path = os.path.relpath(source_path, local_dir).replace(os.sep, "/")
+                current_dest_path = "/".join(p for p in [dest_path.strip("/"), relative_path] if p)
+                sha256 = manifest.hash_file(source_path, current_dest_path)
+                if current_dest_path in remote_paths and manifest.is_synced(current_dest_path, sha256):
+                    sync_result.add_skipped(source_path)
+                else:
+                    uploads.append((source_path, current_dest_path))
+                    hashes[source_path] = (current_dest_path, sha256)
+
+        try:
+            self._upload_files(dataset_id, uploads, sync_result, max_workers, retries, progress)
+        finally:
+            for success in sync_result.successes:
+                current_dest_path, sha256 = hashes[success["path"]]
+                manifest.record(success["path"], current_dest_path, sha256)
+            manifest.save()
+
+        if create_version and sync_result.successes:
+            sync_result.version = self.create_dataset_version(dataset_id)
+        return sync_result
+
+    def _upload_files(self, dataset_id, uploads, upload_result, max_workers, retries, progress, checkpoint=None):
+        """
+        Uploads files concurrently, recording the outcome of each in the
+        upload result.
+
+        :param uploads: The source and destination path of each file
+        :type uploads: list of (str, str)
+        """
+        def upload(paths):
+            source_path, dest_path = paths
+            try:
+                self._upload_file_with_retries(dataset_id, source_path, dest_path, retries, checkpoint)
+                upload_result.add_success(source_path)
+            except UPLOAD_ERRORS as e:
+                upload_result.add_failure(source_path, str(e))
+            return source_path
+
+        executor = ThreadPoolExecutor(max(1, min(max_workers, len(uploads))))
+        try:
+            futures = [executor.submit(upload, paths) for paths in uploads]
+            for done, future in enumerate(as_completed(futures), 1):
+                source_path = future.result()
+                if progress is not None:
+                    progress(done, len(uploads), source_path)
+        finally:
+            executor.shutdown(wait=True)
+
+    def _upload_file_with_retries(self, dataset_id, source_path, dest_path, retries, checkpoint=None):
+        if checkpoint is not None and checkpoint.is_complete(source_path, dest_path):
+            return
+        for attempt in range(retries + 1):
+            try:
+                self._upload_file(dataset_id, source_path, dest_path)
+                if checkpoint is not None:
+                    checkpoint.record(source_path, dest_path)
+                return
+            except UPLOAD_ERRORS as e:
+                if attempt == retries or isinstance(e, UNRETRYABLE_UPLOAD_ERRORS):
+                    raise
+                time.sleep(UPLOAD_RETRY_DELAY * (attempt + 1))
+
+    def _upload_file(self, dataset_id, source_path, dest_path):
+        """
+        Uploads a single file: requests a presigned URL for it, sends the
+        file there and registers the upload with Citrination.
+        """
+        file_data = { "dest_path": str(dest_path), "src_path": str(source_path)}
+        j = self._get_success_json(self._post_json(routes.upload_to_dataset(dataset_id), data=file_data))
+        s3url = _get_s3_presigned_url(j)
+        with open(source_path, 'rb') as f:
+            r = self._transport.put(s3url, data=f, headers=j["required_headers"])
+        if r.status_code == 200:
+            data = {'s3object': j['url']['path'], 's3bucket': j['bucket']}
+            self._post_json(routes.update_file(j['file_id']), data=data)
+        else:
+            raise CitrinationClientError("Failure to upload {} to Citrination".format(source_path))
+
     def list_files(self, dataset_id, glob=".", is_dir=False):
         """
         List matched filenames in a dataset on Citrination.
@@ -104,7 +309,7 @@ class DataClient(BaseClient):
                 "isDir": is_dir
             }
         }
-        return self._get_success_json(self._post_json(routes.list_files(dataset_id), data, failure_message="Failed to list files for dataset {}".format(dataset_id)))['files']
+        return self._get_success_json(self._post_json(routes.list_files(dataset_id), data, failure_message="Failed to list files for dataset {}".format(dataset_id), idempotent=True))['files']
 
     def matched_file_count(self, dataset_id, glob=".", is_dir=False):
         """
@@ -153,7 +358,7 @@ class DataClient(BaseClient):
 
         failure_message = "Failed to get matched files in dataset {}".format(dataset_id)
 
-        versions = self._get_success_json(self._post_json(routes.matched_files(dataset_id), data, failure_message=failure_message))['versions']
+        versions = self._get_success_json(self._post_json(routes.matched_files(dataset_id), data, failure_message=failure_message, idempotent=True))['versions']
 
         # if you don't provide a version number, only the latest
         # will be included in the response body
@@ -186,31 +391,128 @@ class DataClient(BaseClient):
         """
         return self.get_dataset_files(dataset_id, "^{}$".format(file_path), version_number=version)[0]
 
-    def download_files(self, dataset_files, destination='.'):
+    def download_files(self, dataset_files, destination='.', max_workers=1, retries=0, progress=None, verify=True):
         """
-        Downloads file(s) to a local destination.
+        Downloads file(s) to a local destination, up to ``max_workers`` at a time.
 
-        :param dataset_files:
+        Each file is written to a ``.part`` file which is renamed once it is
+        complete, so an interrupted download resumes from where it stopped
+        when it is attempted again. Files already present locally are not
+        downloaded again if they are unchanged: of the same size and the same
+        contents. Whether the contents match can only be told when the
+        file's ETag is an MD5 digest, so other files are always downloaded.
+
+        :param dataset_files: The files to download
         :type dataset_files: list of :class: `DatasetFile`
         :param destination: The path to the desired local download destination
         :type destination: str
-        :param chunk: Whether or not to chunk the file. Default True
-        :type chunk: bool
+        :param max_workers: The number of files to download at once
+        :type max_workers: int
+        :param retries: The number of times the download of a file is
+            attempted again after it fails
+        :type retries: int
+        :param progress: A callable invoked after each file is downloaded,
+            skipped or fails, with the number of files done, the total number
+            of files and the local path of the file
+        :type progress: function
+        :param verify: Whether to check each download against the MD5 digest
+            in its ETag, where there is one
+        :type verify: bool
+        :return: The local path of each file
+        :rtype: list of str
         """
+        if max_workers < 1:
+            raise CitrinationClientError("max_workers must be at least 1")
+        if retries < 0:
+            raise CitrinationClientError("retries must not be negative")
         if not isinstance(dataset_files, list):
             dataset_files = [dataset_files]
 
-        for f in dataset_files:
-            filename = f.path.lstrip('/')
-            local_path = os.path.join(destination, filename)
+        local_paths = [os.path.join(destination, f.path.lstrip('/')) for f in dataset_files]
+        failures = []
 
-            if not os.path.isdir(os.path.dirname(local_path)):
-                os.makedirs(os.path.dirname(local_path))
+        def download(index):
+            local_path = local_paths[index]
+            try:
+                self._download_file_with_retries(dataset_files[index].url, local_path, retries, verify)
+            except DOWNLOAD_ERRORS as e:
+                failures.append("{}: {}".format(local_path, e))
+            return local_path
+
+        executor = ThreadPoolExecutor(max(1, min(max_workers, len(dataset_files))))
+        try:
+            futures = [executor.submit(download, i) for i in range(len(dataset_files))]
+            for done, future in enumerate(as_completed(futures), 1):
+                local_path = future.result()
+                if progress is not None:
+                    progress(done, len(dataset_files), local_path)
+        finally:
+            executor.shutdown(wait=True)
+
+        if failures:
+            raise CitrinationClientError("Failed to download {} file(s) - {}".format(len(failures), "; ".join(failures)))
+        return local_paths
+
+    def _download_file_with_retries(self, url, local_path, retries, verify):
+        directory = os.path.dirname(local_path)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another worker may have created it
+                if not os.path.isdir(directory):
+                    raise
+        for attempt in range(retries + 1):
+            try:
+                return self._download_file(url, local_path, verify)
+            except RETRYABLE_DOWNLOAD_ERRORS:
+                if attempt == retries:
+                    raise
+                time.sleep(DOWNLOAD_RETRY_DELAY * (attempt + 1))
 
-            r = requests.get(f.url, stream=True)
+    def _download_file(self, url, local_path, verify):
+        """
+        Downloads a file, resuming from its partial download if there is one.
 
-            with open(local_path, 'wb') as output_file:
-                shutil.copyfileobj(r.raw, output_file)
+        :return: Whether the file was downloaded, rather than being present
+            and unchanged
+        :rtype: bool
+        """
+        part_path = local_path + ".part"
+        offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+        headers = {"Range": "bytes={}-".format(offset)} if offset else {}
+        r = self._transport.get(url, stream=True, headers=headers)
+        if r.status_code == 416 and offset:
+            # The partial download is no shorter than the file, e.g. because it
+            # was complete but never renamed, so download the file again
+            r.close()
+            os.remove(part_path)
+            return self._download_file(url, local_path, verify)
+        try:
+            if r.status_code >= 500:
+                raise CitrinationServerErrorException(
+                    "Failed to download {} - returned {}".format(local_path, r.status_code))
+            if r.status_code not in (200, 206):
+                raise CitrinationClientError("Failed to download {} - returned {}".format(local_path, r.status_code))
+
+            md5 = _get_md5_from_etag(r.headers.get("ETag"))
+            if r.status_code == 200:
+                if offset == 0 and _is_unchanged(local_path, r.headers.get("Content-Length"), md5):
+                    return False
+                mode = "wb"
+            else:
+                mode = "ab"
+            with open(part_path, mode) as output_file:
+                for chunk in r.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    output_file.write(chunk)
+        finally:
+            r.close()
+
+        if verify and md5 is not None and file_digest(part_path, "md5") != md5:
+            os.remove(part_path)
+            raise ChecksumMismatchException("Download of {} does not match its checksum".format(local_path))
+        replace(part_path, local_path)
+        return True
 
     def get_pif(self, dataset_id, uid, dataset_version = None):
         """
@@ -228,10 +530,126 @@ class DataClient(BaseClient):
         failure_message = "An error occurred retrieving PIF {}".format(uid)
         if dataset_version == None:
             response = self._get(routes.pif_dataset_uid(dataset_id, uid), failure_message=failure_message)
+            return pif.loads(response.content.decode("utf-8"))
+
+        if self._pif_store is not None:
+            stored = self._pif_store.get(dataset_id, dataset_version, uid)
+            if stored is not None:
+                return pif.loads(stored)
+
+        response = self._get(routes.pif_dataset_version_uid(dataset_id, dataset_version, uid), failure_message=failure_message)
+        content = response.content.decode("utf-8")
+        if self._pif_store is not None:
+            self._pif_store.put(dataset_id, dataset_version, uid, content)
+        return pif.loads(content)
+
+    def get_pifs(self, dataset_id, uids, dataset_version=None, max_workers=8, use_search=None):
+        """
+        Retrieves many PIFs from a given dataset, generating a result per UID
+        in the order the UIDs are given. A PIF which cannot be retrieved is
+        reported in its result rather than raised.
+
+        The PIFs are either requested individually, up to ``max_workers`` at
+        a time, or in batches through a search by UID, which takes far fewer
+        requests. Search only covers the latest version of a dataset.
+
+        :param dataset_id: The id of the dataset to retrieve PIFs from
+        :type dataset_id: int
+        :param uids: The uids of the PIFs to retrieve
+        :type uids: iterable of str
+        :param dataset_version: The dataset version to look for the PIFs in. If nothing is supplied, the latest dataset version will be searched
+        :type dataset_version: int
+        :param max_workers: The number of requests to make at once
+        :type max_workers: int
+        :param use_search: Whether to retrieve the PIFs through search. By
+            default search is used for the latest version of a dataset when
+            more than a few PIFs are requested.
+        :type use_search: bool
+        :return: A generator of the result for each UID
+        :rtype: generator of :class:`PifRetrievalResult`
+        """
+        if max_workers < 1:
+            raise CitrinationClientError("max_workers must be at least 1")
+        uids = list(uids)
+        if use_search is None:
+            use_search = dataset_version is None and len(uids) >= SEARCH_PIFS_THRESHOLD
+        elif use_search and dataset_version is not None:
+            raise CitrinationClientError("PIFs can only be retrieved through search from the latest dataset version")
+
+        if use_search:
+            batches = [uids[i:i + SEARCH_PIFS_BATCH_SIZE] for i in range(0, len(uids), SEARCH_PIFS_BATCH_SIZE)]
+            fetch = lambda batch: self._search_pifs(dataset_id, batch)
         else:
-            response = self._get(routes.pif_dataset_version_uid(dataset_id, uid, dataset_version), failure_message=failure_message)
+            batches = [[uid] for uid in uids]
+            fetch = lambda batch: [self._get_pif_result(dataset_id, batch[0], dataset_version)]
+        return self._iter_pif_results(batches, fetch, max_workers)
+
+    def _iter_pif_results(self, batches, fetch, max_workers):
+        """
+        Fetches batches of PIFs concurrently, generating their results in
+        order. Only a few batches per worker are fetched ahead of the one
+        being consumed.
+        """
+        executor = ThreadPoolExecutor(max(1, min(max_workers, len(batches))))
+        pending = deque()
+        batches = iter(batches)
+        try:
+            for batch in islice(batches, max_workers * 2):
+                pending.append(executor.submit(fetch, batch))
+            while pending:
+                results = pending.popleft().result()
+                for batch in islice(batches, 1):
+                    pending.append(executor.submit(fetch, batch))
+                for result in results:
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _get_pif_result(self, dataset_id, uid, dataset_version):
+        try:
+            return PifRetrievalResult(uid, pif=self.get_pif(dataset_id, uid, dataset_version))
+        except (CitrinationClientError, ValueError, requests.exceptions.RequestException) as e:
+            return PifRetrievalResult(uid, error=e)
+
+    def _search_pifs(self, dataset_id, uids):
+        """
+        Retrieves PIFs from the latest version of a dataset with one search.
 
-        return pif.loads(response.content.decode("utf-8"))
+        :return: The result for each UID, in order
+        :rtype: list of :class:`PifRetrievalResult`
+        """
+        query = PifSystemReturningQuery(
+            size=len(uids),
+            return_system=True,
+            query=DataQuery(
+                dataset=DatasetQuery(id=Filter(equal=str(dataset_id))),
+                system=PifSystemQuery(uid=[Filter(equal=uid) for uid in uids])))
+        try:
+            response_json = self._get_success_json(self._post(
+                search_routes.pif_search, data=encode_query(query),
+                failure_message="Error while searching for PIFs in dataset {}".format(dataset_id), idempotent=True))
+        except (CitrinationClientError, ValueError, requests.exceptions.RequestException) as e:
+            return [PifRetrievalResult(uid, error=e) for uid in uids]
+
+        systems = {}
+        stored = []
+        for hit in response_json["results"]["hits"]:
+            system = hit.get("system")
+            if isinstance(system, string_types):
+                system = json.loads(system)
+            if system is not None:
+                systems[system.get("uid")] = system
+                if hit.get("datasetVersion") is not None:
+                    stored.append((dataset_id, hit["datasetVersion"], system.get("uid"), json.dumps(system)))
+        if self._pif_store is not None:
+            self._pif_store.put_many(stored)
+        return [
+            PifRetrievalResult(uid, pif=pif.loado(systems[uid])) if uid in systems
+            else PifRetrievalResult(uid, error=ResourceNotFoundException("PIF {} not found".format(uid)))
+            for uid in uids
+        ]
 
     def create_dataset(self, name=None, description=None, public=False):
         """
@@ -319,6 +737,29 @@ def _convert_bool_to_public_value(val):
     if val == '0' or val == '1':
         return val
 
+def _get_md5_from_etag(etag):
+    """
+    Extracts the MD5 digest of a file from its S3 ETag. The ETags of files
+    uploaded in several parts are not digests of their contents, so None
+    is returned for them.
+    """
+    if etag is None:
+        return None
+    etag = etag.strip('"')
+    return etag.lower() if re.match("^[0-9a-fA-F]{32}$", etag) else None
+
+def _is_unchanged(local_path, content_length, md5):
+    """
+    Indicates whether a local file matches the one being downloaded. Files
+    without an MD5 digest are never considered unchanged, as a file of the
+    same size may have different contents.
+    """
+    if md5 is None or not os.path.isfile(local_path):
+        return False
+    if content_length is None or os.path.getsize(local_path) != int(content_length):
+        return False
+    return file_digest(local_path, "md5") == md5
+
 def _get_s3_presigned_url(response_dict):
     """
     Helper method to create an S3 presigned url from the response dictionary.
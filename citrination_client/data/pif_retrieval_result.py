@@ -0,0 +1,40 @@
+class PifRetrievalResult(object):
+    """
+    The outcome of retrieving one PIF in a bulk retrieval: either the PIF,
+    or the error that prevented it from being retrieved.
+    """
+
+    def __init__(self, uid, pif=None, error=None):
+        """
+        Constructor.
+
+        :param uid: The UID of the requested PIF
+        :type uid: str
+        :param pif: The retrieved PIF, if it was retrieved
+        :type pif: :class:`Pif`
+        :param error: The error raised retrieving the PIF, if it failed
+        :type error: :class:`CitrinationClientError`
+        """
+        self._uid = uid
+        self._pif = pif
+        self._error = error
+
+    @property
+    def uid(self):
+        return self._uid
+
+    @property
+    def pif(self):
+        return self._pif
+
+    @property
+    def error(self):
+        return self._error
+
+    def successful(self):
+        """
+        Indicates whether or not the PIF was retrieved.
+
+        :rtype: bool
+        """
+        return self._error is None
@@ -0,0 +1,128 @@
+import json
+import sqlite3
+import threading
+
+class PifStore(object):
+    """
+    A local store of PIFs in an SQLite database, keyed by dataset, dataset
+    version and UID. The records of a dataset version do not change, so a
+    PIF found in the store can be used in place of a request to Citrination.
+
+    A store given to a :class:`DataClient` is read by ``get_pif`` before any
+    request is made for a PIF of a given dataset version, and is filled with
+    the PIFs it retrieves. A store given to a :class:`SearchClient` is filled
+    with the systems of the PIF search hits which carry a dataset version.
+    """
+
+    def __init__(self, path=":memory:"):
+        """
+        Constructor.
+
+        :param path: The path of the database file, which is created if it
+            does not exist. By default the store is only kept in memory.
+        :type path: str
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS pifs ("
+                "dataset TEXT NOT NULL, version INTEGER NOT NULL, uid TEXT NOT NULL, pif TEXT NOT NULL, "
+                "PRIMARY KEY (dataset, version, uid))")
+
+    @property
+    def path(self):
+        return self._path
+
+    def get(self, dataset_id, dataset_version, uid):
+        """
+        Retrieves a stored PIF.
+
+        :param dataset_id: The ID of the dataset the PIF belongs to
+        :type dataset_id: int
+        :param dataset_version: The version of the dataset
+        :type dataset_version: int
+        :param uid: The UID of the PIF
+        :type uid: str
+        :return: The PIF as JSON, or None if it is not stored
+        :rtype: str
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT pif FROM pifs WHERE dataset = ? AND version = ? AND uid = ?",
+                (str(dataset_id), int(dataset_version), uid)).fetchone()
+        return row[0] if row is not None else None
+
+    def put(self, dataset_id, dataset_version, uid, pif_json):
+        """
+        Stores a PIF.
+
+        :param dataset_id: The ID of the dataset the PIF belongs to
+        :type dataset_id: int
+        :param dataset_version: The version of the dataset
+        :type dataset_version: int
+        :param uid: The UID of the PIF
+        :type uid: str
+        :param pif_json: The PIF as JSON
+        :type pif_json: str
+        """
+        self.put_many([(dataset_id, dataset_version, uid, pif_json)])
+
+    def put_many(self, records):
+        """
+        Stores several PIFs in one transaction.
+
+        :param records: The dataset ID, dataset version, UID and JSON of each PIF
+        :type records: list of (int, int, str, str)
+        """
+        rows = [(str(dataset_id), int(version), uid, pif_json) for dataset_id, version, uid, pif_json in records]
+        if not rows:
+            return
+        with self._lock:
+            with self._connection:
+                self._connection.executemany("INSERT OR REPLACE INTO pifs VALUES (?, ?, ?, ?)", rows)
+
+    def put_search_hits(self, hits):
+        """
+        Stores the systems of PIF search hits, skipping the hits without a
+        system or a dataset version.
+
+        :param hits: The hits to store
+        :type hits: list of :class:`PifSearchHit`
+        """
+        records = []
+        for hit in hits:
+            if hit.dataset is None or hit.dataset_version is None:
+                continue
+            system = hit.raw_system
+            if system is None or system.get("uid") is None:
+                continue
+            records.append((hit.dataset, hit.dataset_version, system["uid"], json.dumps(system)))
+        self.put_many(records)
+
+    def clear(self, dataset_id=None):
+        """
+        Removes stored PIFs.
+
+        :param dataset_id: The dataset to remove the PIFs of, or None to
+            remove every PIF
+        :type dataset_id: int
+        """
+        with self._lock:
+            with self._connection:
+                if dataset_id is None:
+                    self._connection.execute("DELETE FROM pifs")
+                else:
+                    self._connection.execute("DELETE FROM pifs WHERE dataset = ?", (str(dataset_id),))
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM pifs").fetchone()[0]
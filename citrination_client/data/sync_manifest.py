@@ -0,0 +1,97 @@
+from citrination_client.util.files import file_digest, write_atomically
+
+import json
+import os
+import threading
+
+class SyncManifest(object):
+    """
+    A local record of the content hash of each file synced to a dataset,
+    stored as a JSON file. Files whose size and modification time match
+    their entry are not hashed again.
+    """
+
+    def __init__(self, path, dataset_id):
+        """
+        Constructor.
+
+        :param path: The path of the manifest file. It is read if it exists
+            and was written for the same dataset.
+        :type path: str
+        :param dataset_id: The ID of the dataset the files are synced to
+        :type dataset_id: int
+        """
+        self._path = path
+        self._dataset_id = str(dataset_id)
+        self._files = {}
+        self._lock = threading.Lock()
+        if os.path.isfile(path):
+            try:
+                with open(path) as f:
+                    stored = json.load(f)
+            except ValueError:
+                stored = {}
+            if stored.get("dataset_id") == self._dataset_id:
+                self._files = stored.get("files", {})
+
+    @property
+    def path(self):
+        return self._path
+
+    def hash_file(self, source_path, dest_path):
+        """
+        Computes the content hash of a local file, reusing the hash recorded
+        for it if the file has not been modified since.
+
+        :param source_path: The path to the local file
+        :type source_path: str
+        :param dest_path: The path of the file in the dataset
+        :type dest_path: str
+        :return: The SHA-256 digest of the file
+        :rtype: str
+        """
+        stat = os.stat(source_path)
+        entry = self._files.get(dest_path)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha256"]
+        return file_digest(source_path)
+
+    def is_synced(self, dest_path, sha256):
+        """
+        Indicates whether a file with the given content hash was synced to
+        a path.
+
+        :param dest_path: The path of the file in the dataset
+        :type dest_path: str
+        :param sha256: The SHA-256 digest of the local file
+        :type sha256: str
+        :rtype: bool
+        """
+        entry = self._files.get(dest_path)
+        return entry is not None and entry["sha256"] == sha256
+
+    def record(self, source_path, dest_path, sha256):
+        """
+        Records that a file was synced.
+
+        :param source_path: The path to the local file
+        :type source_path: str
+        :param dest_path: The path of the file in the dataset
+        :type dest_path: str
+        :param sha256: The SHA-256 digest of the file
+        :type sha256: str
+        """
+        stat = os.stat(source_path)
+        with self._lock:
+            self._files[dest_path] = {"sha256": sha256, "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def save(self):
+        """
+        Writes the manifest to its file.
+        """
+        with self._lock:
+            data = json.dumps({"dataset_id": self._dataset_id, "files": self._files}, sort_keys=True)
+        write_atomically(self._path, data.encode("utf-8"))
+
+    def __len__(self):
+        return len(self._files)
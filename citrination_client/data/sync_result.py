@@ -0,0 +1,40 @@
+from citrination_client.data.upload_result import UploadResult
+
+class SyncResult(UploadResult):
+    """
+    The result of syncing a local directory to a dataset: the files which
+    were uploaded or failed to upload, the files which were skipped because
+    they had not changed, and the dataset version created afterwards, if any.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        super(SyncResult, self).__init__()
+        self._skipped = []
+        self._version = None
+
+    @property
+    def skipped(self):
+        return self._skipped
+
+    @property
+    def version(self):
+        return self._version
+
+    @version.setter
+    def version(self, value):
+        self._version = value
+
+    def add_skipped(self, filepath):
+        """
+        Registers a file as unchanged since it was last synced.
+
+        :param filepath: The path to the skipped file.
+        :type filepath: str
+        """
+        with self._lock:
+            self._skipped.append({
+                    "path": filepath
+                })
@@ -0,0 +1,132 @@
+from citrination_client.data import DatasetFile
+from citrination_client.data import client as data_client_module
+from citrination_client.base.errors import CitrinationClientError
+import requests_mock
+import hashlib
+import pytest
+import os
+
+contents = {
+    "a.csv": b"1,2,3\n" * 1000,
+    "nested/b.json": b'{"key": "value"}'
+}
+
+def _serve(request, context):
+    """
+    Stands in for S3: serves a file, honouring Range requests
+    """
+    body = contents[request.url.split("/files/", 1)[1]]
+    context.headers["ETag"] = '"{}"'.format(hashlib.md5(body).hexdigest())
+    byte_range = request.headers.get("Range")
+    if byte_range:
+        start = int(byte_range[len("bytes="):-1])
+        if start >= len(body):
+            context.status_code = 416
+            return b""
+        context.status_code = 206
+        body = body[start:]
+    context.headers["Content-Length"] = str(len(body))
+    return body
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(data_client_module, "DOWNLOAD_RETRY_DELAY", 0)
+
+@pytest.fixture
+def server(mock_api):
+    mock_api.get(requests_mock.ANY, content=_serve)
+    return mock_api
+
+def _files():
+    return [DatasetFile(path, url="mock://s3/files/" + path) for path in sorted(contents)]
+
+def test_concurrent_download(data_client, server, tmpdir):
+    """
+    Tests that every file is downloaded, with progress reported per file
+    """
+    calls = []
+    paths = data_client.download_files(_files(), str(tmpdir), max_workers=2, progress=lambda *a: calls.append(a))
+    for path, name in zip(paths, sorted(contents)):
+        with open(path, "rb") as f:
+            assert f.read() == contents[name]
+    assert sorted(done for done, _, _ in calls) == [1, 2]
+    assert not os.path.exists(paths[0] + ".part")
+
+def test_partial_download_is_resumed(data_client, server, tmpdir):
+    """
+    Tests that a download with a partial file requests only the rest of it
+    """
+    part = tmpdir.join("a.csv.part")
+    part.write_binary(contents["a.csv"][:100])
+    data_client.download_files(_files()[:1], str(tmpdir))
+    assert server.request_history[0].headers["Range"] == "bytes=100-"
+    assert tmpdir.join("a.csv").read_binary() == contents["a.csv"]
+
+def test_unchanged_files_are_skipped(data_client, server, tmpdir):
+    """
+    Tests that a file already present with the same checksum is not
+    written again
+    """
+    data_client.download_files(_files(), str(tmpdir))
+    local = tmpdir.join("a.csv")
+    modified = local.mtime()
+    os.utime(str(local), (modified - 100, modified - 100))
+    data_client.download_files(_files(), str(tmpdir))
+    assert local.mtime() == modified - 100
+
+def test_changed_files_are_downloaded(data_client, server, tmpdir):
+    """
+    Tests that a present file whose contents differ is replaced
+    """
+    tmpdir.join("a.csv").write_binary(b"x" * len(contents["a.csv"]))
+    data_client.download_files(_files()[:1], str(tmpdir))
+    assert tmpdir.join("a.csv").read_binary() == contents["a.csv"]
+
+def test_corrupt_partial_download_is_retried(data_client, server, tmpdir):
+    """
+    Tests that a resumed download which fails its checksum is discarded
+    and downloaded again from the start
+    """
+    tmpdir.join("a.csv.part").write_binary(b"garbage")
+    data_client.download_files(_files()[:1], str(tmpdir), retries=1)
+    assert tmpdir.join("a.csv").read_binary() == contents["a.csv"]
+    assert "Range" not in server.request_history[-1].headers
+
+def test_complete_partial_download_is_downloaded_again(data_client, server, tmpdir):
+    """
+    Tests that a partial download which is already complete, so whose
+    resume is refused with a 416, is replaced by a full download without
+    needing a retry
+    """
+    tmpdir.join("a.csv.part").write_binary(contents["a.csv"])
+    data_client.download_files(_files()[:1], str(tmpdir), retries=0)
+    assert tmpdir.join("a.csv").read_binary() == contents["a.csv"]
+    assert not tmpdir.join("a.csv.part").exists()
+    assert [r.headers.get("Range") for r in server.request_history] == ["bytes={}-".format(len(contents["a.csv"])), None]
+
+def test_files_without_a_digest_are_not_skipped(data_client, server, tmpdir):
+    """
+    Tests that a present file of the same size is downloaded again when
+    the ETag is not an MD5 digest, such as for multipart uploads
+    """
+    def serve_multipart(request, context):
+        context.headers["ETag"] = '"0123456789abcdef0123456789abcdef-2"'
+        context.headers["Content-Length"] = str(len(contents["a.csv"]))
+        return contents["a.csv"]
+
+    server.get("mock://s3/files/a.csv", content=serve_multipart)
+    tmpdir.join("a.csv").write_binary(b"x" * len(contents["a.csv"]))
+    data_client.download_files(_files()[:1], str(tmpdir))
+    assert tmpdir.join("a.csv").read_binary() == contents["a.csv"]
+
+def test_failures_are_raised(data_client, server, tmpdir):
+    """
+    Tests that files which fail to download are reported once the other
+    files have been downloaded
+    """
+    server.get("mock://s3/files/a.csv", status_code=403)
+    with pytest.raises(CitrinationClientError) as e:
+        data_client.download_files(_files(), str(tmpdir), max_workers=2, retries=2)
+    assert "a.csv" in str(e.value)
+    assert tmpdir.join("nested", "b.json").read_binary() == contents["nested/b.json"]
+    assert len([r for r in server.request_history if r.url.endswith("a.csv")]) == 1
@@ -0,0 +1,85 @@
+from citrination_client.data import PifRetrievalResult
+from citrination_client.base.errors import ResourceNotFoundException
+import requests_mock
+import json
+import re
+import pytest
+
+site = "mock://citrination"
+stored = ["uid-{}".format(i) for i in range(30) if i != 7]
+
+def _system(uid):
+    return {"category": "system", "uid": uid, "names": [uid]}
+
+def _get(request, context):
+    """
+    Stands in for the PIF route of a dataset, or of a dataset version
+    """
+    uid = request.path.rsplit("/", 1)[1]
+    if uid not in stored:
+        context.status_code = 404
+        return {}
+    return _system(uid)
+
+def _search(request, context):
+    """
+    Stands in for PIF search, matching the UIDs filtered on
+    """
+    body = request.json()
+    uids = [f["equal"] for f in body["query"]["system"]["uid"]]
+    return {"results": {"took": 1, "totalNumHits": len(uids), "hits": [
+        {"id": uid, "system": json.dumps(_system(uid))} for uid in reversed(uids) if uid in stored
+    ]}}
+
+@pytest.fixture
+def server(mock_api):
+    mock_api.get(re.compile(site + "/api/datasets/1/"), json=_get)
+    mock_api.post(site + "/api/search/pif_search", json=_search)
+    return mock_api
+
+def test_results_are_in_order_with_errors(data_client, server):
+    """
+    Tests that PIFs retrieved individually are generated in the order
+    requested, with the error for a missing PIF
+    """
+    uids = ["uid-3", "uid-7", "uid-1"]
+    results = list(data_client.get_pifs(1, uids, use_search=False, max_workers=3))
+    assert [r.uid for r in results] == uids
+    assert results[0].pif.uid == "uid-3"
+    assert not results[1].successful()
+    assert "404" in str(results[1].error)
+    assert server.call_count == 3
+
+def test_version_uses_version_route(data_client, server):
+    """
+    Tests that PIFs of a dataset version are retrieved from its route
+    """
+    results = list(data_client.get_pifs(1, ["uid-1", "uid-2"], dataset_version=4))
+    assert all(r.successful() for r in results)
+    assert all("/version/4/pif/" in r.url for r in server.request_history)
+
+def test_many_pifs_are_searched_in_batches(data_client, server):
+    """
+    Tests that many PIFs from the latest version are retrieved through
+    batched searches, in the order requested
+    """
+    uids = ["uid-{}".format(i) for i in range(30)]
+    results = list(data_client.get_pifs(1, uids))
+    assert [r.uid for r in results] == uids
+    assert [r.pif.uid for r in results if r.successful()] == stored
+    assert isinstance(results[7].error, ResourceNotFoundException)
+    assert server.call_count == 1
+    body = server.request_history[0].json()
+    assert body["query"]["dataset"]["id"]["equal"] == "1"
+    assert body["returnSystem"] is True
+
+def test_results_are_generated_lazily(data_client, server):
+    """
+    Tests that PIFs are only fetched as the results are consumed
+    """
+    uids = ["uid-{}".format(i) for i in range(20)]
+    results = data_client.get_pifs(1, uids, use_search=False, max_workers=2)
+    assert server.call_count == 0
+    assert next(results).uid == "uid-0"
+    results.close()
+    assert server.call_count < len(uids)
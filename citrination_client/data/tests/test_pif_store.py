@@ -0,0 +1,82 @@
+from citrination_client.data import DataClient, PifStore
+from citrination_client.search import SearchClient, PifSystemReturningQuery
+import requests_mock
+import json
+import pytest
+
+site = "mock://citrination"
+
+def _system(uid):
+    return {"category": "system", "uid": uid, "names": [uid]}
+
+@pytest.fixture
+def store():
+    store = PifStore()
+    yield store
+    store.close()
+
+def test_put_and_get(store):
+    """
+    Tests that PIFs are stored per dataset, version and UID
+    """
+    store.put(1, 2, "abc", json.dumps(_system("abc")))
+    assert json.loads(store.get(1, 2, "abc"))["uid"] == "abc"
+    assert store.get(1, 3, "abc") is None
+    assert store.get(2, 2, "abc") is None
+    store.put(1, 2, "abc", json.dumps(_system("abc")))
+    assert len(store) == 1
+
+def test_store_persists(tmpdir):
+    """
+    Tests that a store in a file is read by a later store
+    """
+    path = str(tmpdir.join("pifs.db"))
+    store = PifStore(path)
+    store.put(1, 2, "abc", "{}")
+    store.close()
+    reopened = PifStore(path)
+    assert reopened.get(1, 2, "abc") == "{}"
+    reopened.clear(1)
+    assert len(reopened) == 0
+    reopened.close()
+
+def test_get_pif_of_version_is_served_from_store(store):
+    """
+    Tests that a PIF of a dataset version is only requested once
+    """
+    client = DataClient("mykey", site, pif_store=store)
+    with requests_mock.Mocker() as m:
+        m.get(site + "/api/datasets/1/version/2/pif/abc", json=_system("abc"))
+        assert client.get_pif(1, "abc", dataset_version=2).uid == "abc"
+        assert client.get_pif(1, "abc", dataset_version=2).uid == "abc"
+        assert m.call_count == 1
+
+def test_latest_pif_is_not_served_from_store(store):
+    """
+    Tests that PIFs of the latest version, which may change, are always requested
+    """
+    client = DataClient("mykey", site, pif_store=store)
+    with requests_mock.Mocker() as m:
+        m.get(site + "/api/datasets/1/pif/abc", json=_system("abc"))
+        client.get_pif(1, "abc")
+        client.get_pif(1, "abc")
+        assert m.call_count == 2
+    assert len(store) == 0
+
+def test_search_hits_fill_the_store(store):
+    """
+    Tests that the systems of search hits with a dataset version are stored
+    and then used by get_pif without a request
+    """
+    search_client = SearchClient("mykey", site, pif_store=store)
+    with requests_mock.Mocker() as m:
+        m.post(site + "/api/search/pif_search", json={"results": {"took": 1, "totalNumHits": 2, "hits": [
+            {"id": "abc/1/2", "dataset": 1, "datasetVersion": 2, "system": json.dumps(_system("abc"))},
+            {"id": "def/1", "dataset": 1, "system": _system("def")}
+        ]}})
+        search_client.pif_search(PifSystemReturningQuery(size=2))
+    assert len(store) == 1
+
+    with requests_mock.Mocker() as m:
+        assert DataClient("mykey", site, pif_store=store).get_pif(1, "abc", dataset_version=2).uid == "abc"
+        assert m.call_count == 0
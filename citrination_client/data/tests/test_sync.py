@@ -0,0 +1,115 @@
+from citrination_client.data import DataClient, SyncManifest
+import requests_mock
+import pytest
+
+site = "mock://citrination"
+
+class _Dataset(object):
+    """
+    Stands in for the routes a sync uses, keeping the paths of the files
+    uploaded to the dataset
+    """
+
+    def __init__(self):
+        self.files = set()
+        self.versions = 0
+
+    def presign(self, request, context):
+        dest_path = request.json()["dest_path"]
+        self.files.add(dest_path)
+        return {
+            "url": {"scheme": "mock", "host": "s3", "path": "/bucket/" + dest_path, "query": "signature=1"},
+            "required_headers": {},
+            "file_id": 7,
+            "bucket": "bucket"
+        }
+
+    def list_files(self, request, context):
+        return {"files": sorted(self.files)}
+
+    def create_version(self, request, context):
+        self.versions += 1
+        return {"dataset_scoped_id": self.versions + 1}
+
+@pytest.fixture
+def dataset():
+    dataset = _Dataset()
+    with requests_mock.Mocker() as m:
+        m.post(site + "/api/data_sets/1/upload", json=dataset.presign)
+        m.post(site + "/api/data_sets/update_file/7", json={})
+        m.post(site + "/api/datasets/1/list_filepaths", json=dataset.list_files)
+        m.post(site + "/api/data_sets/1/create_dataset_version", json=dataset.create_version)
+        m.put(requests_mock.ANY, status_code=200)
+        dataset.mocker = m
+        yield dataset
+
+@pytest.fixture
+def local_dir(tmpdir):
+    root = tmpdir.mkdir("measurements")
+    root.join("a.csv").write("1,2")
+    root.mkdir("nested").join("b.json").write("{}")
+    return root
+
+def _uploaded(dataset):
+    return sorted(r.json()["dest_path"] for r in dataset.mocker.request_history
+                  if r.url == site + "/api/data_sets/1/upload")
+
+def test_first_sync_uploads_everything(dataset, local_dir):
+    """
+    Tests that every file is uploaded under the name of the directory,
+    without the manifest
+    """
+    result = DataClient("mykey", site).sync(1, str(local_dir))
+    assert result.successful()
+    assert _uploaded(dataset) == ["measurements/a.csv", "measurements/nested/b.json"]
+    assert result.skipped == []
+    assert result.version is None
+
+def test_unchanged_files_are_skipped(dataset, local_dir):
+    """
+    Tests that a second sync only uploads the files which changed or were added
+    """
+    client = DataClient("mykey", site)
+    client.sync(1, str(local_dir), dest_path="raw")
+    dataset.mocker.reset_mock()
+
+    local_dir.join("a.csv").write("3,4")
+    local_dir.join("c.txt").write("new")
+    result = client.sync(1, str(local_dir), dest_path="raw", create_version=True)
+    assert _uploaded(dataset) == ["raw/a.csv", "raw/c.txt"]
+    assert [f["path"] for f in result.skipped] == [str(local_dir.join("nested", "b.json"))]
+    assert result.version.number == 2
+
+def test_files_missing_from_the_dataset_are_uploaded(dataset, local_dir):
+    """
+    Tests that a file recorded in the manifest but no longer listed in the
+    dataset is uploaded again
+    """
+    client = DataClient("mykey", site)
+    client.sync(1, str(local_dir))
+    dataset.files.discard("measurements/a.csv")
+    dataset.mocker.reset_mock()
+    client.sync(1, str(local_dir))
+    assert _uploaded(dataset) == ["measurements/a.csv"]
+
+def test_no_version_without_changes(dataset, local_dir):
+    """
+    Tests that no dataset version is created when nothing was uploaded
+    """
+    client = DataClient("mykey", site)
+    client.sync(1, str(local_dir))
+    result = client.sync(1, str(local_dir), create_version=True)
+    assert result.version is None
+    assert dataset.versions == 0
+
+def test_manifest_is_per_dataset(tmpdir, local_dir):
+    """
+    Tests that a manifest written for one dataset is ignored for another
+    """
+    path = str(tmpdir.join("manifest.json"))
+    manifest = SyncManifest(path, 1)
+    source = str(local_dir.join("a.csv"))
+    manifest.record(source, "a.csv", manifest.hash_file(source, "a.csv"))
+    manifest.save()
+    assert len(SyncManifest(path, 1)) == 1
+    assert len(SyncManifest(path, 2)) == 0
@@ -0,0 +1,147 @@
+from citrination_client.data import UploadCheckpoint
+from citrination_client.data import client as data_client_module
+from citrination_client.base.errors import CitrinationClientError
+import requests_mock
+import threading
+import pytest
+import os
+
+site = "mock://citrination"
+test_file_root = os.path.join(os.path.dirname(__file__), "test_files")
+
+def _presign(request, context):
+    """
+    Stands in for the upload route: presigns a URL for the file
+    """
+    dest_path = request.json()["dest_path"]
+    return {
+        "url": {"scheme": "mock", "host": "s3", "path": "/bucket/" + dest_path, "query": "signature=1"},
+        "required_headers": {},
+        "file_id": 7,
+        "bucket": "bucket"
+    }
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(data_client_module, "UPLOAD_RETRY_DELAY", 0)
+
+@pytest.fixture
+def server(mock_api):
+    mock_api.post(site + "/api/data_sets/1/upload", json=_presign)
+    mock_api.post(site + "/api/data_sets/update_file/7", json={})
+    mock_api.put(requests_mock.ANY, status_code=200)
+    return mock_api
+
+def _count_files(root):
+    return sum(len(files) for _, _, files in os.walk(root))
+
+def test_directory_upload_is_concurrent(data_client, server):
+    """
+    Tests that every file in a directory is uploaded, and that progress is
+    reported once per file
+    """
+    calls = []
+    result = data_client.upload(1, test_file_root, "dest/", max_workers=4, progress=lambda *a: calls.append(a))
+    total = _count_files(test_file_root)
+    assert result.successful()
+    assert len(result.successes) == total
+    assert sorted(done for done, _, _ in calls) == list(range(1, total + 1))
+    assert all(count == total for _, count, _ in calls)
+    puts = [r for r in server.request_history if r.method == "PUT"]
+    assert len(puts) == total
+
+def test_failed_files_are_retried(data_client, server):
+    """
+    Tests that a file whose transfer fails is uploaded again
+    """
+    lock = threading.Lock()
+    failures = {"remaining": 2}
+
+    def flaky_put(request, context):
+        with lock:
+            if "revolver/A.csv" in request.url and failures["remaining"]:
+                failures["remaining"] -= 1
+                context.status_code = 500
+                return ""
+        context.status_code = 200
+        return ""
+
+    server.put(requests_mock.ANY, text=flaky_put)
+    result = data_client.upload(1, test_file_root, "dest/", max_workers=3, retries=2)
+    assert result.successful()
+    assert failures["remaining"] == 0
+
+def test_failures_are_aggregated(data_client, server):
+    """
+    Tests that files which fail on every attempt are recorded with the
+    reason, without stopping the rest of the upload
+    """
+    server.put(requests_mock.ANY, status_code=500)
+    result = data_client.upload(1, test_file_root, "dest/", max_workers=2, retries=1)
+    assert not result.successful()
+    assert len(result.failures) == _count_files(test_file_root)
+    assert "Failure to upload" in result.failures[0]["reason"]
+
+def test_single_file_failure_is_raised(data_client, server):
+    """
+    Tests that the failure to upload a single file is raised
+    """
+    server.put(requests_mock.ANY, status_code=500)
+    with pytest.raises(CitrinationClientError):
+        data_client.upload(1, os.path.join(test_file_root, "keys_and_values.json"))
+
+def test_missing_source(data_client):
+    """
+    Tests that a missing source path is rejected
+    """
+    with pytest.raises(ValueError):
+        data_client.upload(1, os.path.join(test_file_root, "missing.json"))
+
+def test_checkpoint_resumes_interrupted_upload(data_client, server, tmpdir):
+    """
+    Tests that repeating an upload with a checkpoint only sends the files
+    which were not uploaded the first time
+    """
+    checkpoint = str(tmpdir.join("upload.checkpoint"))
+
+    def fail_revolver(request, context):
+        context.status_code = 500 if "revolver" in request.url else 200
+        return ""
+
+    server.put(requests_mock.ANY, text=fail_revolver)
+    first = data_client.upload(1, test_file_root, "dest/", max_workers=2, checkpoint=checkpoint)
+    assert len(first.failures) == 3
+
+    server.put(requests_mock.ANY, status_code=200)
+    server.reset_mock()
+    second = data_client.upload(1, test_file_root, "dest/", max_workers=2, checkpoint=checkpoint)
+    assert second.successful()
+    assert len(second.successes) == _count_files(test_file_root)
+    puts = [r.url for r in server.request_history if r.method == "PUT"]
+    assert len(puts) == 3
+    assert all("revolver" in url for url in puts)
+
+def test_checkpoint_detects_changed_files(tmpdir):
+    """
+    Tests that a file modified since it was recorded is uploaded again
+    """
+    source = tmpdir.join("data.json")
+    source.write("{}")
+    checkpoint = UploadCheckpoint(str(tmpdir.join("upload.checkpoint")))
+    checkpoint.record(str(source), "data.json")
+    assert UploadCheckpoint(checkpoint.path).is_complete(str(source), "data.json")
+
+    source.write("{\"changed\": true}")
+    assert not UploadCheckpoint(checkpoint.path).is_complete(str(source), "data.json")
+
+def test_checkpoint_ignores_incomplete_lines(tmpdir):
+    """
+    Tests that a checkpoint whose last line was cut short can still be read
+    """
+    source = tmpdir.join("data.json")
+    source.write("{}")
+    checkpoint = UploadCheckpoint(str(tmpdir.join("upload.checkpoint")))
+    checkpoint.record(str(source), "data.json")
+    with open(checkpoint.path, "a") as f:
+        f.write('{"source_path": "trunc')
+    assert len(UploadCheckpoint(checkpoint.path)) == 1
@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+
+class UploadCheckpoint(object):
+    """
+    A record, kept in a local file, of the files an upload has completed.
+    Passing the same checkpoint to a repeated upload of a directory skips
+    the files which were already uploaded and have not changed since, so
+    an upload interrupted by a crash or a lost connection resumes where it
+    stopped.
+
+    Each completed file is appended to the checkpoint file as a line of
+    JSON as soon as it is uploaded.
+    """
+
+    def __init__(self, path):
+        """
+        Constructor.
+
+        :param path: The path of the checkpoint file. It is created when the
+            first file is recorded, and read if it already exists.
+        :type path: str
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._completed = {}
+        if os.path.isfile(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # The last line may be incomplete if the process
+                        # was killed while writing it
+                        continue
+                    self._completed[entry["dest_path"]] = entry
+
+    @property
+    def path(self):
+        return self._path
+
+    def is_complete(self, source_path, dest_path):
+        """
+        Indicates whether a file was uploaded to a destination path and has
+        not been modified since.
+
+        :param source_path: The path to the local file
+        :type source_path: str
+        :param dest_path: The path the file is uploaded to
+        :type dest_path: str
+        :rtype: bool
+        """
+        entry = self._completed.get(dest_path)
+        if entry is None or entry["source_path"] != source_path:
+            return False
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return False
+        return entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime
+
+    def record(self, source_path, dest_path):
+        """
+        Records that a file was uploaded.
+
+        :param source_path: The path to the local file
+        :type source_path: str
+        :param dest_path: The path the file was uploaded to
+        :type dest_path: str
+        """
+        stat = os.stat(source_path)
+        entry = {
+            "source_path": source_path,
+            "dest_path": dest_path,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime
+        }
+        with self._lock:
+            with open(self._path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._completed[dest_path] = entry
+
+    def clear(self):
+        """
+        Forgets every completed file and removes the checkpoint file.
+        """
+        with self._lock:
+            self._completed = {}
+            if os.path.isfile(self._path):
+                os.remove(self._path)
+
+    def __len__(self):
+        return len(self._completed)
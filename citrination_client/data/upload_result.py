@@ -1,8 +1,11 @@
+import threading
+
 class UploadResult(object):
     """
     The result of an attempted upload. Keeps track of the failures
     and successes if multiple files were uploaded (for instance,
-    if a directory was uploaded).
+    if a directory was uploaded). Files may be registered from several
+    threads at once.
     """
 
     def __init__(self):
@@ -11,6 +14,7 @@ class UploadResult(object):
         """
         self._failures = []
         self._successes = []
+        self._lock = threading.Lock()
 
     @property
     def failures(self):
@@ -38,10 +42,11 @@ class UploadResult(object):
         :param reason: The reason the file failed to upload
         :type reason: str
         """
-        self._failures.append({
-                "path": filepath,
-                "reason": reason
-            })
+        with self._lock:
+            self._failures.append({
+                    "path": filepath,
+                    "reason": reason
+                })
 
     def add_success(self, filepath):
         """
@@ -50,6 +55,7 @@ class UploadResult(object):
         :param filepath: The path to the successfully uploaded file.
         :type filepath: str
         """
-        self._successes.append({
-                "path": filepath
-            })
\ No newline at end of file
+        with self._lock:
+            self._successes.append({
+                    "path": filepath
+                })
\ No newline at end of file
@@ -2,9 +2,11 @@ from citrination_client.models.event import Event
 from citrination_client.models.service_status import ServiceStatus
 from citrination_client.models.predicted_value import PredictedValue
 from citrination_client.models.prediction_result import PredictionResult
+from citrination_client.models.prediction_batch import PredictionBatch
 from citrination_client.models.projection import Projection
 from citrination_client.models.tsne import Tsne
 from citrination_client.models.data_view_status import DataViewStatus
 from citrination_client.models.columns import *
+from citrination_client.models.prediction_cache import PredictionCache
 from citrination_client.models.client import ModelsClient
 from citrination_client.models.design import *
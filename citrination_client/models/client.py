@@ -3,23 +3,59 @@ from citrination_client.models import *
 from citrination_client.models.design import *
 from citrination_client.models import routes as routes
 from citrination_client.base.errors import CitrinationClientError
+from citrination_client.base.errors import CitrinationServerErrorException
+from citrination_client.base.errors import RequestTimeoutException
 from citrination_client.data import Dataset
 from citrination_client.models.data_view import DataView
 from citrination_client.models.columns.column_factory import ColumnFactory
 
+from concurrent.futures import ThreadPoolExecutor
+import requests
 import time
 
+# Errors after which a chunk of a batch prediction is worth sending again.
+# Rate limiting is left to the retry policy of the transport, which waits
+# for the time Citrination asks for.
+RETRYABLE_PREDICT_ERRORS = (
+    RequestTimeoutException,
+    CitrinationServerErrorException,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout
+)
+
 class ModelsClient(BaseClient):
     """
     A client that encapsulates interactions with models on Citrination.
     """
 
-    def __init__(self, api_key, webserver_host="https://citrination.com", suppress_warnings=False):
+    def __init__(self, api_key, webserver_host="https://citrination.com", suppress_warnings=False, transport=None,
+                 prediction_cache=None):
+        """
+        Constructor.
+
+        :param api_key: Authentication token for the Citrination site
+        :type api_key: str
+        :param webserver_host: The base URL of the citrination site, e.g. https://citrination.com
+        :type webserver_host: str
+        :param suppress_warnings: Whether or not usage warnings should be
+            printed to stdout
+        :type suppress_warnings: bool
+        :param transport: The pooled HTTP transport to send requests through
+        :type transport: :class:`Transport`
+        :param prediction_cache: A cache of the predictions made for each
+            candidate. Candidates already predicted by the same data view,
+            method and prior are then answered from the cache, and only the
+            rest are sent to Citrination. Predictions are not cached unless
+            one is supplied.
+        :type prediction_cache: :class:`PredictionCache`
+        """
         members = [
             "tsne",
-            "predict"
+            "predict",
+            "batch_predict"
         ]
-        super(ModelsClient, self).__init__(api_key, webserver_host, members, suppress_warnings=suppress_warnings)
+        super(ModelsClient, self).__init__(api_key, webserver_host, members, suppress_warnings=suppress_warnings, transport=transport)
+        self._prediction_cache = prediction_cache
 
     def tsne(self, data_view_id):
         """
@@ -45,7 +81,7 @@ class ModelsClient(BaseClient):
 
         return tsne
 
-    def predict(self, data_view_id, candidates, method="scalar", use_prior=True):
+    def predict(self, data_view_id, candidates, method="scalar", use_prior=True, as_batch=False):
         """
         Predict endpoint
 
@@ -58,19 +94,143 @@ class ModelsClient(BaseClient):
         :type method: str ("scalar" or "from_distribution")
         :param use_prior:  Whether to apply prior values implied by the property descriptors
         :type use_prior: bool
+        :param as_batch: Whether to return the predictions as arrays in a
+            :class:`PredictionBatch` rather than as a list, which requires NumPy
+        :type as_batch: bool
         :return: The results of the prediction
-        :rtype: list of :class:`PredictionResult`
+        :rtype: list of :class:`PredictionResult` or :class:`PredictionBatch`
+        """
+        return _get_prediction_results(self._predict_candidate_dicts(data_view_id, candidates, method, use_prior),
+                                       as_batch)
+
+    def _predict_candidate_dicts(self, data_view_id, candidates, method, use_prior, idempotent=True):
         """
+        :param idempotent: Whether the transport may retry the prediction
+            after a server error or a lost connection
+        :type idempotent: bool
+        :return: The prediction for each candidate, as returned by Citrination
+        :rtype: list of dict
+        """
+        if self._prediction_cache is None:
+            return self._predict_candidates(data_view_id, candidates, method, use_prior, idempotent)
+        return self._predict_candidates_with_cache(data_view_id, candidates, method, use_prior, idempotent)
+
+    def _predict_candidates(self, data_view_id, candidates, method, use_prior, idempotent=True):
         body = self._get_predict_body(candidates, method, use_prior)
         failure_message = "Error while making prediction for data view {}".format(data_view_id)
         response_dict = self._get_success_json(
-            self._post_json(routes.data_view_predict(data_view_id), data=body, failure_message=failure_message))
-        candidate_dicts = response_dict["candidates"]
-        return list(
-            map(
-                lambda c: _get_prediction_result_from_candidate(c), candidate_dicts
-            )
-        )
+            self._post_json(routes.data_view_predict(data_view_id), data=body, failure_message=failure_message,
+                            idempotent=idempotent))
+        return response_dict["candidates"]
+
+    def _predict_candidates_with_cache(self, data_view_id, candidates, method, use_prior, idempotent=True):
+        """
+        Predicts candidates, only sending those without a cached prediction
+        to Citrination.
+
+        :return: The prediction for each candidate, as returned by Citrination
+        :rtype: list of dict
+        """
+        _check_predict_method(method)
+        cache = self._prediction_cache
+        if cache.status_due(data_view_id):
+            cache.update_status(data_view_id, self.get_data_view_service_status(data_view_id).predict)
+        if not cache.is_usable(data_view_id):
+            return self._predict_candidates(data_view_id, candidates, method, use_prior, idempotent)
+
+        if not isinstance(candidates, list):
+            candidates = [candidates]
+        keys = [cache.key(data_view_id, method, use_prior, candidate) for candidate in candidates]
+        predictions = [cache.get(key) for key in keys]
+        missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if missing:
+            fetched = self._predict_candidates(data_view_id, [candidates[i] for i in missing], method, use_prior,
+                                               idempotent)
+            for i, prediction in zip(missing, fetched):
+                cache.set(keys[i], prediction)
+                predictions[i] = prediction
+        return predictions
+
+    def batch_predict(self, data_view_id, candidates, method="scalar", use_prior=True, batch_size=1000,
+                      max_workers=4, retries=2, as_batch=False):
+        """
+        Predict endpoint for large numbers of candidates. The candidates are
+        split into batches which are sent concurrently, so that no single
+        request is large enough to time out. Batches that fail with a timeout,
+        server error or connection error are sent again, up to ``retries``
+        more times, after the backoff of the transport's
+        :class:`RetryPolicy`; batches that succeeded are not. These are the
+        only retries of such failures, as the transport does not retry
+        batches itself. Rate limited batches are retried by the transport.
+
+        :param data_view_id: The ID of the data view to use for prediction
+        :type data_view_id: str
+        :param candidates: A list of candidates to make predictions on
+        :type candidates: list of dicts
+        :param method: Method for propagating predictions through model
+            graphs
+        :type method: str ("scalar" or "from_distribution")
+        :param use_prior:  Whether to apply prior values implied by the property descriptors
+        :type use_prior: bool
+        :param batch_size: The number of candidates to send per request
+        :type batch_size: int
+        :param max_workers: The number of requests to send at once
+        :type max_workers: int
+        :param retries: The number of times a failed batch is sent again
+        :type retries: int
+        :param as_batch: Whether to return the predictions as arrays in a
+            :class:`PredictionBatch` rather than as a list, which requires NumPy
+        :type as_batch: bool
+        :return: The results of the prediction, in the order of the candidates
+        :rtype: list of :class:`PredictionResult` or :class:`PredictionBatch`
+        """
+        _check_predict_method(method)
+        if batch_size < 1:
+            raise CitrinationClientError("batch_size must be at least 1")
+        if max_workers < 1:
+            raise CitrinationClientError("max_workers must be at least 1")
+        if retries < 0:
+            raise CitrinationClientError("retries must not be negative")
+
+        if not isinstance(candidates, list):
+            candidates = [candidates]
+        batches = [candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)]
+        results = [None] * len(batches)
+
+        def predict_batch(index):
+            try:
+                # Failed batches are retried in rounds below, rather than also
+                # by the transport, which would multiply the attempts
+                predictions = self._predict_candidate_dicts(data_view_id, batches[index], method, use_prior,
+                                                            idempotent=False)
+                return index, predictions, None
+            except RETRYABLE_PREDICT_ERRORS as e:
+                return index, None, e
+
+        pending = list(range(len(batches)))
+        error = None
+        executor = ThreadPoolExecutor(max(1, min(max_workers, len(batches))))
+        try:
+            for attempt in range(retries + 1):
+                if not pending:
+                    break
+                if attempt > 0:
+                    self._transport.retry_policy.wait(attempt)
+                failed = []
+                for index, result, batch_error in executor.map(predict_batch, pending):
+                    if batch_error is None:
+                        results[index] = result
+                    else:
+                        failed.append((index, batch_error))
+                pending = [index for index, _ in failed]
+                if failed:
+                    error = failed[-1][1]
+        finally:
+            executor.shutdown(wait=True)
+
+        if pending:
+            raise error
+        return _get_prediction_results([c for batch in results for c in batch], as_batch)
 
     def _data_analysis(self, data_view_id):
         """
@@ -84,8 +244,7 @@ class ModelsClient(BaseClient):
         return self._get_success_json(self._get(routes.data_analysis(data_view_id), failure_message=failure_message))
 
     def _get_predict_body(self, candidates, method="scalar", use_prior=True):
-        if not (method == "scalar" or method == "from_distribution"):
-            raise ValueError("{} method not supported".format(method))
+        _check_predict_method(method)
 
         # If a single candidate is passed, wrap in a list for the user
         if not isinstance(candidates, list):
@@ -275,6 +434,19 @@ class ModelsClient(BaseClient):
             model_reports = ServiceStatus.from_response_dict(result["model_reports"])
         )
 
+def _check_predict_method(method):
+    if not (method == "scalar" or method == "from_distribution"):
+        raise ValueError("{} method not supported".format(method))
+
+def _get_prediction_results(candidate_dicts, as_batch):
+    if as_batch:
+        return PredictionBatch.from_candidates(candidate_dicts)
+    return list(
+        map(
+            lambda c: _get_prediction_result_from_candidate(c), candidate_dicts
+        )
+    )
+
 def _get_prediction_result_from_candidate(candidate_dict):
     result = PredictionResult()
     for k, v in candidate_dict.items():
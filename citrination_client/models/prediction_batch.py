@@ -0,0 +1,132 @@
+from citrination_client.models.predicted_value import PredictedValue
+from citrination_client.models.prediction_result import PredictionResult
+from citrination_client.util.optional import import_optional
+
+from collections import OrderedDict
+from numbers import Number
+
+class PredictionBatch(object):
+    """
+    The predictions for a list of candidates, stored as one array of values
+    and one array of losses per descriptor key rather than as an object per
+    predicted value. Numeric predictions are stored as float64 arrays, with
+    NaN where a candidate has no prediction for the key; other predictions,
+    such as categories, are stored in object arrays.
+
+    Indexing or iterating over a batch gives a :class:`PredictionResult` per
+    candidate, for code written against the results of
+    :meth:`ModelsClient.predict`. Requires NumPy.
+    """
+
+    def __init__(self, values, losses, present, size):
+        """
+        Constructor.
+
+        :param values: The predicted values of each candidate, by descriptor key
+        :type values: dict of str to numpy.ndarray
+        :param losses: The losses of each candidate, by descriptor key
+        :type losses: dict of str to numpy.ndarray
+        :param present: Whether each candidate has a prediction, by descriptor key
+        :type present: dict of str to numpy.ndarray
+        :param size: The number of candidates
+        :type size: int
+        """
+        self._values = values
+        self._losses = losses
+        self._present = present
+        self._size = size
+
+    @staticmethod
+    def from_candidates(candidate_dicts):
+        """
+        Builds a batch from the candidates of a predict response, which map
+        each descriptor key to a [value, loss] pair.
+
+        :param candidate_dicts: The predicted candidates
+        :type candidate_dicts: list of dict
+        :rtype: :class:`PredictionBatch`
+        """
+        np = import_optional("numpy")
+        size = len(candidate_dicts)
+        columns = OrderedDict()
+        for i, candidate in enumerate(candidate_dicts):
+            for key, prediction in candidate.items():
+                if key not in columns:
+                    columns[key] = ([None] * size, [None] * size)
+                columns[key][0][i] = prediction[0]
+                columns[key][1][i] = prediction[1]
+
+        values = OrderedDict()
+        losses = OrderedDict()
+        present = OrderedDict()
+        for key, (key_values, key_losses) in columns.items():
+            present[key] = np.array([v is not None for v in key_values], dtype=bool)
+            if all(v is None or (isinstance(v, Number) and not isinstance(v, bool)) for v in key_values):
+                values[key] = np.array([np.nan if v is None else v for v in key_values], dtype=np.float64)
+            else:
+                values[key] = np.empty(size, dtype=object)
+                values[key][:] = key_values
+            losses[key] = np.array([np.nan if l is None else l for l in key_losses], dtype=np.float64)
+        return PredictionBatch(values, losses, present, size)
+
+    def all_keys(self):
+        """
+        Retrieves a list of all the descriptor keys which were predicted.
+
+        :rtype: list of str
+        """
+        return list(self._values.keys())
+
+    def get_values(self, key):
+        """
+        Retrieves the predicted values for a descriptor key.
+
+        :param key: A descriptor key
+        :type key: str
+        :return: The value for each candidate, or None if the key was not predicted
+        :rtype: numpy.ndarray
+        """
+        return self._values.get(key)
+
+    def get_losses(self, key):
+        """
+        Retrieves the losses of the predictions for a descriptor key.
+
+        :param key: A descriptor key
+        :type key: str
+        :return: The loss for each candidate, or None if the key was not predicted
+        :rtype: numpy.ndarray
+        """
+        return self._losses.get(key)
+
+    def to_results(self):
+        """
+        Converts the batch to one :class:`PredictionResult` per candidate.
+
+        :rtype: list of :class:`PredictionResult`
+        """
+        return [self[i] for i in range(self._size)]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Prediction batch index out of range")
+        result = PredictionResult()
+        for key, values in self._values.items():
+            if self._present[key][index]:
+                value = values[index]
+                loss = self._losses[key][index]
+                result.add_value(key, PredictedValue(key, _to_python(value), _to_python(loss)))
+        return result
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def __len__(self):
+        return self._size
+
+def _to_python(value):
+    # Converts NumPy scalars back to the built-in types predict returns
+    return value.item() if hasattr(value, "item") else value
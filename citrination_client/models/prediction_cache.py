@@ -0,0 +1,168 @@
+from citrination_client.util.cache import MemoryCache, fingerprint
+
+import json
+import threading
+import time
+
+class PredictionCache(object):
+    """
+    A cache of the predictions made for individual candidates, keyed by the
+    data view, the prediction method and prior, and the candidate itself.
+
+    Cached predictions are only valid for the models they were made with.
+    The status of each data view's predict service is checked at most once
+    per ``status_interval`` seconds: while the service is not ready, which is
+    the case while the data view retrains, the cache is bypassed, and once
+    it is ready again the predictions cached for the data view are dropped.
+
+    Citrination does not report a model version, so a retrain is only seen
+    if a status check falls while it runs. A retrain which starts and
+    finishes between two checks goes unnoticed, and predictions from the
+    old models keep being served. Where that matters, lower
+    ``status_interval`` (0 checks before every prediction), set a ``ttl``,
+    or call :meth:`invalidate` after retraining a data view.
+    """
+
+    def __init__(self, max_entries=100000, ttl=None, status_interval=60):
+        """
+        Constructor.
+
+        :param max_entries: The maximum number of candidate predictions to keep
+        :type max_entries: int
+        :param ttl: Seconds after which a prediction expires, or None to keep
+            predictions until they are evicted or invalidated
+        :type ttl: float
+        :param status_interval: Seconds between checks of a data view's
+            status, 0 to check it before every prediction, or None to never
+            check it and only invalidate manually
+        :type status_interval: float
+        """
+        self._cache = MemoryCache(max_entries=max_entries, ttl=ttl)
+        self._status_interval = status_interval
+        self._generations = {}
+        self._statuses = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        return self._cache.stats
+
+    @property
+    def status_interval(self):
+        """
+        Seconds between checks of a data view's status, 0 to check it before
+        every prediction, or None to never check it.
+        """
+        return self._status_interval
+
+    @status_interval.setter
+    def status_interval(self, status_interval):
+        self._status_interval = status_interval
+
+    def key(self, data_view_id, method, use_prior, candidate):
+        """
+        Builds the key a candidate's prediction is cached under.
+
+        :param data_view_id: The ID of the data view making the prediction
+        :type data_view_id: str
+        :param method: The prediction method
+        :type method: str
+        :param use_prior: Whether priors are applied
+        :type use_prior: bool
+        :param candidate: The inputs of the candidate
+        :type candidate: dict
+        :rtype: str
+        """
+        with self._lock:
+            generation = self._generations.get(str(data_view_id), 0)
+        return fingerprint(
+            str(data_view_id), str(generation), method, str(bool(use_prior)),
+            json.dumps(candidate, sort_keys=True))
+
+    def get(self, key):
+        """
+        Retrieves a cached prediction.
+
+        :param key: The key from :meth:`key`
+        :type key: str
+        :return: The prediction for the candidate, as returned by Citrination,
+            or None if it is not cached
+        :rtype: dict
+        """
+        value = self._cache.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, prediction):
+        """
+        Caches the prediction for a candidate.
+
+        :param key: The key from :meth:`key`
+        :type key: str
+        :param prediction: The prediction for the candidate, as returned by
+            Citrination
+        :type prediction: dict
+        """
+        self._cache.set(key, json.dumps(prediction))
+
+    def invalidate(self, data_view_id=None):
+        """
+        Drops the predictions cached for a data view.
+
+        :param data_view_id: The data view to drop the predictions of, or
+            None to drop every prediction
+        :type data_view_id: str
+        """
+        if data_view_id is None:
+            self._cache.clear()
+            return
+        # Entries are keyed by generation, so old ones are never read again
+        # and age out of the LRU cache
+        with self._lock:
+            self._generation += 1
+            self._generations[str(data_view_id)] = self._generation
+
+    def status_due(self, data_view_id):
+        """
+        Indicates whether the status of a data view should be checked before
+        its cached predictions are used.
+
+        :param data_view_id: The ID of the data view
+        :type data_view_id: str
+        :rtype: bool
+        """
+        if self._status_interval is None:
+            return False
+        with self._lock:
+            status = self._statuses.get(str(data_view_id))
+        return status is None or status[0] + self._status_interval <= time.time()
+
+    def update_status(self, data_view_id, predict_status):
+        """
+        Records the status of a data view's predict service, dropping its
+        cached predictions if the service is retraining or has finished.
+
+        :param data_view_id: The ID of the data view
+        :type data_view_id: str
+        :param predict_status: The status of the data view's predict service
+        :type predict_status: :class:`ServiceStatus`
+        """
+        ready = predict_status is not None and predict_status.is_ready()
+        with self._lock:
+            previous = self._statuses.get(str(data_view_id))
+            self._statuses[str(data_view_id)] = (time.time(), ready)
+        if not ready or (previous is not None and not previous[1]):
+            self.invalidate(data_view_id)
+
+    def is_usable(self, data_view_id):
+        """
+        Indicates whether predictions for a data view may be cached, which is
+        the case unless its predict service was last seen not ready.
+
+        :param data_view_id: The ID of the data view
+        :type data_view_id: str
+        :rtype: bool
+        """
+        with self._lock:
+            status = self._statuses.get(str(data_view_id))
+        return status is None or status[1]
@@ -0,0 +1,118 @@
+from citrination_client.models import ModelsClient
+from citrination_client.base import retry
+from citrination_client.base.errors import CitrinationClientError, RequestTimeoutException, RateLimitingException
+import requests_mock
+import pytest
+
+site = "mock://citrination"
+predict_url = site + "/api/data_views/42/predict"
+
+def _predict(request, context):
+    """
+    Stands in for the predict route: predicts y = 2x for each candidate
+    """
+    candidates = request.json()["predictionRequest"]["candidates"]
+    return {"candidates": [{"y": [2.0 * c["x"], 0.1]} for c in candidates]}
+
+@pytest.fixture
+def waits(monkeypatch):
+    waits = []
+    monkeypatch.setattr(retry, "sleep", waits.append)
+    return waits
+
+@pytest.fixture
+def client(waits):
+    return ModelsClient("mykey", site)
+
+def _values(results):
+    return [result.get_value("y").value for result in results]
+
+def test_batches_are_reassembled_in_order(client):
+    """
+    Tests that candidates are sent in batches and their predictions are
+    returned in the order of the candidates
+    """
+    candidates = [{"x": i} for i in range(23)]
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=_predict)
+        results = client.batch_predict("42", candidates, batch_size=5, max_workers=3)
+        sizes = sorted(len(r.json()["predictionRequest"]["candidates"]) for r in m.request_history)
+    assert _values(results) == [2.0 * i for i in range(23)]
+    assert sizes == [3, 5, 5, 5, 5]
+
+def test_only_failed_batches_are_retried(client):
+    """
+    Tests that a batch which timed out is sent again, without resending
+    the batches which succeeded
+    """
+    failures = {"remaining": 1}
+
+    def flaky(request, context):
+        candidates = request.json()["predictionRequest"]["candidates"]
+        if candidates[0]["x"] == 4 and failures["remaining"]:
+            failures["remaining"] -= 1
+            context.status_code = 524
+            return {}
+        return _predict(request, context)
+
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=flaky)
+        results = client.batch_predict("42", [{"x": i} for i in range(8)], batch_size=2)
+        assert m.call_count == 5
+    assert _values(results) == [2.0 * i for i in range(8)]
+
+def test_retries_are_limited(client, waits):
+    """
+    Tests that the error of a batch is raised once it has failed on
+    every attempt, that the transport does not retry batches as well, and
+    that each round of retries waits for the backoff of the retry policy
+    """
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, status_code=524)
+        with pytest.raises(RequestTimeoutException):
+            client.batch_predict("42", [{"x": 1}], retries=2)
+        assert m.call_count == 3
+    assert len(waits) == 2
+    assert 0 <= waits[0] <= 1.0 and 0 <= waits[1] <= 2.0
+
+def test_rate_limiting_is_left_to_the_transport(client, waits):
+    """
+    Tests that rate limited batches are retried by the transport, after
+    the time Citrination asks for, and not again in rounds of batches
+    """
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, status_code=429, headers={"Retry-After": "3"})
+        with pytest.raises(RateLimitingException):
+            client.batch_predict("42", [{"x": 1}], retries=2)
+        assert m.call_count == 4
+    assert waits == [3.0, 3.0, 3.0]
+
+def test_unretryable_errors_are_raised(client):
+    """
+    Tests that errors other than timeouts and server errors are not retried
+    """
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, status_code=401)
+        with pytest.raises(CitrinationClientError):
+            client.batch_predict("42", [{"x": 1}], retries=2)
+        assert m.call_count == 1
+
+def test_invalid_arguments(client):
+    """
+    Tests that the method and batching arguments are validated before
+    any request is made
+    """
+    with pytest.raises(ValueError):
+        client.batch_predict("42", [{"x": 1}], method="nonsense")
+    with pytest.raises(CitrinationClientError):
+        client.batch_predict("42", [{"x": 1}], batch_size=0)
+    with pytest.raises(CitrinationClientError):
+        client.batch_predict("42", [{"x": 1}], max_workers=0)
+
+def test_no_candidates(client):
+    """
+    Tests that predicting no candidates makes no requests
+    """
+    with requests_mock.Mocker() as m:
+        assert client.batch_predict("42", []) == []
+        assert m.call_count == 0
@@ -0,0 +1,59 @@
+from citrination_client.models import ModelsClient, PredictionBatch, PredictionResult
+import requests_mock
+import pytest
+
+np = pytest.importorskip("numpy")
+
+site = "mock://citrination"
+
+candidates = [
+    {"Band gap": [1.5, 0.2], "Crystallinity": ["Amorphous", 0.4]},
+    {"Band gap": [2, 0.3], "Crystallinity": ["Polycrystalline", 0.1]},
+    {"Band gap": [0.5, 0.1]}
+]
+
+def test_values_and_losses_are_arrays():
+    """
+    Tests that numeric predictions are stored as float arrays and other
+    predictions as object arrays, one entry per candidate
+    """
+    batch = PredictionBatch.from_candidates(candidates)
+    assert len(batch) == 3
+    assert batch.all_keys() == ["Band gap", "Crystallinity"]
+    assert batch.get_values("Band gap").dtype == np.float64
+    assert batch.get_values("Band gap").tolist() == [1.5, 2.0, 0.5]
+    assert batch.get_losses("Band gap").tolist() == [0.2, 0.3, 0.1]
+    assert batch.get_values("Crystallinity").dtype == object
+    assert batch.get_values("Crystallinity")[1] == "Polycrystalline"
+    assert np.isnan(batch.get_losses("Crystallinity")[2])
+    assert batch.get_values("Missing") is None
+
+def test_candidate_view():
+    """
+    Tests that indexing a batch gives the same result predict returns for
+    the candidate, without the keys it was not predicted for
+    """
+    batch = PredictionBatch.from_candidates(candidates)
+    result = batch[0]
+    assert isinstance(result, PredictionResult)
+    assert result.get_value("Band gap").value == 1.5
+    assert result.get_value("Band gap").loss == 0.2
+    assert result.get_value("Crystallinity").value == "Amorphous"
+    assert batch[-1].get_value("Crystallinity") is None
+    assert [r.get_value("Band gap").value for r in batch] == [1.5, 2.0, 0.5]
+    with pytest.raises(IndexError):
+        batch[3]
+
+def test_predict_as_batch():
+    """
+    Tests that predict and batch_predict can return a batch
+    """
+    client = ModelsClient("mykey", site)
+    with requests_mock.Mocker() as m:
+        m.post(site + "/api/data_views/42/predict", json={"candidates": candidates})
+        batch = client.predict("42", [{}, {}, {}], as_batch=True)
+        assert batch.get_values("Band gap").tolist() == [1.5, 2.0, 0.5]
+
+        m.post(site + "/api/data_views/42/predict", json={"candidates": candidates[:1]})
+        batch = client.batch_predict("42", [{}, {}], batch_size=1, as_batch=True)
+        assert batch.get_values("Band gap").tolist() == [1.5, 1.5]
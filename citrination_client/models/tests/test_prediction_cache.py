@@ -0,0 +1,144 @@
+from citrination_client.models import ModelsClient, PredictionCache
+import requests_mock
+import pytest
+
+site = "mock://citrination"
+predict_url = site + "/api/data_views/42/predict"
+status_url = site + "/api/data_views/42/status"
+
+def _predict(request, context):
+    """
+    Stands in for the predict route: predicts y = 2x for each candidate
+    """
+    candidates = request.json()["predictionRequest"]["candidates"]
+    return {"candidates": [{"y": [2.0 * c["x"], 0.1]} for c in candidates]}
+
+def _status(ready):
+    service = {"ready": ready, "reason": "", "context": "notice"}
+    return {"data": {"status": {
+        "predict": service,
+        "experimental_design": service,
+        "data_reports": service,
+        "model_reports": service
+    }}}
+
+def _sent(m):
+    return [c["x"] for r in m.request_history if r.url == predict_url
+            for c in r.json()["predictionRequest"]["candidates"]]
+
+def _values(results):
+    return [result.get_value("y").value for result in results]
+
+def test_only_misses_are_sent():
+    """
+    Tests that cached candidates are not sent again, and that cached and
+    fetched predictions are merged in the order of the candidates
+    """
+    client = ModelsClient("mykey", site, prediction_cache=PredictionCache(status_interval=None))
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=_predict)
+        client.predict("42", [{"x": 1}, {"x": 3}])
+        results = client.predict("42", [{"x": 3}, {"x": 2}, {"x": 1}])
+        assert _sent(m) == [1, 3, 2]
+    assert _values(results) == [6.0, 4.0, 2.0]
+
+def test_fully_cached_predictions_make_no_request():
+    """
+    Tests that repeating a prediction is answered from the cache
+    """
+    cache = PredictionCache(status_interval=None)
+    client = ModelsClient("mykey", site, prediction_cache=cache)
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=_predict)
+        client.predict("42", {"x": 1})
+        results = client.predict("42", {"x": 1})
+        assert m.call_count == 1
+    assert _values(results) == [2.0]
+    assert cache.stats.hits == 1
+
+def test_key_includes_method_and_prior():
+    """
+    Tests that predictions made with another method or prior are not reused
+    """
+    cache = PredictionCache()
+    key = cache.key("42", "scalar", True, {"x": 1, "z": 2})
+    assert key == cache.key("42", "scalar", True, {"z": 2, "x": 1})
+    assert key != cache.key("42", "from_distribution", True, {"x": 1, "z": 2})
+    assert key != cache.key("42", "scalar", False, {"x": 1, "z": 2})
+    assert key != cache.key("43", "scalar", True, {"x": 1, "z": 2})
+
+def test_cache_is_bypassed_while_retraining():
+    """
+    Tests that predictions are neither served from nor stored in the cache
+    while the data view is not ready, and that the predictions made before
+    retraining are dropped once it is ready again
+    """
+    client = ModelsClient("mykey", site, prediction_cache=PredictionCache(status_interval=0))
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=_predict)
+        m.get(status_url, json=_status(True))
+        client.predict("42", [{"x": 1}])
+        client.predict("42", [{"x": 1}])
+        assert _sent(m) == [1]
+
+        m.get(status_url, json=_status(False))
+        client.predict("42", [{"x": 1}])
+        client.predict("42", [{"x": 1}])
+        assert _sent(m) == [1, 1, 1]
+
+        m.get(status_url, json=_status(True))
+        client.predict("42", [{"x": 1}])
+        client.predict("42", [{"x": 1}])
+        assert _sent(m) == [1, 1, 1, 1]
+
+def test_status_is_checked_once_per_interval():
+    """
+    Tests that the data view status is not requested on every prediction
+    """
+    client = ModelsClient("mykey", site, prediction_cache=PredictionCache(status_interval=3600))
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=_predict)
+        m.get(status_url, json=_status(True))
+        for i in range(3):
+            client.predict("42", [{"x": i}])
+        assert len([r for r in m.request_history if r.url == status_url]) == 1
+
+def test_status_interval_can_be_changed():
+    """
+    Tests that lowering the status interval of a cache in use makes the
+    next prediction check the status again
+    """
+    cache = PredictionCache(status_interval=3600)
+    client = ModelsClient("mykey", site, prediction_cache=cache)
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=_predict)
+        m.get(status_url, json=_status(True))
+        client.predict("42", [{"x": 1}])
+        cache.status_interval = 0
+        client.predict("42", [{"x": 1}])
+        assert len([r for r in m.request_history if r.url == status_url]) == 2
+
+def test_manual_invalidation():
+    """
+    Tests that invalidating a data view drops its cached predictions
+    """
+    cache = PredictionCache(status_interval=None)
+    client = ModelsClient("mykey", site, prediction_cache=cache)
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=_predict)
+        client.predict("42", [{"x": 1}])
+        cache.invalidate("42")
+        client.predict("42", [{"x": 1}])
+        assert m.call_count == 2
+
+def test_batch_predict_uses_the_cache():
+    """
+    Tests that batch predictions only send the batches' cache misses
+    """
+    client = ModelsClient("mykey", site, prediction_cache=PredictionCache(status_interval=None))
+    with requests_mock.Mocker() as m:
+        m.post(predict_url, json=_predict)
+        client.predict("42", [{"x": i} for i in range(0, 10, 2)])
+        results = client.batch_predict("42", [{"x": i} for i in range(10)], batch_size=4)
+        assert sorted(_sent(m)[5:]) == [1, 3, 5, 7, 9]
+    assert _values(results) == [2.0 * i for i in range(10)]
@@ -1,30 +1,70 @@
-from citrination_client.search.query_encoder import QueryEncoder
+from citrination_client.search.query_encoder import encode_query, query_to_dictionary
+from citrination_client.search.result_decoder import decode_search_result, decode_multi_search_result
 from citrination_client.search import *
 from citrination_client.search import routes as routes
+from citrination_client.search import partition
 from citrination_client.util import config as client_config
+from citrination_client.util.cache import fingerprint
 from citrination_client.base.base_client import BaseClient
 from citrination_client.base.errors import RequestTimeoutException
 from citrination_client.base.errors import CitrinationClientError
 
 from pypif.util.case import to_camel_case
-from pypif.util.case import keys_to_snake_case
 
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from six.moves import queue
 import json
+import threading
 import requests
 
 DEFAULT_FAILURE_MESSAGE = "An error occurred requesting search results from Citrination"
 MAX_QUERY_DEPTH = 50000
+PARTITION_EPOCH = datetime(1970, 1, 1)
+_PARTITION_DONE = object()
 
 
 class SearchClient(BaseClient):
-    def __init__(self, api_key, webserver_host="https://citrination.com", suppress_warnings=False):
+    def __init__(self, api_key, webserver_host="https://citrination.com", suppress_warnings=False, transport=None,
+                 cache=None, pif_store=None):
+        """
+        Constructor.
+
+        :param api_key: Authentication token for the Citrination site
+        :type api_key: str
+        :param webserver_host: The base URL of the citrination site, e.g. https://citrination.com
+        :type webserver_host: str
+        :param suppress_warnings: Whether or not usage warnings should be
+            printed to stdout
+        :type suppress_warnings: bool
+        :param transport: The pooled HTTP transport to send requests through
+        :type transport: :class:`Transport`
+        :param cache: A cache for the pages of PIF and dataset search results,
+            keyed by a fingerprint of the site, the API key and each page's
+            query. Repeated queries are then answered from the cache rather
+            than by Citrination. Results are not cached unless one is
+            supplied.
+        :type cache: :class:`ResponseCache`
+        :param pif_store: A local store of PIFs to fill with the systems of
+            PIF search hits which carry a dataset version, for later use by
+            :meth:`DataClient.get_pif`.
+        :type pif_store: :class:`PifStore`
+        """
         members = [
             "pif_search",
             "pif_multi_search",
-            "dataset_search"
+            "dataset_search",
+            "iter_pif_search",
+            "iter_dataset_search",
+            "iter_partitioned_pif_search"
         ]
-        super(SearchClient, self).__init__(api_key, webserver_host, members, suppress_warnings=suppress_warnings)
+        super(SearchClient, self).__init__(api_key, webserver_host, members, suppress_warnings=suppress_warnings, transport=transport)
+        self._cache = cache
+        # Results depend on the site and on what the account can see, so a
+        # cache shared between clients must not serve one client's results
+        # to another. The API key is only kept in hashed form.
+        self._cache_scope = fingerprint(self.api_url, api_key)
+        self._pif_store = pif_store
 
     def _handle_response(self, response, failure_message=DEFAULT_FAILURE_MESSAGE):
         if response.status_code == 204:
@@ -53,12 +93,16 @@ class SearchClient(BaseClient):
                 "Citrination does not support pagination past the {0}th result. Please reduce either the from_index and/or size such that their sum is below {0}".format(
                     MAX_QUERY_DEPTH))
 
-    def pif_search(self, pif_system_returning_query):
+    def pif_search(self, pif_system_returning_query, max_workers=1):
         """
         Run a PIF query against Citrination.
 
         :param pif_system_returning_query: The PIF system query to execute.
         :type pif_system_returning_query: :class:`PifSystemReturningQuery`
+        :param max_workers: The number of result pages to request at once.
+            Once the first page has been returned, the offsets of the rest
+            are known and up to this many of them are fetched concurrently.
+        :type max_workers: int
         :return: :class:`PifSearchResult` object with the results of the query.
         :rtype: :class:`PifSearchResult`
         """
@@ -66,15 +110,18 @@ class SearchClient(BaseClient):
         self._validate_search_query(pif_system_returning_query)
         return self._execute_search_query(
             pif_system_returning_query,
-            PifSearchResult
+            PifSearchResult,
+            max_workers=max_workers
         )
 
-    def dataset_search(self, dataset_returning_query):
+    def dataset_search(self, dataset_returning_query, max_workers=1):
         """
         Run a dataset query against Citrination.
 
         :param dataset_returning_query: :class:`DatasetReturningQuery` to execute.
         :type dataset_returning_query: :class:`DatasetReturningQuery`
+        :param max_workers: The number of result pages to request at once.
+        :type max_workers: int
         :return: Dataset search result object with the results of the query.
         :rtype: :class:`DatasetSearchResult`
         """
@@ -82,17 +129,243 @@ class SearchClient(BaseClient):
         self._validate_search_query(dataset_returning_query)
         return self._execute_search_query(
             dataset_returning_query,
-            DatasetSearchResult
+            DatasetSearchResult,
+            max_workers=max_workers
+        )
+
+    def iter_pif_search(self, pif_system_returning_query, prefetch=True):
+        """
+        Run a PIF query against Citrination, generating the hits one at a
+        time as their pages arrive rather than collecting them all first.
+        The first hit is available after a single request, and only the
+        current page (and the next one, if prefetching) is held in memory.
+
+        :param pif_system_returning_query: The PIF system query to execute.
+        :type pif_system_returning_query: :class:`PifSystemReturningQuery`
+        :param prefetch: Whether to request the next page of results while
+            the hits of the current page are being consumed.
+        :type prefetch: bool
+        :return: A generator of the hits matched by the query
+        :rtype: generator of :class:`PifSearchHit`
+        """
+
+        self._validate_search_query(pif_system_returning_query)
+        return self._iter_search_hits(
+            pif_system_returning_query,
+            PifSearchResult,
+            prefetch=prefetch
+        )
+
+    def iter_dataset_search(self, dataset_returning_query, prefetch=True):
+        """
+        Run a dataset query against Citrination, generating the hits one at
+        a time as their pages arrive.
+
+        :param dataset_returning_query: :class:`DatasetReturningQuery` to execute.
+        :type dataset_returning_query: :class:`DatasetReturningQuery`
+        :param prefetch: Whether to request the next page of results while
+            the hits of the current page are being consumed.
+        :type prefetch: bool
+        :return: A generator of the hits matched by the query
+        :rtype: generator of :class:`DatasetSearchHit`
+        """
+
+        self._validate_search_query(dataset_returning_query)
+        return self._iter_search_hits(
+            dataset_returning_query,
+            DatasetSearchResult,
+            prefetch=prefetch
         )
 
-    def _execute_search_query(self, returning_query, result_class):
+    def iter_partitioned_pif_search(self, pif_system_returning_query, partitions=None, max_workers=4,
+                                    start=None, end=None):
+        """
+        Scan every record matched by a PIF query, however many there are.
+        The query is split into disjoint sub-queries that are each small
+        enough to be paginated in full, the sub-queries are run in parallel,
+        and their hits are merged into one stream. Hits are generated in the
+        order their pages arrive, not in relevance order, and the from_index
+        and size of the query are ignored.
+
+        Sub-queries can be supplied using the helpers in
+        :mod:`citrination_client.search.partition`, for example to split by
+        dataset. Otherwise the query is split automatically by the time at
+        which records were last updated, halving each time range until the
+        records within it can all be returned.
+
+        :param pif_system_returning_query: The PIF system query to execute.
+        :type pif_system_returning_query: :class:`PifSystemReturningQuery`
+        :param partitions: Disjoint sub-queries which together cover the query
+        :type partitions: list of :class:`PifSystemReturningQuery`
+        :param max_workers: The number of sub-queries to run at once
+        :type max_workers: int
+        :param start: When splitting automatically, the earliest update time
+            to scan from. Defaults to the start of 1970.
+        :type start: datetime or str
+        :param end: When splitting automatically, the update time to scan up
+            to. Defaults to now.
+        :type end: datetime or str
+        :return: A generator of the hits matched by the query
+        :rtype: generator of :class:`PifSearchHit`
+        """
+        if max_workers < 1:
+            raise CitrinationClientError("max_workers must be at least 1")
+        if partitions is None:
+            partitions = self._partition_by_updated_at(pif_system_returning_query, start, end)
+        for partition_query in partitions:
+            self._validate_search_query(partition_query)
+        return self._iter_partitioned_hits(partitions, max_workers)
+
+    def _partition_by_updated_at(self, returning_query, start=None, end=None):
+        """
+        Splits a query by record update time, halving any time range which
+        matches more records than can be returned by one query.
+
+        :param returning_query: The query to split
+        :param start: The earliest update time to include
+        :param end: The update time to include up to
+        :return: The sub-queries
+        :rtype: list of :class:`PifSystemReturningQuery`
+        """
+        start = partition.parse_timestamp(start or PARTITION_EPOCH).replace(microsecond=0)
+        end = partition.parse_timestamp(end or datetime.utcnow()).replace(microsecond=0) + timedelta(seconds=1)
+
+        partitions = []
+        ranges = [(start, end)]
+        while ranges:
+            range_start, range_end = ranges.pop()
+            sub_query = partition.restrict_query(
+                returning_query, system=partition.updated_at_query(range_start, range_end))
+            count = self._count_search_query(sub_query, PifSearchResult)
+            if count == 0:
+                continue
+            if count <= client_config.max_query_size:
+                partitions.append(sub_query)
+                continue
+            if range_end - range_start <= timedelta(milliseconds=1):
+                raise CitrinationClientError(
+                    "{} records were updated at {}, more than can be returned by a single query".format(
+                        count, partition.format_timestamp(range_start)))
+            midpoint = range_start + timedelta(
+                milliseconds=int((range_end - range_start).total_seconds() * 1000) // 2)
+            ranges.append((midpoint, range_end))
+            ranges.append((range_start, midpoint))
+
+        return partitions
+
+    def _count_search_query(self, returning_query, result_class):
+        """
+        Counts the records matched by a query without returning any of them.
+
+        :param returning_query: :class:`BaseReturningQuery` to count.
+        :param result_class: The class of the result of the query.
+        :return: The number of records matched
+        :rtype: int
+        """
+        return self._search_page(self._encode_search_query(returning_query), result_class, 0, 0).total_num_hits
+
+    def _iter_partitioned_hits(self, partitions, max_workers):
+        """
+        Runs sub-queries in parallel, generating their hits as each page
+        arrives. A bounded number of pages is buffered, so workers wait for
+        the caller to catch up rather than holding every result in memory.
+
+        :param partitions: The sub-queries to run
+        :param max_workers: The number of sub-queries to run at once
+        :return: A generator of hits
+        """
+        pages = queue.Queue(maxsize=max_workers * 2)
+        stopped = threading.Event()
+        size = client_config.max_query_size
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def scan(partition_query):
+            if stopped.is_set():
+                return
+            try:
+                query_dict = self._encode_search_query(partition_query)
+                query_dict["size"] = size
+                for page in self._iter_search_pages(query_dict, PifSearchResult, 0, size):
+                    if page.total_num_hits > size:
+                        raise CitrinationClientError(
+                            "A partition matches {} records, more than the {} a single query can return. "
+                            "Please split it further".format(page.total_num_hits, size))
+                    if stopped.is_set():
+                        return
+                    put(page.hits or [])
+            except Exception as e:
+                put(e)
+            finally:
+                put(_PARTITION_DONE)
+
+        executor = ThreadPoolExecutor(max_workers)
+        futures = []
+        try:
+            for partition_query in partitions:
+                futures.append(executor.submit(scan, partition_query))
+            remaining = len(partitions)
+            while remaining > 0:
+                item = pages.get()
+                if item is _PARTITION_DONE:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    for hit in item:
+                        yield hit
+        finally:
+            # Stop the running scans after their current page, and drop the
+            # scans which have not started
+            stopped.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _execute_search_query(self, returning_query, result_class, max_workers=1):
         """
         Run a PIF query against Citrination.
 
         :param returning_query: :class:`BaseReturningQuery` to execute.
         :param result_class: The class of the result to return.
+        :param max_workers: The number of pages to request concurrently.
         :return: ``result_class`` object with the results of the query.
         """
+        if max_workers < 1:
+            raise CitrinationClientError("max_workers must be at least 1")
+
+        from_index, size = self._get_search_window(returning_query)
+        query_dict = self._encode_search_query(returning_query)
+
+        if max_workers > 1:
+            return self._execute_paged_search_query(query_dict, result_class, from_index, size, max_workers)
+
+        time = 0.0;
+        hits = [];
+        for partial_results in self._iter_search_pages(query_dict, result_class, from_index, size):
+            total = partial_results.total_num_hits
+            time += partial_results.took
+            if partial_results.hits is not None:
+                hits.extend(partial_results.hits)
+
+        return result_class(hits=hits, total_num_hits=total, took=time)
+
+    def _get_search_window(self, returning_query):
+        """
+        Works out the index of the first hit a query should return and the
+        maximum number of hits to return, warning if the query asks for more
+        hits than can be returned.
+
+        :param returning_query: :class:`BaseReturningQuery` to execute.
+        :return: The index of the first hit and the maximum number of hits
+        :rtype: tuple of int
+        """
         if returning_query.from_index:
             from_index = returning_query.from_index
         else:
@@ -107,22 +380,138 @@ class SearchClient(BaseClient):
                     size != returning_query.size):
             self._warn("Query size greater than max system size - only {} results will be returned".format(size))
 
-        time = 0.0;
-        hits = [];
-        while True:
-            sub_query = deepcopy(returning_query)
-            sub_query.from_index = from_index + len(hits)
-            partial_results = self._search_internal(sub_query, result_class)
-            total = partial_results.total_num_hits
-            time += partial_results.took
-            if partial_results.hits is not None:
-                hits.extend(partial_results.hits)
-            if len(hits) >= size or len(hits) >= total or sub_query.from_index >= total:
-                break
+        return from_index, size
+
+    def _encode_search_query(self, returning_query):
+        """
+        Serializes a query once, so that each page of a search only needs
+        its pagination fields patched rather than the whole query tree
+        copied and re-encoded.
+
+        :param returning_query: :class:`BaseReturningQuery` to execute.
+        :return: The query in the JSON-ready form sent to Citrination
+        :rtype: dict
+        """
+        return query_to_dictionary(returning_query)
+
+    def _iter_search_pages(self, query_dict, result_class, from_index, size, prefetch=False):
+        """
+        Generates the pages of results for a query, in order, until ``size``
+        hits or the end of the results have been reached.
+
+        :param query_dict: The encoded query to execute, as returned by
+            :meth:`_encode_search_query`.
+        :param result_class: The class of the result to return.
+        :param from_index: The index of the first hit to return.
+        :param size: The maximum number of hits to return.
+        :param prefetch: Whether to request each page as soon as the one
+            before it has arrived, while the caller is consuming it.
+        :return: A generator of ``result_class`` objects, one per page.
+        """
+        executor = ThreadPoolExecutor(1) if prefetch else None
+        next_page = None
+        try:
+            num_hits = 0
+            page_from_index = from_index
+            page = self._search_page(query_dict, result_class, page_from_index)
+            while True:
+                total = page.total_num_hits
+                num_hits += len(page.hits or [])
+                done = (not page.hits or num_hits >= size or num_hits >= total or page_from_index >= total)
+                if not done:
+                    page_from_index = from_index + num_hits
+                    if prefetch:
+                        next_page = executor.submit(self._search_page, query_dict, result_class, page_from_index)
+                yield page
+                if done:
+                    return
+                if prefetch:
+                    page = next_page.result()
+                    next_page = None
+                else:
+                    page = self._search_page(query_dict, result_class, page_from_index)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def _iter_search_hits(self, returning_query, result_class, prefetch=True):
+        """
+        Generates the hits for a query one at a time, holding no more than
+        two pages of results in memory.
+
+        :param returning_query: :class:`BaseReturningQuery` to execute.
+        :param result_class: The class of the result pages.
+        :param prefetch: Whether to fetch the next page while the hits of
+            the current page are being consumed.
+        :return: A generator of hits
+        """
+        from_index, size = self._get_search_window(returning_query)
+        query_dict = self._encode_search_query(returning_query)
+        remaining = size
+        for page in self._iter_search_pages(query_dict, result_class, from_index, size, prefetch=prefetch):
+            for hit in (page.hits or [])[:remaining]:
+                yield hit
+            remaining -= len(page.hits or [])
+            if remaining <= 0:
+                return
+
+    def _execute_paged_search_query(self, query_dict, result_class, from_index, size, max_workers):
+        """
+        Run a query by requesting its first page, then fetching the rest of
+        the pages concurrently now that their offsets are known.
+
+        :param query_dict: The encoded query to execute.
+        :param result_class: The class of the result to return.
+        :param from_index: The index of the first hit to return.
+        :param size: The maximum number of hits to return.
+        :param max_workers: The number of pages to request concurrently.
+        :return: ``result_class`` object with the results of the query, with
+            hits in order and ``took`` summed over every page.
+        """
+        first_page = self._search_page(query_dict, result_class, from_index)
+        total = first_page.total_num_hits
+        time = first_page.took
+        hits = first_page.hits or []
+        page_size = len(hits)
+
+        end_index = min(from_index + size, total)
+        if page_size == 0 or from_index + page_size >= end_index:
+            return result_class(hits=hits, total_num_hits=total, took=time)
+
+        offsets = range(from_index + page_size, end_index, page_size)
+        page_sizes = [min(page_size, end_index - offset) for offset in offsets]
+        with ThreadPoolExecutor(max_workers) as executor:
+            pages = list(executor.map(
+                lambda offset, count: self._search_page(query_dict, result_class, offset, count),
+                offsets, page_sizes))
+
+        for page in pages:
+            time += page.took
+            if page.hits is not None:
+                hits.extend(page.hits)
 
         return result_class(hits=hits, total_num_hits=total, took=time)
 
-    def _search_internal(self, returning_query, result_class):
+    def _search_page(self, query_dict, result_class, from_index, size=None):
+        """
+        Fetch a single page of results for a query.
+
+        :param query_dict: The encoded query to execute.
+        :param result_class: The class of the result to return.
+        :param from_index: The index of the first hit on the page.
+        :param size: The number of hits on the page, or None to keep the
+            size of the query.
+        :return: ``result_class`` object with the page of results.
+        """
+        page_dict = dict(query_dict)
+        page_dict["from"] = from_index
+        if size is not None:
+            page_dict["size"] = size
+        return self._search_internal(page_dict, result_class)
+
+    def _search_internal(self, query_dict, result_class):
         if result_class == PifSearchResult:
             route = routes.pif_search
             failure_message = "Error while making PIF search request"
@@ -131,11 +520,24 @@ class SearchClient(BaseClient):
             route = routes.dataset_search
             failure_message = "Error while making dataset search request"
 
+        body = encode_query(query_dict, sort_keys=True)
+        if self._cache is not None:
+            cache_key = fingerprint(self._cache_scope, route, body)
+            cached_results = self._cache.get(cache_key)
+            if cached_results is not None:
+                return decode_search_result(result_class, json.loads(cached_results))
+
         response_json = self._get_success_json(self._post(
-            route, data=json.dumps(returning_query, cls=QueryEncoder),
-            failure_message=failure_message))
+            route, data=body,
+            failure_message=failure_message, idempotent=True))
+
+        if self._cache is not None:
+            self._cache.set(cache_key, json.dumps(response_json['results']))
 
-        return result_class(**keys_to_snake_case(response_json['results']))
+        result = decode_search_result(result_class, response_json['results'])
+        if self._pif_store is not None and result_class == PifSearchResult:
+            self._pif_store.put_search_hits(result.hits or [])
+        return result
 
     def pif_multi_search(self, multi_query):
         """
@@ -146,10 +548,10 @@ class SearchClient(BaseClient):
         """
         failure_message = "Error while making PIF multi search request"
         response_dict = self._get_success_json(
-            self._post(routes.pif_multi_search, data=json.dumps(multi_query, cls=QueryEncoder),
-                       failure_message=failure_message))
+            self._post(routes.pif_multi_search, data=encode_query(multi_query),
+                       failure_message=failure_message, idempotent=True))
 
-        return PifMultiSearchResult(**keys_to_snake_case(response_dict['results']))
+        return decode_multi_search_result(response_dict['results'])
 
     def generate_simple_chemical_query(self, name=None, chemical_formula=None, property_name=None, property_value=None,
                                        property_min=None, property_max=None, property_units=None, reference_doi=None,
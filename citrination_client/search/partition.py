@@ -0,0 +1,148 @@
+"""
+Helpers which split a :class:`PifSystemReturningQuery` into disjoint
+sub-queries, each matching a slice of the records the original matches.
+Each sub-query can then be paginated on its own, so that together they
+cover result sets deeper than Citrination allows a single query to page.
+"""
+from citrination_client.search.core.query.data_query import DataQuery
+from citrination_client.search.core.query.filter import Filter
+from citrination_client.search.dataset.query.dataset_query import DatasetQuery
+from citrination_client.search.pif.query.pif_system_query import PifSystemQuery
+
+from copy import deepcopy
+from datetime import datetime, timedelta
+from six import string_types
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+def restrict_query(returning_query, dataset=None, system=None):
+    """
+    Copies a returning query, requiring that every record it matches also
+    matches the supplied dataset and/or PIF system queries.
+
+    :param returning_query: The query to restrict
+    :type returning_query: :class:`PifSystemReturningQuery`
+    :param dataset: A query the dataset of each record must match
+    :type dataset: :class:`DatasetQuery`
+    :param system: A query each record must match
+    :type system: :class:`PifSystemQuery`
+    :return: A restricted copy of the query
+    :rtype: :class:`PifSystemReturningQuery`
+    """
+    restricted = deepcopy(returning_query)
+    data_queries = restricted.query
+    if data_queries is None:
+        data_queries = [DataQuery()]
+    elif not isinstance(data_queries, list):
+        data_queries = [data_queries]
+
+    for data_query in data_queries:
+        if dataset is not None:
+            data_query.dataset = _append_query(data_query.dataset, dataset)
+        if system is not None:
+            data_query.system = _append_query(data_query.system, system)
+
+    restricted.query = data_queries
+    return restricted
+
+def partition_by_dataset(returning_query, dataset_ids):
+    """
+    Splits a query into one sub-query per dataset.
+
+    :param returning_query: The query to split
+    :type returning_query: :class:`PifSystemReturningQuery`
+    :param dataset_ids: The IDs of the datasets to scan
+    :type dataset_ids: list of int or str
+    :return: The sub-queries, one per dataset
+    :rtype: list of :class:`PifSystemReturningQuery`
+    """
+    return [
+        restrict_query(returning_query, dataset=DatasetQuery(logic="MUST", id=Filter(equal=str(dataset_id))))
+        for dataset_id in dataset_ids
+    ]
+
+def partition_by_updated_at(returning_query, boundaries):
+    """
+    Splits a query into one sub-query per range of record update times.
+    Each range includes its lower boundary and excludes its upper one, so
+    a record updated exactly on a boundary is matched by one sub-query.
+
+    :param returning_query: The query to split
+    :type returning_query: :class:`PifSystemReturningQuery`
+    :param boundaries: Two or more ascending timestamps, as datetimes or
+        ISO 8601 strings such as "2017-10-01T00:00:00.000Z"
+    :type boundaries: list of datetime or str
+    :return: The sub-queries, one per consecutive pair of boundaries
+    :rtype: list of :class:`PifSystemReturningQuery`
+    """
+    boundaries = [parse_timestamp(b) for b in boundaries]
+    if len(boundaries) < 2:
+        raise ValueError("At least two boundaries are needed to make a partition")
+    return [
+        restrict_query(returning_query, system=updated_at_query(start, end))
+        for start, end in zip(boundaries[:-1], boundaries[1:])
+    ]
+
+def partition_by_system_query(returning_query, system_queries):
+    """
+    Splits a query into one sub-query per PIF system query, for example
+    one per range of an extracted property value. The supplied queries
+    must be disjoint for no record to be returned twice.
+
+    :param returning_query: The query to split
+    :type returning_query: :class:`PifSystemReturningQuery`
+    :param system_queries: Queries, each selecting one slice of the records
+    :type system_queries: list of :class:`PifSystemQuery`
+    :return: The sub-queries, one per system query
+    :rtype: list of :class:`PifSystemReturningQuery`
+    """
+    return [restrict_query(returning_query, system=system_query) for system_query in system_queries]
+
+def updated_at_query(start, end):
+    """
+    Builds a query for records updated at or after ``start`` and before ``end``.
+
+    :param start: The earliest update time to match
+    :type start: datetime
+    :param end: The update time to match up to
+    :type end: datetime
+    :rtype: :class:`PifSystemQuery`
+    """
+    return PifSystemQuery(
+        logic="MUST",
+        updated_at=Filter(min=format_timestamp(start), max=format_timestamp(end - timedelta(milliseconds=1))))
+
+def parse_timestamp(timestamp):
+    """
+    Parses an ISO 8601 timestamp in the form Citrination uses.
+
+    :param timestamp: A timestamp string, or a datetime which is returned as is
+    :type timestamp: str or datetime
+    :rtype: datetime
+    """
+    if not isinstance(timestamp, string_types):
+        return timestamp
+    timestamp = timestamp.rstrip("Z")
+    seconds, _, fraction = timestamp.partition(".")
+    parsed = datetime.strptime(seconds, TIMESTAMP_FORMAT)
+    if fraction:
+        parsed += timedelta(microseconds=int(fraction.ljust(6, "0")[:6]))
+    return parsed
+
+def format_timestamp(timestamp):
+    """
+    Formats a datetime in the form Citrination uses, to millisecond precision.
+
+    :param timestamp: The time to format
+    :type timestamp: datetime
+    :rtype: str
+    """
+    return "{}.{:03d}Z".format(timestamp.strftime(TIMESTAMP_FORMAT), timestamp.microsecond // 1000)
+
+def _append_query(existing, query):
+    if existing is None:
+        return [query]
+    elif isinstance(existing, list):
+        return existing + [query]
+    else:
+        return [existing, query]
@@ -0,0 +1,155 @@
+"""
+Builds column-oriented tables from the ``extracted`` values of PIF search
+hits, for vectorized processing with NumPy, pandas or Arrow. Each function
+accepts any iterable of :class:`PifSearchHit`, so the hits of a
+:class:`PifSearchResult` and the generator returned by
+:meth:`SearchClient.iter_pif_search` can both be converted.
+
+Columns are named by ``extract_as`` key. A column whose values are all
+numbers, or strings holding plain decimal numbers, is converted to floats,
+with missing values as NaN; any other column holds the values as they were
+extracted. Strings such as "007", "nan" or "inf" are not treated as
+numbers, so columns of zero-padded IDs or codes keep their values.
+"""
+from citrination_client.util.optional import import_optional
+
+from collections import OrderedDict
+from numbers import Number
+import re
+
+from six import string_types
+
+# Strings converted to floats: decimal numbers, optionally signed and in
+# exponent notation, without leading zeros
+_DECIMAL = re.compile(r"^[+-]?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][+-]?[0-9]+)?$")
+
+def extracted_columns(hits, keys=None, id_column=None):
+    """
+    Gathers the extracted values of hits into one list per key.
+
+    :param hits: The hits to convert
+    :type hits: iterable of :class:`PifSearchHit`
+    :param keys: The extracted keys to include, in order. By default every
+        key extracted by any hit is included, in the order first seen.
+    :type keys: list of str
+    :param id_column: If given, the name of an extra column holding the
+        ID of each hit
+    :type id_column: str
+    :return: A list of values per key, with None where a hit is missing a key
+    :rtype: OrderedDict of str to list
+    """
+    columns = OrderedDict()
+    if id_column is not None:
+        columns[id_column] = []
+    for key in keys or []:
+        columns[key] = []
+
+    num_rows = 0
+    for hit in hits:
+        extracted = hit.extracted or {}
+        if keys is None:
+            for key in extracted:
+                if key not in columns:
+                    columns[key] = [None] * num_rows
+        for key, column in columns.items():
+            if key == id_column:
+                column.append(hit.id)
+            else:
+                column.append(extracted.get(key))
+        num_rows += 1
+
+    return columns
+
+def to_numpy(hits, keys=None, id_column=None):
+    """
+    Converts the extracted values of hits to one NumPy array per key.
+    Requires NumPy.
+
+    :param hits: The hits to convert
+    :type hits: iterable of :class:`PifSearchHit`
+    :param keys: The extracted keys to include
+    :type keys: list of str
+    :param id_column: If given, the name of an extra column of hit IDs
+    :type id_column: str
+    :return: An array per key; float64 for numeric columns, object otherwise
+    :rtype: OrderedDict of str to numpy.ndarray
+    """
+    np = import_optional("numpy")
+    return OrderedDict(
+        (key, _to_array(np, key == id_column, values))
+        for key, values in extracted_columns(hits, keys, id_column).items()
+    )
+
+def to_dataframe(hits, keys=None, id_column=None):
+    """
+    Converts the extracted values of hits to a pandas DataFrame with a
+    column per key. Requires pandas.
+
+    :param hits: The hits to convert
+    :type hits: iterable of :class:`PifSearchHit`
+    :param keys: The extracted keys to include
+    :type keys: list of str
+    :param id_column: If given, the name of an extra column of hit IDs
+    :type id_column: str
+    :rtype: pandas.DataFrame
+    """
+    pd = import_optional("pandas")
+    columns = to_numpy(hits, keys, id_column)
+    return pd.DataFrame(columns, columns=list(columns.keys()))
+
+def to_arrow(hits, keys=None, id_column=None):
+    """
+    Converts the extracted values of hits to an Arrow table with a column
+    per key. Requires pyarrow. Non-numeric columns are stored as strings,
+    since extracted values may mix types.
+
+    :param hits: The hits to convert
+    :type hits: iterable of :class:`PifSearchHit`
+    :param keys: The extracted keys to include
+    :type keys: list of str
+    :param id_column: If given, the name of an extra column of hit IDs
+    :type id_column: str
+    :rtype: pyarrow.Table
+    """
+    pa = import_optional("pyarrow")
+    arrays = []
+    names = []
+    for key, values in extracted_columns(hits, keys, id_column).items():
+        numbers = None if key == id_column else _as_floats(values)
+        if numbers is not None:
+            arrays.append(pa.array(numbers, type=pa.float64()))
+        else:
+            arrays.append(pa.array([None if v is None else str(v) for v in values], type=pa.string()))
+        names.append(key)
+    return pa.Table.from_arrays(arrays, names=names)
+
+def _to_array(np, is_id_column, values):
+    numbers = None if is_id_column else _as_floats(values)
+    if numbers is not None:
+        return np.array([np.nan if v is None else v for v in numbers], dtype=np.float64)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+def _as_floats(values):
+    """
+    Converts a column to floats if every value present is a number or a
+    string holding a plain decimal number, returning None otherwise. A
+    column of only missing values is not considered numeric.
+    """
+    numbers = []
+    seen_value = False
+    for value in values:
+        if value is None:
+            numbers.append(None)
+            continue
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, string_types):
+            if not _DECIMAL.match(value.strip()):
+                return None
+        elif not isinstance(value, Number):
+            return None
+        numbers.append(float(value))
+        seen_value = True
+    return numbers if seen_value else None
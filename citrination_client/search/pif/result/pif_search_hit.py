@@ -2,6 +2,7 @@ from pypif import pif
 from pypif.obj.common.pio import Pio
 from pypif.util.serializable import Serializable
 from six import string_types
+import json
 
 
 class PifSearchHit(Serializable):
@@ -19,7 +20,8 @@ class PifSearchHit(Serializable):
         :param dataset_version: Integer with the dataset version of the record.
         :param score: Score with the relevancy of the result.
         :param updated_at: String with the last time that the record was updated.
-        :param system: Pif System object that matched.
+        :param system: Pif System object that matched, or its JSON or dictionary form. JSON and dictionaries are only
+            parsed into a System when the system property is first read.
         :param extracted: Dictionary with a map of extracted property names to values.
         :param extracted_path: Dictionary with a map of extracted property names to paths in a PIF.
         """
@@ -34,6 +36,7 @@ class PifSearchHit(Serializable):
         self._updated_at = None
         self.updated_at = updated_at
         self._system = None
+        self._raw_system = None
         self.system = system
         self._extracted = None
         self.extracted = extracted
@@ -102,16 +105,22 @@ class PifSearchHit(Serializable):
 
     @property
     def system(self):
+        if self._system is None and self._raw_system is not None:
+            if isinstance(self._raw_system, string_types):
+                self._system = pif.loads(self._raw_system)
+            else:
+                self._system = pif.loado(self._raw_system)
+            self._raw_system = None
         return self._system
 
     @system.setter
     def system(self, system):
+        self._system = None
+        self._raw_system = None
         if system is None:
-            self._system = None
-        elif isinstance(system, string_types):
-            self._system = pif.loads(system)
-        elif isinstance(system, dict):
-            self._system = pif.loado(system)
+            pass
+        elif isinstance(system, (string_types, dict)):
+            self._raw_system = system
         elif isinstance(system, Pio):
             self._system = system
         else:
@@ -120,6 +129,31 @@ class PifSearchHit(Serializable):
     @system.deleter
     def system(self):
         self._system = None
+        self._raw_system = None
+
+    @property
+    def raw_system(self):
+        """
+        The matched PIF system as a dictionary, without building a pypif
+        System from it. Systems are only parsed when :attr:`system` is
+        first read, so hits whose system is only read through this
+        property are never parsed.
+
+        :rtype: dict
+        """
+        if self._raw_system is None:
+            return self._system.as_dictionary() if self._system is not None else None
+        elif isinstance(self._raw_system, string_types):
+            return json.loads(self._raw_system)
+        else:
+            return self._raw_system
+
+    def as_dictionary(self):
+        dictionary = super(PifSearchHit, self).as_dictionary()
+        dictionary.pop('rawSystem', None)
+        if self._raw_system is not None:
+            dictionary['system'] = self.raw_system
+        return dictionary
 
     @property
     def extracted(self):
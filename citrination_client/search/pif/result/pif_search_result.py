@@ -1,5 +1,6 @@
 from citrination_client.search.core.result.base_search_result import BaseSearchResult
 from citrination_client.search.pif.result.pif_search_hit import PifSearchHit
+from citrination_client.search.pif.result import columnar
 
 
 class PifSearchResult(BaseSearchResult):
@@ -19,3 +20,39 @@ class PifSearchResult(BaseSearchResult):
         super(PifSearchResult, self).__init__(
             took=took, total_num_hits=total_num_hits, max_score=max_score,
             hits=self._get_object(PifSearchHit, hits), **kwargs)
+
+    def extracted_columns(self, keys=None, id_column=None):
+        """
+        Gathers the extracted values of the hits into one list per key.
+        See :func:`citrination_client.search.pif.result.columnar.extracted_columns`.
+
+        :rtype: OrderedDict of str to list
+        """
+        return columnar.extracted_columns(self.hits or [], keys, id_column)
+
+    def to_numpy(self, keys=None, id_column=None):
+        """
+        Converts the extracted values of the hits to one NumPy array per key.
+        See :func:`citrination_client.search.pif.result.columnar.to_numpy`.
+
+        :rtype: OrderedDict of str to numpy.ndarray
+        """
+        return columnar.to_numpy(self.hits or [], keys, id_column)
+
+    def to_dataframe(self, keys=None, id_column=None):
+        """
+        Converts the extracted values of the hits to a pandas DataFrame.
+        See :func:`citrination_client.search.pif.result.columnar.to_dataframe`.
+
+        :rtype: pandas.DataFrame
+        """
+        return columnar.to_dataframe(self.hits or [], keys, id_column)
+
+    def to_arrow(self, keys=None, id_column=None):
+        """
+        Converts the extracted values of the hits to an Arrow table.
+        See :func:`citrination_client.search.pif.result.columnar.to_arrow`.
+
+        :rtype: pyarrow.Table
+        """
+        return columnar.to_arrow(self.hits or [], keys, id_column)
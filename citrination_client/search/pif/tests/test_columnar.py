@@ -0,0 +1,100 @@
+from citrination_client.search import PifSearchHit, PifSearchResult
+from citrination_client.search.pif.result import columnar
+import math
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _hits():
+    return [
+        PifSearchHit(id="a", extracted={"name": "Si", "band_gap": "1.1", "density": 2.33}),
+        PifSearchHit(id="b", extracted={"name": "Ge", "density": 5.32}),
+        PifSearchHit(id="c", extracted={"name": "GaAs", "band_gap": 1.43, "phase": "zincblende"})
+    ]
+
+def test_extracted_columns():
+    """
+    Tests that every key becomes a column, in the order first seen, with
+    None where a hit did not extract the key
+    """
+    columns = columnar.extracted_columns(_hits(), id_column="uid")
+    assert list(columns.keys()) == ["uid", "name", "band_gap", "density", "phase"]
+    assert columns["uid"] == ["a", "b", "c"]
+    assert columns["band_gap"] == ["1.1", None, 1.43]
+    assert columns["phase"] == [None, None, "zincblende"]
+
+def test_extracted_columns_with_keys():
+    """
+    Tests that only the requested keys are included
+    """
+    columns = columnar.extracted_columns(_hits(), keys=["density", "missing"])
+    assert list(columns.keys()) == ["density", "missing"]
+    assert columns["missing"] == [None, None, None]
+
+def test_to_numpy_types_columns():
+    """
+    Tests that numeric columns become float arrays with NaN for missing
+    values, and other columns become object arrays
+    """
+    arrays = columnar.to_numpy(_hits())
+    assert arrays["band_gap"].dtype == np.float64
+    assert arrays["band_gap"][0] == 1.1
+    assert math.isnan(arrays["band_gap"][1])
+    assert arrays["density"][:2].tolist() == [2.33, 5.32]
+    assert arrays["name"].dtype == object
+    assert arrays["name"].tolist() == ["Si", "Ge", "GaAs"]
+
+def test_to_numpy_keeps_numeric_looking_strings():
+    """
+    Tests that zero-padded IDs and strings such as "nan" and "inf" keep
+    their columns as strings, while plain decimals are converted
+    """
+    hits = [
+        PifSearchHit(id="a", extracted={"code": "007", "flag": "nan", "value": "-1.5e3", "limit": "inf"}),
+        PifSearchHit(id="b", extracted={"code": "12", "flag": "1", "value": "0.25", "limit": "3"})
+    ]
+    arrays = columnar.to_numpy(hits)
+    assert arrays["code"].dtype == object
+    assert arrays["code"].tolist() == ["007", "12"]
+    assert arrays["flag"].tolist() == ["nan", "1"]
+    assert arrays["limit"].tolist() == ["inf", "3"]
+    assert arrays["value"].dtype == np.float64
+    assert arrays["value"].tolist() == [-1500.0, 0.25]
+
+def test_to_numpy_keeps_list_values_as_objects():
+    """
+    Tests that a column holding lists is not converted to floats
+    """
+    hits = [PifSearchHit(extracted={"x": [1, 2]}), PifSearchHit(extracted={"x": 3})]
+    arrays = columnar.to_numpy(hits)
+    assert arrays["x"].dtype == object
+    assert arrays["x"][0] == [1, 2]
+
+def test_result_and_streams_convert_alike():
+    """
+    Tests that a result and a generator of hits produce the same columns
+    """
+    result = PifSearchResult(hits=[hit.as_dictionary() for hit in _hits()])
+    from_result = result.to_numpy()
+    from_stream = columnar.to_numpy(hit for hit in _hits())
+    assert list(from_result.keys()) == list(from_stream.keys())
+    assert from_result["name"].tolist() == from_stream["name"].tolist()
+
+def test_to_dataframe():
+    """
+    Tests conversion to a pandas DataFrame
+    """
+    pytest.importorskip("pandas")
+    frame = PifSearchResult(hits=[hit.as_dictionary() for hit in _hits()]).to_dataframe(id_column="uid")
+    assert list(frame.columns) == ["uid", "name", "band_gap", "density", "phase"]
+    assert frame["density"].dtype == np.float64
+
+def test_to_arrow():
+    """
+    Tests conversion to an Arrow table
+    """
+    pa = pytest.importorskip("pyarrow")
+    table = columnar.to_arrow(_hits())
+    assert table.schema.field("band_gap").type == pa.float64()
+    assert table.schema.field("name").type == pa.string()
+    assert table.num_rows == 3
@@ -0,0 +1,68 @@
+from citrination_client.search import PifSearchHit
+from pypif.obj.system import System
+from pypif import pif
+import json
+import pytest
+
+raw_system = {"category": "system.chemical", "uid": "abc", "names": ["Silicon"]}
+
+def test_system_is_parsed_on_first_access(monkeypatch):
+    """
+    Tests that the system of a hit is only parsed when it is read
+    """
+    calls = []
+    loado = pif.loado
+    monkeypatch.setattr(pif, "loado", lambda obj: calls.append(obj) or loado(obj))
+
+    hit = PifSearchHit(id="1", system=raw_system, extracted={"name": "Silicon"})
+    assert hit.extracted["name"] == "Silicon"
+    assert calls == []
+    assert hit.system.uid == "abc"
+    assert hit.system.names == ["Silicon"]
+    assert len(calls) == 1
+
+def test_raw_system_skips_parsing():
+    """
+    Tests that the raw form of a system can be read without parsing it
+    """
+    hit = PifSearchHit(system=raw_system)
+    assert hit.raw_system == raw_system
+    assert hit._system is None
+
+def test_system_from_json_string():
+    """
+    Tests that a system supplied as JSON is parsed lazily as well
+    """
+    hit = PifSearchHit(system=json.dumps(raw_system))
+    assert hit.raw_system == raw_system
+    assert hit.system.uid == "abc"
+
+def test_system_object_is_kept():
+    """
+    Tests that a System object is stored as is and can be read in its
+    raw form
+    """
+    system = System(uid="abc")
+    hit = PifSearchHit(system=system)
+    assert hit.system is system
+    assert hit.raw_system["uid"] == "abc"
+
+def test_invalid_system_type():
+    """
+    Tests that an unsupported system type is rejected immediately
+    """
+    with pytest.raises(TypeError):
+        PifSearchHit(system=42)
+
+def test_as_dictionary_before_and_after_parsing():
+    """
+    Tests that a hit serializes the same way whether or not its system
+    has been parsed
+    """
+    hit = PifSearchHit(id="1", system=raw_system)
+    unparsed = hit.as_dictionary()
+    hit.system
+    parsed = hit.as_dictionary()
+    assert unparsed == parsed
+    assert unparsed["system"]["uid"] == "abc"
+    assert "rawSystem" not in unparsed
@@ -1,7 +1,20 @@
 from pypif.util.case import to_camel_case
 from pypif.util.case import keys_to_snake_case
+from pypif.util.serializable import Serializable
+from six import string_types
 
 import json
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Values which are serialized as they are, checked before anything slower
+_SCALAR_TYPES = tuple(set(string_types) | set([str, int, float, bool, type(None)]))
+
+_SERIALIZABLE_AS_DICTIONARY = getattr(Serializable.as_dictionary, "__func__", Serializable.as_dictionary)
 
 class QueryEncoder(json.JSONEncoder):
     """
@@ -18,11 +31,11 @@ class QueryEncoder(json.JSONEncoder):
         if obj is None:
             return []
         elif isinstance(obj, list):
-            return [i.as_dictionary() for i in obj]
+            return [query_to_dictionary(i) for i in obj]
         elif isinstance(obj, dict):
             return self._keys_to_camel_case(obj)
         else:
-            return obj.as_dictionary()
+            return query_to_dictionary(obj)
 
     def _keys_to_camel_case(self, obj):
         """
@@ -32,3 +45,86 @@ class QueryEncoder(json.JSONEncoder):
         :return: Dictionary with the input values and all keys in camel case
         """
         return dict((to_camel_case(key), value) for (key, value) in obj.items())
+
+def query_to_dictionary(obj):
+    """
+    Converts a query, or any other pypif serializable object, to the
+    dictionary form sent to Citrination. The result is the same as that of
+    ``obj.as_dictionary()``, but the camel case name of each attribute is
+    worked out once per class rather than on every call.
+
+    :param obj: The object to convert
+    :return: The object as dictionaries, lists and scalars
+    """
+    if isinstance(obj, _SCALAR_TYPES):
+        return obj
+    if isinstance(obj, list):
+        return [query_to_dictionary(i) for i in obj]
+    cls = type(obj)
+    keys = _keys_by_class.get(cls)
+    if keys is None:
+        keys = _compile_class(cls)
+    if keys is _CUSTOM:
+        # Classes which customize their dictionary form, and values which
+        # are not serializable, are converted as pypif would convert them
+        return Serializable._convert_to_dictionary(obj)
+    result = {}
+    for name, value in obj.__dict__.items():
+        if value is None:
+            continue
+        key = keys.get(name)
+        if key is None:
+            key = _add_class_key(cls, name)
+        result[key] = value if isinstance(value, _SCALAR_TYPES) else query_to_dictionary(value)
+    return result
+
+def encode_query(obj, sort_keys=False):
+    """
+    Serializes a query, or its dictionary form, as JSON. orjson is used if
+    it is installed, falling back to the standard library for values it
+    cannot serialize.
+
+    :param obj: The query, or the dictionary returned by
+        :func:`query_to_dictionary`
+    :param sort_keys: Whether to sort the keys of each object, so that equal
+        queries are always serialized the same way
+    :type sort_keys: bool
+    :return: The JSON text
+    :rtype: str
+    """
+    if orjson is not None:
+        try:
+            option = orjson.OPT_SORT_KEYS if sort_keys else 0
+            return orjson.dumps(obj, default=query_to_dictionary, option=option).decode("utf-8")
+        except TypeError:
+            # orjson.JSONEncodeError, raised for e.g. non-string keys and
+            # integers beyond 64 bits
+            pass
+    return json.dumps(obj, cls=QueryEncoder, sort_keys=sort_keys)
+
+# The camel case key of each attribute, by class, or _CUSTOM for classes
+# converted by pypif. Classes and attribute names are few, so the cache
+# stays small.
+_keys_by_class = {}
+_keys_lock = threading.Lock()
+_CUSTOM = object()
+
+def _compile_class(cls):
+    as_dictionary = getattr(cls, "as_dictionary", None)
+    # Unwrap Python 2 unbound methods
+    as_dictionary = getattr(as_dictionary, "__func__", as_dictionary)
+    if as_dictionary is _SERIALIZABLE_AS_DICTIONARY:
+        keys = {}
+    else:
+        keys = _CUSTOM
+    with _keys_lock:
+        return _keys_by_class.setdefault(cls, keys)
+
+def _add_class_key(cls, name):
+    key = to_camel_case(name)
+    with _keys_lock:
+        # Copy on write, so that readers never see a dictionary being resized
+        keys = dict(_keys_by_class[cls])
+        keys[name] = key
+        _keys_by_class[cls] = keys
+    return key
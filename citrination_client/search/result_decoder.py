@@ -0,0 +1,83 @@
+from citrination_client.search.pif.result.pif_search_hit import PifSearchHit
+from citrination_client.search.pif.result.pif_search_result import PifSearchResult
+from citrination_client.search.pif.result.pif_multi_search_result import PifMultiSearchResult
+from citrination_client.search.pif.result.pif_multi_search_result_element import PifMultiSearchResultElement
+from citrination_client.search.dataset.result.dataset_search_hit import DatasetSearchHit
+from citrination_client.search.dataset.result.dataset_search_result import DatasetSearchResult
+
+from pypif.util.case import to_snake_case
+
+# The class of the hits of each result class
+_HIT_CLASSES = {
+    PifSearchResult: PifSearchHit,
+    DatasetSearchResult: DatasetSearchHit,
+}
+
+# Snake case forms of the keys seen in responses. Responses use a handful
+# of keys, but the cache is bounded in case a server sends arbitrary ones.
+_MAX_CACHED_KEYS = 1024
+_snake_case_keys = {}
+
+def decode_search_result(result_class, results):
+    """
+    Builds a search result from the "results" object of a search response.
+    Only the keys of the result and of each hit are converted to snake case,
+    each with a cached conversion, and the PIF systems of hits are left as
+    they are until they are read (see :attr:`PifSearchHit.system`).
+
+    :param result_class: :class:`PifSearchResult` or :class:`DatasetSearchResult`
+    :param results: The results object of the response
+    :type results: dict
+    :return: ``result_class`` object with the results
+    """
+    envelope = keys_to_snake_case(results)
+    hits = envelope.get("hits")
+    hit_class = _HIT_CLASSES.get(result_class)
+    if hits and hit_class is not None:
+        envelope["hits"] = [hit_class(**keys_to_snake_case(hit)) if isinstance(hit, dict) else hit for hit in hits]
+    return result_class(**envelope)
+
+def decode_multi_search_result(results):
+    """
+    Builds a multi search result from the "results" object of a PIF multi
+    search response, decoding the result of each query as
+    :func:`decode_search_result` does.
+
+    :param results: The results object of the response
+    :type results: dict
+    :return: :class:`PifMultiSearchResult` object with the results
+    """
+    envelope = keys_to_snake_case(results)
+    elements = envelope.get("results")
+    if elements:
+        envelope["results"] = [_decode_multi_search_element(element) for element in elements]
+    return PifMultiSearchResult(**envelope)
+
+def _decode_multi_search_element(element):
+    if not isinstance(element, dict):
+        return element
+    element = keys_to_snake_case(element)
+    if isinstance(element.get("result"), dict):
+        element["result"] = decode_search_result(PifSearchResult, element["result"])
+    return PifMultiSearchResultElement(**element)
+
+def keys_to_snake_case(camel_case_dict):
+    """
+    Makes a copy of a dictionary with its keys, but not those of nested
+    dictionaries, converted to snake case. Equivalent to
+    :func:`pypif.util.case.keys_to_snake_case`.
+
+    :param camel_case_dict: Dictionary with the keys to convert
+    :type camel_case_dict: dict
+    :return: Dictionary with the keys converted to snake case
+    :rtype: dict
+    """
+    return dict((_to_snake_case(key), value) for (key, value) in camel_case_dict.items())
+
+def _to_snake_case(key):
+    snake_case_key = _snake_case_keys.get(key)
+    if snake_case_key is None:
+        snake_case_key = to_snake_case(key)
+        if len(_snake_case_keys) < _MAX_CACHED_KEYS:
+            _snake_case_keys[key] = snake_case_key
+    return snake_case_key
@@ -0,0 +1,140 @@
+from citrination_client.search import *
+from citrination_client.search import partition
+from citrination_client.search.client import SearchClient
+from citrination_client.search.query_encoder import QueryEncoder
+from citrination_client.base.errors import CitrinationClientError
+from citrination_client.util import config as client_config
+from citrination_client.testing import FakeCitrinationServer, SyntheticCorpus
+from datetime import datetime, timedelta
+import json
+import pytest
+import time
+
+page_limit = 7
+
+# Thirty records in each of three datasets, updated a minute apart
+records = [
+    {
+        "uid": "uid-{}".format(i),
+        "dataset": str(i % 3),
+        "updated_at": partition.format_timestamp(datetime(2017, 1, 1) + timedelta(minutes=i))
+    }
+    for i in range(90)
+]
+
+def _matches(record, data_query):
+    for dataset_query in data_query.get("dataset", []):
+        if "id" in dataset_query and dataset_query["id"]["equal"] != record["dataset"]:
+            return False
+    for system_query in data_query.get("system", []):
+        updated_at = system_query.get("updatedAt")
+        if updated_at and not (updated_at["min"] <= record["updated_at"] <= updated_at["max"]):
+            return False
+    return True
+
+def _hit(record):
+    return {"id": record["uid"], "dataset": record["dataset"]}
+
+@pytest.fixture
+def server(serve_pif_search):
+    return serve_pif_search(records, page_limit, _hit, matches=_matches, took=1)
+
+def _encode(query):
+    return json.loads(json.dumps(query, cls=QueryEncoder))
+
+def test_restrict_query_leaves_original_untouched():
+    """
+    Tests that restricting a query adds the restriction to a copy,
+    alongside the existing criteria
+    """
+    original = PifSystemReturningQuery(
+        query=DataQuery(dataset=DatasetQuery(name=Filter(equal="mine"))))
+    restricted = partition.restrict_query(original, dataset=DatasetQuery(logic="MUST", id=Filter(equal="3")))
+    assert _encode(original)["query"]["dataset"] == {"name": {"equal": "mine"}}
+    assert _encode(restricted)["query"][0]["dataset"] == [
+        {"name": {"equal": "mine"}},
+        {"logic": "MUST", "id": {"equal": "3"}}
+    ]
+
+def test_updated_at_ranges_are_disjoint():
+    """
+    Tests that adjacent update time ranges do not share their boundary
+    """
+    queries = partition.partition_by_updated_at(
+        PifSystemReturningQuery(), ["2017-01-01T00:00:00.000Z", "2017-02-01T00:00:00.000Z", datetime(2017, 3, 1)])
+    filters = [_encode(q)["query"][0]["system"][0]["updatedAt"] for q in queries]
+    assert filters == [
+        {"min": "2017-01-01T00:00:00.000Z", "max": "2017-01-31T23:59:59.999Z"},
+        {"min": "2017-02-01T00:00:00.000Z", "max": "2017-02-28T23:59:59.999Z"}
+    ]
+
+def test_timestamps_round_trip():
+    """
+    Tests that timestamps are parsed and formatted to the millisecond
+    """
+    timestamp = "2017-10-01T12:30:05.250Z"
+    assert partition.format_timestamp(partition.parse_timestamp(timestamp)) == timestamp
+
+def test_scan_by_dataset(search_client, server):
+    """
+    Tests that the hits of every dataset partition are merged into one
+    stream with no duplicates
+    """
+    partitions = partition.partition_by_dataset(PifSystemReturningQuery(), [0, 1, 2])
+    hits = list(search_client.iter_partitioned_pif_search(PifSystemReturningQuery(), partitions=partitions))
+    assert sorted(hit.id for hit in hits) == sorted(r["uid"] for r in records)
+
+def test_automatic_scan_past_query_size(search_client, server, monkeypatch):
+    """
+    Tests that a query matching more records than one query can return
+    is split by update time until every record can be returned
+    """
+    monkeypatch.setattr(client_config, "max_query_size", 20)
+    hits = list(search_client.iter_partitioned_pif_search(
+        PifSystemReturningQuery(), start="2016-12-31T00:00:00.000Z", end="2017-01-02T00:00:00.000Z"))
+    assert sorted(hit.id for hit in hits) == sorted(r["uid"] for r in records)
+
+def test_oversized_partition_is_rejected(search_client, server, monkeypatch):
+    """
+    Tests that a supplied partition too large to return in full raises
+    an error rather than silently dropping records
+    """
+    monkeypatch.setattr(client_config, "max_query_size", 20)
+    partitions = partition.partition_by_dataset(PifSystemReturningQuery(), [0, 1])
+    with pytest.raises(CitrinationClientError):
+        list(search_client.iter_partitioned_pif_search(PifSystemReturningQuery(), partitions=partitions))
+
+def test_closing_scan_early(search_client, server):
+    """
+    Tests that a scan can be abandoned part way through
+    """
+    partitions = partition.partition_by_dataset(PifSystemReturningQuery(), [0, 1, 2])
+    hits = search_client.iter_partitioned_pif_search(PifSystemReturningQuery(), partitions=partitions, max_workers=1)
+    next(hits)
+    hits.close()
+
+def test_closing_scan_early_stops_requests(search_client, server):
+    """
+    Tests that partitions which have not started when a scan is closed are
+    never requested
+    """
+    partitions = partition.partition_by_dataset(PifSystemReturningQuery(), range(50))
+    hits = search_client.iter_partitioned_pif_search(PifSystemReturningQuery(), partitions=partitions, max_workers=2)
+    next(hits)
+    hits.close()
+    calls = server.call_count
+    time.sleep(0.5)
+    # Scans already running may finish their current request
+    assert server.call_count <= calls + 2
+    assert server.call_count < 10
+
+def test_scan_by_dataset_against_fake_server():
+    """
+    Tests that a scan split by dataset runs against the FakeCitrinationServer,
+    so that the partition helpers and the stand-in server stay compatible
+    """
+    with FakeCitrinationServer(corpus=SyntheticCorpus(num_pifs=120, num_properties=1), max_page_size=50) as fake:
+        client = SearchClient("mykey", fake.url)
+        partitions = partition.partition_by_dataset(PifSystemReturningQuery(), [1, 2, 3])
+        hits = list(client.iter_partitioned_pif_search(PifSystemReturningQuery(), partitions=partitions, max_workers=2))
+    assert sorted(hit.system.uid for hit in hits) == sorted("pif-{}".format(i) for i in range(120))
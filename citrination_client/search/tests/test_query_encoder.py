@@ -0,0 +1,81 @@
+from citrination_client.search import *
+from citrination_client.search import query_encoder
+from citrination_client.search.query_encoder import QueryEncoder, encode_query, query_to_dictionary
+import json
+import pytest
+
+def _deep_query():
+    properties = [
+        PropertyQuery(
+            name=FieldQuery(extract_as="name {}".format(i), filter=[Filter(equal="Property {}".format(i))]),
+            value=FieldQuery(filter=[Filter(min=0.0, max=float(i)), Filter(exists=True)]),
+            conditions=ValueQuery(name=FieldQuery(filter=Filter(equal="Temperature"))))
+        for i in range(3)
+    ]
+    return PifSystemReturningQuery(
+        size=100,
+        from_index=10,
+        return_system=False,
+        add_latex=True,
+        query=DataQuery(
+            dataset=DatasetQuery(id=[Filter(equal="1"), Filter(equal="2")]),
+            system=PifSystemQuery(chemical_formula=ChemicalFieldQuery(filter=ChemicalFilter(equal="GaN")),
+                                  properties=properties)))
+
+def test_matches_as_dictionary():
+    """
+    Tests that queries are converted to the same dictionaries as pypif
+    produces, including after a query is modified
+    """
+    query = _deep_query()
+    assert query_to_dictionary(query) == query.as_dictionary()
+
+    query.size = 5
+    query.query.system.names = FieldQuery(filter=Filter(equal="GaN"))
+    assert query_to_dictionary(query) == query.as_dictionary()
+
+    query.query.system.names = None
+    assert "names" not in query_to_dictionary(query)["query"]["system"]
+
+def test_custom_as_dictionary_is_used():
+    """
+    Tests that classes which override as_dictionary, such as search hits,
+    are converted with their own method
+    """
+    hit = PifSearchHit(id="1/1/a", system={"uid": "a"}, extracted={"Property 0": "1"})
+    assert query_to_dictionary([hit]) == [hit.as_dictionary()]
+
+def test_encoders_agree():
+    """
+    Tests that encode_query, with or without orjson, and the QueryEncoder
+    produce the same JSON
+    """
+    query = _deep_query()
+    expected = json.loads(json.dumps(query, cls=QueryEncoder))
+    assert expected == query.as_dictionary()
+    assert json.loads(encode_query(query)) == expected
+    assert json.loads(encode_query(query_to_dictionary(query))) == expected
+
+def test_falls_back_without_orjson(monkeypatch):
+    """
+    Tests that the standard library is used if orjson is not installed
+    """
+    monkeypatch.setattr(query_encoder, "orjson", None)
+    query = _deep_query()
+    assert encode_query(query, sort_keys=True) == json.dumps(query, cls=QueryEncoder, sort_keys=True)
+
+def test_falls_back_for_values_orjson_rejects():
+    """
+    Tests that values orjson cannot serialize are encoded by the standard
+    library instead
+    """
+    assert json.loads(encode_query({"size": 2 ** 70})) == {"size": 2 ** 70}
+
+def test_sort_keys():
+    """
+    Tests that equal queries built in a different order are encoded the
+    same way when keys are sorted
+    """
+    first = {"size": 1, "query": {"system": 1, "dataset": 2}}
+    second = {"query": {"dataset": 2, "system": 1}, "size": 1}
+    assert encode_query(first, sort_keys=True) == encode_query(second, sort_keys=True)
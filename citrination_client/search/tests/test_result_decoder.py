@@ -0,0 +1,46 @@
+from citrination_client.search import *
+from citrination_client.search.result_decoder import decode_search_result, decode_multi_search_result
+from citrination_client.testing import SyntheticCorpus
+from pypif.util.case import keys_to_snake_case
+
+corpus = SyntheticCorpus(num_pifs=10, num_properties=2)
+
+def _results():
+    return {"took": 3, "totalNumHits": 10, "maxScore": 1.0, "hits": [corpus.hit(i) for i in range(10)]}
+
+def test_pif_results_match_pypif_decoding():
+    """
+    Tests that PIF search results are decoded as they are by pypif, with
+    their systems and extracted values left as they were sent
+    """
+    expected = PifSearchResult(**keys_to_snake_case(_results()))
+    result = decode_search_result(PifSearchResult, _results())
+    assert result.as_dictionary() == expected.as_dictionary()
+    assert result.total_num_hits == 10
+    hit = result.hits[3]
+    assert hit.dataset_version == 1
+    assert hit.updated_at == "2020-01-01T00:00:00.000Z"
+    assert hit.extracted == {"Property 0": "3"}
+    assert hit.raw_system["chemicalFormula"] == "Co4Si"
+    assert hit.system.chemical_formula == "Co4Si"
+
+def test_dataset_results():
+    """
+    Tests that dataset search hits are decoded into DatasetSearchHits
+    """
+    results = {"took": 1, "totalNumHits": 1, "hits": [{"id": "5", "isFeatured": True, "numPifs": 7}]}
+    result = decode_search_result(DatasetSearchResult, results)
+    assert isinstance(result.hits[0], DatasetSearchHit)
+    assert result.hits[0].is_featured is True
+    assert result.hits[0].num_pifs == 7
+
+def test_multi_search_results():
+    """
+    Tests that the result of each query of a multi search is decoded
+    """
+    results = {"took": 5, "results": [{"status": "SUCCESS", "result": _results()}, {"status": "ERROR"}]}
+    result = decode_multi_search_result(results)
+    assert result.took == 5
+    assert result.results[0].status == "SUCCESS"
+    assert [hit.system.uid for hit in result.results[0].result.hits] == [corpus.uid(i) for i in range(10)]
+    assert result.results[1].result is None
@@ -0,0 +1,176 @@
+from citrination_client.search import *
+from citrination_client.base.errors import CitrinationClientError
+from citrination_client.util.cache import ResponseCache
+import requests_mock
+import pytest
+
+site = "mock://citrination"
+page_limit = 25
+corpus = ["uid-{}".format(i) for i in range(230)]
+
+def _hit(uid):
+    return {"id": uid, "extracted": {"index": corpus.index(uid)}}
+
+@pytest.fixture
+def server(serve_pif_search):
+    return serve_pif_search(corpus, page_limit, _hit)
+
+def test_sequential_pagination(search_client, server):
+    """
+    Tests that pages are requested until the size of the query is reached
+    """
+    result = search_client.pif_search(PifSystemReturningQuery(size=100, from_index=10))
+    assert [hit.id for hit in result.hits] == corpus[10:110]
+    assert result.took == 3 * 4
+
+def test_parallel_pagination_keeps_hits_in_order(search_client, server):
+    """
+    Tests that pages fetched concurrently are reassembled in order, with
+    the server time summed over every page
+    """
+    result = search_client.pif_search(PifSystemReturningQuery(size=160, from_index=5), max_workers=4)
+    assert [hit.id for hit in result.hits] == corpus[5:165]
+    assert result.total_num_hits == len(corpus)
+    assert result.took == 3 * 7
+    assert server.call_count == 7
+
+def test_parallel_pagination_stops_at_end_of_results(search_client, server):
+    """
+    Tests that no pages past the end of the result set are requested
+    """
+    result = search_client.pif_search(PifSystemReturningQuery(size=500, from_index=200), max_workers=4)
+    assert [hit.id for hit in result.hits] == corpus[200:]
+    assert server.call_count == 2
+
+def test_parallel_pagination_of_single_page(search_client, server):
+    """
+    Tests that a query answered by its first page makes one request
+    """
+    result = search_client.pif_search(PifSystemReturningQuery(size=10), max_workers=4)
+    assert len(result.hits) == 10
+    assert server.call_count == 1
+
+def test_worker_count_must_be_positive(search_client, server):
+    """
+    Tests that a search cannot be run without any workers
+    """
+    with pytest.raises(CitrinationClientError):
+        search_client.pif_search(PifSystemReturningQuery(size=10), max_workers=0)
+
+def test_iter_pif_search_yields_hits_in_order(search_client, server):
+    """
+    Tests that streaming a search generates the same hits as running
+    it in one go
+    """
+    hits = search_client.iter_pif_search(PifSystemReturningQuery(size=110, from_index=3))
+    assert [hit.id for hit in hits] == corpus[3:113]
+
+def test_iter_pif_search_is_lazy(search_client, server):
+    """
+    Tests that the first hit is available after one request, with at
+    most the next page prefetched
+    """
+    hits = search_client.iter_pif_search(PifSystemReturningQuery())
+    assert server.call_count == 0
+    assert next(hits).id == corpus[0]
+    assert server.call_count <= 2
+    hits.close()
+
+def test_iter_pif_search_without_prefetch(search_client, server):
+    """
+    Tests that, without prefetching, a page is only requested once the
+    previous one has been consumed
+    """
+    hits = search_client.iter_pif_search(PifSystemReturningQuery(), prefetch=False)
+    for _ in range(page_limit):
+        next(hits)
+    assert server.call_count == 1
+    next(hits)
+    assert server.call_count == 2
+    assert len(list(hits)) == len(corpus) - page_limit - 1
+
+def test_iter_search_validates_eagerly(search_client):
+    """
+    Tests that an invalid query is rejected when the generator is
+    created rather than when it is first advanced
+    """
+    with pytest.raises(CitrinationClientError):
+        search_client.iter_pif_search(PifSystemReturningQuery(from_index=-1))
+
+def test_iter_dataset_search(search_client):
+    """
+    Tests that dataset hits can be streamed
+    """
+    with requests_mock.Mocker() as m:
+        m.post(site + "/api/search/dataset", json={
+            "results": {"took": 1, "totalNumHits": 2, "hits": [{"id": "1"}, {"id": "2"}]}})
+        hits = list(search_client.iter_dataset_search(DatasetReturningQuery(size=2)))
+    assert [hit.id for hit in hits] == ["1", "2"]
+    assert isinstance(hits[0], DatasetSearchHit)
+
+def test_pages_share_one_encoding_of_the_query(search_client, server):
+    """
+    Tests that each page request carries the full query with only the
+    pagination fields changed, and that the caller's query is untouched
+    """
+    query = PifSystemReturningQuery(
+        size=60,
+        return_system=False,
+        query=DataQuery(system=PifSystemQuery(names=FieldQuery(extract_as="name", filter=Filter(exists=True)))))
+    search_client.pif_search(query)
+
+    bodies = [request.json() for request in server.request_history]
+    assert [body["from"] for body in bodies] == [0, 25, 50]
+    for body in bodies:
+        assert body["query"] == bodies[0]["query"]
+        assert body["query"]["system"]["names"]["extractAs"] == "name"
+        assert body["returnSystem"] is False
+    assert query.from_index is None
+
+def test_cached_pages_skip_the_server(server):
+    """
+    Tests that repeating a search with a cache answers it without
+    contacting Citrination
+    """
+    cache = ResponseCache()
+    client = SearchClient("mykey", site, cache=cache)
+    first = client.pif_search(PifSystemReturningQuery(size=50))
+    calls = server.call_count
+    second = client.pif_search(PifSystemReturningQuery(size=50))
+    assert server.call_count == calls
+    assert [hit.id for hit in second.hits] == [hit.id for hit in first.hits]
+    assert cache.stats.hits == calls
+    assert cache.stats.misses == calls
+
+def test_shared_cache_is_scoped_by_key_and_site(server, serve_pif_search):
+    """
+    Tests that clients with different API keys or sites which share a
+    cache do not receive each other's cached results
+    """
+    other_site = "mock://other-citrination"
+    serve_pif_search(corpus, page_limit, _hit, site=other_site)
+    cache = ResponseCache()
+    clients = [
+        SearchClient("mykey", site, cache=cache),
+        SearchClient("otherkey", site, cache=cache),
+        SearchClient("mykey", other_site, cache=cache)
+    ]
+    for client in clients:
+        client.pif_search(PifSystemReturningQuery(size=10))
+    assert server.call_count == 3
+    assert cache.stats.misses == 3
+    assert cache.stats.hits == 0
+
+    clients[1].pif_search(PifSystemReturningQuery(size=10))
+    assert server.call_count == 3
+    assert cache.stats.hits == 1
+
+def test_different_queries_are_cached_separately(server):
+    """
+    Tests that a cached page is only used for an identical query
+    """
+    client = SearchClient("mykey", site, cache=ResponseCache())
+    client.pif_search(PifSystemReturningQuery(size=10))
+    result = client.pif_search(PifSystemReturningQuery(size=10, from_index=10))
+    assert result.hits[0].id == corpus[10]
+    assert server.call_count == 2
@@ -0,0 +1,2 @@
+from citrination_client.testing.corpus import SyntheticCorpus
+from citrination_client.testing.server import FakeCitrinationServer
@@ -0,0 +1,111 @@
+import json
+
+class SyntheticCorpus(object):
+    """
+    A deterministic corpus of synthetic PIFs belonging to one dataset
+    version, served by a :class:`FakeCitrinationServer`. The PIF with index
+    ``i`` has the UID ``pif-i``, a chemical formula and ``num_properties``
+    scalar properties named ``Property 0``, ``Property 1``, etc.
+
+    PIFs are generated and serialized when first requested, so large
+    corpora cost little until they are searched.
+    """
+
+    def __init__(self, num_pifs=1000, num_properties=5, dataset_id=1, dataset_version=1):
+        """
+        Constructor.
+
+        :param num_pifs: The number of PIFs in the corpus
+        :type num_pifs: int
+        :param num_properties: The number of properties of each PIF
+        :type num_properties: int
+        :param dataset_id: The ID of the dataset the PIFs belong to
+        :type dataset_id: int
+        :param dataset_version: The version of the dataset the PIFs belong to
+        :type dataset_version: int
+        """
+        self._num_pifs = num_pifs
+        self._num_properties = num_properties
+        self._dataset_id = dataset_id
+        self._dataset_version = dataset_version
+        self._hits = {}
+
+    @property
+    def num_pifs(self):
+        return self._num_pifs
+
+    @property
+    def num_properties(self):
+        return self._num_properties
+
+    @property
+    def dataset_id(self):
+        return self._dataset_id
+
+    @property
+    def dataset_version(self):
+        return self._dataset_version
+
+    def uid(self, index):
+        return "pif-{}".format(index)
+
+    def index_of(self, uid):
+        """
+        :return: The index of the PIF with a UID, or None if it is not in the
+            corpus
+        :rtype: int
+        """
+        if not uid.startswith("pif-"):
+            return None
+        try:
+            index = int(uid[len("pif-"):])
+        except ValueError:
+            return None
+        return index if 0 <= index < self._num_pifs else None
+
+    def system(self, index):
+        """
+        :return: The JSON form of a PIF system
+        :rtype: dict
+        """
+        return {
+            "category": "system.chemical",
+            "uid": self.uid(index),
+            "chemicalFormula": "Co{}Si".format(index % 7 + 1),
+            "names": ["Synthetic compound {}".format(index)],
+            "properties": [
+                {
+                    "name": "Property {}".format(p),
+                    "scalars": [{"value": (index * 31 + p * 17) % 1000 / 10.0}],
+                    "units": "eV",
+                    "conditions": [{"name": "Temperature", "scalars": [{"value": 300}], "units": "K"}]
+                }
+                for p in range(self._num_properties)
+            ]
+        }
+
+    def hit(self, index):
+        """
+        :return: The JSON form of a PIF search hit for a PIF
+        :rtype: dict
+        """
+        return {
+            "id": "{}/{}/{}".format(self._dataset_id, self._dataset_version, self.uid(index)),
+            "dataset": self._dataset_id,
+            "datasetVersion": self._dataset_version,
+            "score": 1.0,
+            "updatedAt": "2020-01-01T00:00:00.000Z",
+            "system": self.system(index),
+            "extracted": {"Property 0": str(index)}
+        }
+
+    def hit_json(self, index):
+        """
+        :return: A PIF search hit serialized as JSON, cached after the first call
+        :rtype: bytes
+        """
+        hit = self._hits.get(index)
+        if hit is None:
+            hit = json.dumps(self.hit(index)).encode("utf-8")
+            self._hits[index] = hit
+        return hit
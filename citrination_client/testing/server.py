@@ -0,0 +1,609 @@
+from citrination_client.testing.corpus import SyntheticCorpus
+
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import quote, unquote
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+class FakeCitrinationServer(object):
+    """
+    A local stand-in for the Citrination API, for exercising the client and
+    the pipelines built on it without touching a real deployment.
+
+    The server runs on a background thread and implements the search, data
+    and models routes used by the clients: PIF, multi PIF and dataset
+    searches over a :class:`SyntheticCorpus`, PIF retrieval, dataset
+    creation and versioning, file upload, listing and download (with ranges
+    and checksums), predictions, data view status and experimental design
+    runs. State is kept in memory and lost when the server stops.
+
+    Latency can be added to each API request, and a share of API requests
+    can be answered with 429 (rate limited) or 524 (timed out) responses to
+    exercise the client's concurrency and retry handling. Searches only
+    apply dataset ID and PIF UID equality filters; other filters are
+    ignored and every PIF in the corpus matches.
+
+    Use as a context manager, or call :func:`start` and :func:`stop`::
+
+        with FakeCitrinationServer(corpus=SyntheticCorpus(num_pifs=5000)) as server:
+            client = CitrinationClient("any-key", server.url)
+    """
+
+    def __init__(self, corpus=None, latency=0.0, rate_limit_rate=0.0, timeout_rate=0.0, retry_after=None,
+                 max_page_size=None, seed=None, host="127.0.0.1", port=0):
+        """
+        Constructor.
+
+        :param corpus: The PIFs to serve. Defaults to 1000 synthetic PIFs in
+            dataset 1.
+        :type corpus: :class:`SyntheticCorpus`
+        :param latency: Seconds to wait before answering each API request, or
+            a (minimum, maximum) tuple to wait a random time in that range
+        :type latency: float or tuple
+        :param rate_limit_rate: The share of API requests answered with 429
+        :type rate_limit_rate: float
+        :param timeout_rate: The share of API requests answered with 524
+        :type timeout_rate: float
+        :param retry_after: Seconds sent in the Retry-After header of 429
+            responses, or None to send no header
+        :type retry_after: int
+        :param max_page_size: The most hits returned by one search request,
+            or None to return as many as are asked for
+        :type max_page_size: int
+        :param seed: Seeds the random latencies and faults, to make them
+            repeatable
+        :type seed: int
+        :param host: The address to listen on
+        :type host: str
+        :param port: The port to listen on. By default a free port is chosen.
+        :type port: int
+        """
+        self._corpus = corpus or SyntheticCorpus()
+        self._latency = latency
+        self._rate_limit_rate = rate_limit_rate
+        self._timeout_rate = timeout_rate
+        self._retry_after = retry_after
+        self._max_page_size = max_page_size
+        self._random = random.Random(seed)
+        self._address = (host, port)
+        self._lock = threading.Lock()
+        self._injected = []
+        self._request_counts = {}
+        self._pending_uploads = {}
+        self._design_runs = {}
+        self._datasets = {}
+        self._next_dataset_id = self._corpus.dataset_id + 1
+        self._add_dataset(self._corpus.dataset_id, "Synthetic corpus", num_versions=self._corpus.dataset_version)
+        self._server = None
+        self._thread = None
+
+    @property
+    def corpus(self):
+        return self._corpus
+
+    @property
+    def url(self):
+        """
+        The URL to pass to a client as its site, e.g. http://127.0.0.1:53124
+        """
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        """
+        Starts serving on a background thread.
+
+        :return: The server
+        :rtype: :class:`FakeCitrinationServer`
+        """
+        fake = self
+
+        class Handler(_Handler):
+            server_fake = fake
+
+        self._server = _ThreadingHTTPServer(self._address, Handler)
+        # A short poll interval lets stop return promptly
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,))
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving and closes the listening socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def inject(self, status_code, count=1, retry_after=None):
+        """
+        Answers the next API requests with an error status, regardless of
+        the random fault rates.
+
+        :param status_code: The status to answer with, e.g. 429, 500 or 524
+        :type status_code: int
+        :param count: The number of requests to answer with it
+        :type count: int
+        :param retry_after: Seconds sent in a Retry-After header, or None
+        :type retry_after: int
+        """
+        with self._lock:
+            self._injected.extend([(status_code, retry_after)] * count)
+
+    def request_count(self, method=None, route=None):
+        """
+        Counts the API requests received, including those answered with an
+        injected fault.
+
+        :param method: Only count requests with this method, e.g. "POST"
+        :type method: str
+        :param route: Only count requests to this route template, e.g.
+            "search/pif_search" or "data_views/{id}/predict"
+        :type route: str
+        :rtype: int
+        """
+        with self._lock:
+            return sum(count for (m, r), count in self._request_counts.items()
+                       if (method is None or m == method) and (route is None or r == route))
+
+    def reset_request_counts(self):
+        with self._lock:
+            self._request_counts = {}
+
+    def add_file(self, dataset_id, path, contents):
+        """
+        Adds a file to the latest version of a dataset, as if it had been
+        uploaded.
+
+        :param dataset_id: The ID of the dataset, which must exist
+        :type dataset_id: int
+        :param path: The path of the file in the dataset
+        :type path: str
+        :param contents: The contents of the file
+        :type contents: bytes
+        """
+        with self._lock:
+            self._datasets[int(dataset_id)]["versions"][-1][path] = contents
+
+    # ==== Request handling ====
+
+    def _add_dataset(self, dataset_id, name, description=None, public=None, num_versions=1):
+        self._datasets[dataset_id] = {
+            "id": dataset_id,
+            "name": name,
+            "description": description,
+            "public": public,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "versions": [{} for _ in range(num_versions)]
+        }
+        return self._datasets[dataset_id]
+
+    def _record(self, method, route):
+        template = "/".join("{id}" if _ID_SEGMENT.match(s) else s for s in route.split("/"))
+        with self._lock:
+            key = (method, template)
+            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+
+    def _latency_seconds(self):
+        if isinstance(self._latency, (tuple, list)):
+            with self._lock:
+                return self._random.uniform(*self._latency)
+        return self._latency
+
+    def _fault(self):
+        """
+        :return: The status and Retry-After value to answer with instead of
+            handling the request, or None
+        """
+        with self._lock:
+            if self._injected:
+                return self._injected.pop(0)
+            draw = self._random.random()
+        if draw < self._rate_limit_rate:
+            return 429, self._retry_after
+        if draw < self._rate_limit_rate + self._timeout_rate:
+            return 524, None
+        return None
+
+    def _dataset(self, dataset_id):
+        dataset = self._datasets.get(int(dataset_id))
+        if dataset is None:
+            raise _NotFound()
+        return dataset
+
+    def _search_page(self, handler, query):
+        from_index = query.get("from") or 0
+        size = query.get("size")
+        if size is None:
+            size = 10
+        if self._max_page_size is not None:
+            size = min(size, self._max_page_size)
+        indices = _matching_indices(self._corpus, query)
+        page = indices[from_index:from_index + size]
+        # The injected latency stands in for the time spent searching
+        took = int(handler.latency * 1000)
+        return (b'{"took": ' + str(took).encode("utf-8") +
+                b', "totalNumHits": ' + str(len(indices)).encode("utf-8") +
+                b', "hits": [' + b",".join(self._corpus.hit_json(i) for i in page) + b']}')
+
+    def _pif_search(self, handler, body):
+        return 200, b'{"results": ' + self._search_page(handler, json.loads(body.decode("utf-8"))) + b'}'
+
+    def _multi_pif_search(self, handler, body):
+        queries = json.loads(body.decode("utf-8")).get("queries") or []
+        results = [b'{"status": "SUCCESS", "result": ' + self._search_page(handler, q) + b'}' for q in queries]
+        return 200, b'{"results": {"took": 0, "results": [' + b",".join(results) + b']}}'
+
+    def _dataset_search(self, handler, body):
+        query = json.loads(body.decode("utf-8"))
+        with self._lock:
+            datasets = sorted(self._datasets.values(), key=lambda d: d["id"])
+        from_index = query.get("from") or 0
+        size = query.get("size") or 10
+        hits = [{"id": str(d["id"]), "name": d["name"], "description": d["description"], "score": 1.0}
+                for d in datasets[from_index:from_index + size]]
+        return _json(200, {"results": {"took": 0, "totalNumHits": len(datasets), "hits": hits}})
+
+    def _get_pif(self, handler, body, dataset_id, uid, version=None):
+        index = self._corpus.index_of(uid)
+        if (int(dataset_id) != self._corpus.dataset_id or index is None or
+                (version is not None and int(version) != self._corpus.dataset_version)):
+            raise _NotFound()
+        return _json(200, self._corpus.system(index))
+
+    def _get_versioned_pif(self, handler, body, dataset_id, version, uid):
+        return self._get_pif(handler, body, dataset_id, uid, version)
+
+    def _create_dataset(self, handler, body):
+        data = json.loads(body.decode("utf-8"))["dataset"]
+        with self._lock:
+            dataset_id = self._next_dataset_id
+            self._next_dataset_id += 1
+            dataset = self._add_dataset(dataset_id, data.get("name"), data.get("description"), data.get("public"))
+        return _json(200, _dataset_dict(dataset))
+
+    def _update_dataset(self, handler, body, dataset_id):
+        data = json.loads(body.decode("utf-8"))["dataset"]
+        with self._lock:
+            dataset = self._dataset(dataset_id)
+            for key in ("name", "description", "public"):
+                if data.get(key) is not None:
+                    dataset[key] = data[key]
+        return _json(200, _dataset_dict(dataset))
+
+    def _create_dataset_version(self, handler, body, dataset_id):
+        with self._lock:
+            versions = self._dataset(dataset_id)["versions"]
+            versions.append({})
+            number = len(versions)
+        return _json(200, {"dataset_scoped_id": number})
+
+    def _upload(self, handler, body, dataset_id):
+        data = json.loads(body.decode("utf-8"))
+        file_id = str(uuid.uuid4())
+        with self._lock:
+            self._dataset(dataset_id)
+            self._pending_uploads[file_id] = {"dataset_id": int(dataset_id), "path": data["dest_path"], "contents": None}
+        host, port = handler.server.server_address[:2]
+        return _json(200, {
+            "url": {"scheme": "http", "host": "{}:{}".format(host, port),
+                    "path": "/s3/{}".format(file_id), "query": "signature=fake"},
+            "required_headers": {},
+            "bucket": "fake",
+            "file_id": file_id
+        })
+
+    def _put_object(self, handler, body, file_id):
+        with self._lock:
+            upload = self._pending_uploads.get(file_id)
+            if upload is None:
+                raise _NotFound()
+            upload["contents"] = body
+        return 200, b""
+
+    def _update_file(self, handler, body, file_id):
+        with self._lock:
+            upload = self._pending_uploads.pop(file_id, None)
+            if upload is None or upload["contents"] is None:
+                raise _NotFound()
+            self._dataset(upload["dataset_id"])["versions"][-1][upload["path"]] = upload["contents"]
+        return _json(200, {})
+
+    def _list_files(self, handler, body, dataset_id):
+        request = json.loads(body.decode("utf-8"))["list"]
+        with self._lock:
+            paths = sorted(self._dataset(dataset_id)["versions"][-1])
+        return _json(200, {"files": _match_paths(paths, request.get("glob", "."), request.get("isDir", False))})
+
+    def _download_files(self, handler, body, dataset_id):
+        request = json.loads(body.decode("utf-8"))["download_request"]
+        with self._lock:
+            versions = list(enumerate(self._dataset(dataset_id)["versions"], 1))
+            versions = [(number, sorted(files)) for number, files in versions]
+        if request.get("latest", True):
+            versions = versions[-1:]
+        result = []
+        for number, paths in reversed(versions):
+            matched = _match_paths(paths, request.get("glob", "."), request.get("isDir", False))
+            result.append({"number": number, "files": [
+                {"filename": path, "url": "{}/files/{}/{}/{}".format(self.url, dataset_id, number, quote(path))}
+                for path in matched]})
+        return _json(200, {"versions": result})
+
+    def _get_file(self, handler, body, dataset_id, version, path):
+        with self._lock:
+            versions = self._dataset(dataset_id)["versions"]
+            if not 1 <= int(version) <= len(versions):
+                raise _NotFound()
+            contents = versions[int(version) - 1].get(unquote(path))
+        if contents is None:
+            raise _NotFound()
+        headers = {"ETag": '"{}"'.format(hashlib.md5(contents).hexdigest())}
+        match = re.match(r"^bytes=(\d+)-$", handler.headers.get("Range") or "")
+        if match:
+            start = int(match.group(1))
+            if start >= len(contents):
+                return 416, b"", headers
+            headers["Content-Range"] = "bytes {}-{}/{}".format(start, len(contents) - 1, len(contents))
+            return 206, contents[start:], headers
+        return 200, contents, headers
+
+    def _predict(self, handler, body, view_id):
+        candidates = json.loads(body.decode("utf-8"))["predictionRequest"]["candidates"]
+        return _json(200, {"candidates": [{"Property y": [_predicted_value(c), 0.1]} for c in candidates]})
+
+    def _data_analysis(self, handler, body, view_id):
+        indices = range(min(100, self._corpus.num_pifs))
+        projection = {
+            "x": [float(i % 10) for i in indices],
+            "y": [float(i // 10) for i in indices],
+            "label": [str(i) for i in indices],
+            "inputs": [{"Property 0": str(i)} for i in indices],
+            "uid": [self._corpus.uid(i) for i in indices]
+        }
+        return _json(200, {"projections": {"Property y": projection}})
+
+    def _data_view(self, handler, body, view_id):
+        columns = [{"type": "Real", "name": "Property {}".format(p), "role": "Input", "group_by_key": False,
+                    "units": "eV", "options": {"lower_bound": 0.0, "upper_bound": 100.0}}
+                   for p in range(self._corpus.num_properties)]
+        columns.append({"type": "Real", "name": "Property y", "role": "Output", "group_by_key": False,
+                        "units": None, "options": {"lower_bound": 0.0, "upper_bound": 1000.0}})
+        return _json(200, {"data": {"data_view": {
+            "name": "Synthetic data view {}".format(view_id),
+            "description": "Served by a FakeCitrinationServer",
+            "datasets": [{"id": self._corpus.dataset_id, "name": "Synthetic corpus", "description": None}],
+            "columns": columns
+        }}})
+
+    def _data_view_status(self, handler, body, view_id):
+        status = {"ready": True, "reason": "Ready", "context": "success"}
+        return _json(200, {"data": {"status": {
+            "predict": status, "experimental_design": status, "data_reports": status, "model_reports": status}}})
+
+    def _submit_design_run(self, handler, body, view_id):
+        run_uuid = str(uuid.uuid4())
+        with self._lock:
+            self._design_runs[run_uuid] = {"view_id": view_id, "status": "Finished"}
+        return _json(200, {"data": {"design_run": {"uid": run_uuid}}})
+
+    def _design_run(self, view_id, run_uuid):
+        run = self._design_runs.get(run_uuid)
+        if run is None or run["view_id"] != view_id:
+            raise _NotFound()
+        return run
+
+    def _design_run_status(self, handler, body, view_id, run_uuid):
+        with self._lock:
+            status = self._design_run(view_id, run_uuid)["status"]
+        return _json(200, {"data": {"status": status, "progress": 100, "result": None, "messages": []}})
+
+    def _design_run_results(self, handler, body, view_id, run_uuid):
+        with self._lock:
+            self._design_run(view_id, run_uuid)
+        materials = [{"descriptor_values": {"Property 0": str(i), "Property y": str(10.0 - i)}} for i in range(5)]
+        return _json(200, {"data": {"best_material_results": materials, "next_experiment_results": materials}})
+
+    def _kill_design_run(self, handler, body, view_id, run_uuid):
+        with self._lock:
+            self._design_run(view_id, run_uuid)["status"] = "Killed"
+        return _json(200, {"data": {"uid": run_uuid}})
+
+# Each API route, as a method, a pattern matched against the path after
+# /api/, and the name of the method of FakeCitrinationServer handling it
+_API_ROUTES = [(method, re.compile("^" + pattern + "$"), name) for method, pattern, name in [
+    ("POST", r"search/pif_search", "_pif_search"),
+    ("POST", r"search/pif/multi_pif_search", "_multi_pif_search"),
+    ("POST", r"search/dataset", "_dataset_search"),
+    ("GET", r"datasets/([^/]+)/pif/([^/]+)", "_get_pif"),
+    ("GET", r"datasets/([^/]+)/version/([^/]+)/pif/([^/]+)", "_get_versioned_pif"),
+    ("POST", r"data_sets/create_dataset", "_create_dataset"),
+    ("POST", r"data_sets/([^/]+)/update", "_update_dataset"),
+    ("POST", r"data_sets/([^/]+)/create_dataset_version", "_create_dataset_version"),
+    ("POST", r"data_sets/([^/]+)/upload", "_upload"),
+    ("POST", r"data_sets/update_file/([^/]+)", "_update_file"),
+    ("POST", r"datasets/([^/]+)/list_filepaths", "_list_files"),
+    ("POST", r"datasets/([^/]+)/download_files", "_download_files"),
+    ("POST", r"data_views/([^/]+)/predict", "_predict"),
+    ("GET", r"data_views/([^/]+)/data_analysis", "_data_analysis"),
+    ("GET", r"data_views/([^/]+)/status", "_data_view_status"),
+    ("POST", r"data_views/([^/]+)/experimental_design", "_submit_design_run"),
+    ("GET", r"data_views/([^/]+)/experimental_design/([^/]+)/status", "_design_run_status"),
+    ("GET", r"data_views/([^/]+)/experimental_design/([^/]+)/results", "_design_run_results"),
+    ("DELETE", r"data_views/([^/]+)/experimental_design/([^/]+)", "_kill_design_run"),
+    ("GET", r"data_views/([^/]+)", "_data_view"),
+]]
+
+# Routes which stand in for storage rather than the API, so are never
+# delayed or faulted
+_STORAGE_ROUTES = [(method, re.compile("^" + pattern + "$"), name) for method, pattern, name in [
+    ("PUT", r"/s3/([^/]+)", "_put_object"),
+    ("GET", r"/files/([^/]+)/([^/]+)/(.+)", "_get_file"),
+]]
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$")
+
+class _NotFound(Exception):
+    pass
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, so without this each
+    # response would wait on a delayed ACK from the client
+    disable_nagle_algorithm = True
+    server_fake = None
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = self.path.split("?")[0]
+        fake = self.server_fake
+
+        if path.startswith("/api/"):
+            route = path[len("/api/"):]
+            fake._record(method, route)
+            self.latency = fake._latency_seconds()
+            if self.latency:
+                time.sleep(self.latency)
+            fault = fake._fault()
+            if fault is not None:
+                status_code, retry_after = fault
+                headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+                return self._respond(status_code, b'{"error": "Injected fault"}', headers)
+            routes = _API_ROUTES
+        else:
+            route = path
+            routes = _STORAGE_ROUTES
+
+        for route_method, pattern, name in routes:
+            match = pattern.match(route)
+            if route_method == method and match:
+                try:
+                    response = getattr(fake, name)(self, body, *match.groups())
+                except _NotFound:
+                    response = _json(404, {"error": "Not found"})
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    response = _json(400, {"error": "Bad request: {}".format(e)})
+                return self._respond(*response)
+        self._respond(404, b'{"error": "Not found"}')
+
+    def _respond(self, status_code, body, headers=None):
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def _json(status_code, value):
+    return status_code, json.dumps(value).encode("utf-8")
+
+def _dataset_dict(dataset):
+    return {key: dataset[key] for key in ("id", "name", "description", "public", "created_at")}
+
+def _match_paths(paths, glob, is_dir):
+    if is_dir:
+        return [p for p in paths if p.startswith(glob)]
+    pattern = re.compile(glob)
+    return [p for p in paths if pattern.search(p)]
+
+def _predicted_value(candidate):
+    """
+    A deterministic prediction: the sum of the numeric inputs of a candidate.
+    """
+    total = 0.0
+    for value in candidate.values():
+        try:
+            total += float(value)
+        except (TypeError, ValueError):
+            pass
+    return total
+
+def _equal_values(node):
+    """
+    Collects the values of the equality filters in an encoded field query,
+    filter or list of either.
+    """
+    if node is None:
+        return []
+    if isinstance(node, list):
+        return [value for n in node for value in _equal_values(n)]
+    if not isinstance(node, dict):
+        raise ValueError("Expected a field query or filter, got {!r}".format(node))
+    if "filter" in node:
+        return _equal_values(node["filter"])
+    return [node["equal"]] if "equal" in node else []
+
+def _matching_indices(corpus, query):
+    """
+    :return: The indices of the PIFs in the corpus matched by the dataset ID
+        and PIF UID filters of an encoded query
+    :rtype: list of int
+    """
+    data_queries = query.get("query")
+    dataset_ids = []
+    uids = []
+    for data_query in _as_list(data_queries, "data query"):
+        for dataset_query in _as_list(data_query.get("dataset"), "dataset query"):
+            dataset_ids.extend(_equal_values(dataset_query.get("id")))
+        for system_query in _as_list(data_query.get("system"), "system query"):
+            uids.extend(_equal_values(system_query.get("uid")))
+
+    if dataset_ids and str(corpus.dataset_id) not in [str(i) for i in dataset_ids]:
+        return []
+    if not uids:
+        return range(corpus.num_pifs)
+    indices = []
+    for uid in uids:
+        index = corpus.index_of(uid)
+        if index is not None and index not in indices:
+            indices.append(index)
+    return indices
+
+def _as_list(node, description):
+    """
+    Queries may hold a single sub-query or a list of them, as built by
+    e.g. :func:`partition.restrict_query`.
+
+    :return: The sub-queries, each a dictionary
+    :rtype: list of dict
+    """
+    if node is None:
+        return []
+    nodes = node if isinstance(node, list) else [node]
+    for n in nodes:
+        if not isinstance(n, dict):
+            raise ValueError("Expected a {}, got {!r}".format(description, n))
+    return nodes
@@ -0,0 +1,161 @@
+from citrination_client import CitrinationClient
+from citrination_client.base import Transport, RetryPolicy
+from citrination_client.base.errors import CitrinationClientError, RequestTimeoutException
+from citrination_client.base import retry
+from citrination_client.search import PifSystemReturningQuery, DataQuery, DatasetQuery, PifSystemQuery, Filter, MultiQuery
+from citrination_client.search import partition
+from citrination_client.testing import FakeCitrinationServer, SyntheticCorpus
+import os
+import pytest
+import requests
+
+@pytest.fixture
+def server():
+    with FakeCitrinationServer(corpus=SyntheticCorpus(num_pifs=250, num_properties=3), max_page_size=100) as server:
+        yield server
+
+@pytest.fixture
+def client(server, monkeypatch):
+    monkeypatch.setattr(retry, "sleep", lambda seconds: None)
+    return CitrinationClient("fake-key", server.url)
+
+def test_search_is_paginated(server, client):
+    """
+    Tests that a search for more hits than a page holds is answered over
+    several requests with every PIF in the corpus
+    """
+    result = client.search.pif_search(PifSystemReturningQuery(size=1000))
+    assert result.total_num_hits == 250
+    assert [hit.system.uid for hit in result.hits] == ["pif-{}".format(i) for i in range(250)]
+    assert server.request_count("POST", "search/pif_search") == 3
+
+def test_uid_filters_are_applied(client):
+    """
+    Tests that searches filtered by UID, as made by get_pifs, return only
+    the PIFs asked for
+    """
+    query = PifSystemReturningQuery(size=10, query=DataQuery(
+        dataset=DatasetQuery(id=Filter(equal="1")),
+        system=PifSystemQuery(uid=[Filter(equal="pif-7"), Filter(equal="pif-3"), Filter(equal="nope")])))
+    assert [hit.system.uid for hit in client.search.pif_search(query).hits] == ["pif-7", "pif-3"]
+
+    results = list(client.data.get_pifs(1, ["pif-{}".format(i) for i in range(20)] + ["missing"]))
+    assert [r.pif.uid for r in results[:20]] == ["pif-{}".format(i) for i in range(20)]
+    assert not results[20].successful()
+
+def test_dataset_filters_in_lists(client):
+    """
+    Tests that dataset filters held in lists, as built by
+    generate_simple_chemical_query and the partition helpers, are applied
+    """
+    query = client.search.generate_simple_chemical_query(name="x", include_datasets=[1])
+    assert client.search.pif_search(query).total_num_hits == 250
+    query = client.search.generate_simple_chemical_query(name="x", include_datasets=[2])
+    assert client.search.pif_search(query).total_num_hits == 0
+
+    partitions = partition.partition_by_dataset(PifSystemReturningQuery(), [1, 2])
+    assert [client.search.pif_search(p).total_num_hits for p in partitions] == [250, 0]
+
+def test_malformed_queries_are_rejected(server):
+    """
+    Tests that queries of an unexpected shape are answered with a 400
+    rather than a dropped connection
+    """
+    for query in [{"query": {"dataset": "nope"}}, {"query": [{"system": [{"uid": 7}]}]}, {"query": [3]}]:
+        response = requests.post(server.url + "/api/search/pif_search", json=query)
+        assert response.status_code == 400
+
+def test_multi_search(client):
+    """
+    Tests that each query of a multi search is answered
+    """
+    queries = [PifSystemReturningQuery(size=2), PifSystemReturningQuery(size=3)]
+    result = client.search.pif_multi_search(MultiQuery(queries=queries))
+    assert [len(r.result.hits) for r in result.results] == [2, 3]
+
+def test_get_pif(client):
+    """
+    Tests that PIFs are served from the corpus, with and without a version
+    """
+    assert client.data.get_pif(1, "pif-5").uid == "pif-5"
+    assert client.data.get_pif(1, "pif-5", dataset_version=1).uid == "pif-5"
+    with pytest.raises(CitrinationClientError):
+        client.data.get_pif(1, "pif-5", dataset_version=2)
+
+def test_upload_list_and_download(client, tmpdir):
+    """
+    Tests that files uploaded to a new dataset can be listed and downloaded
+    """
+    source = tmpdir.mkdir("source")
+    source.join("a.json").write("{}")
+    source.mkdir("sub").join("b.txt").write("hello")
+    dataset = client.data.create_dataset(name="uploads")
+
+    result = client.data.upload(dataset.id, str(source), dest_path="data", max_workers=2)
+    assert result.successful()
+    assert sorted(client.data.list_files(dataset.id)) == ["data/source/a.json", "data/sub/b.txt"]
+
+    files = client.data.get_dataset_files(dataset.id)
+    paths = client.data.download_files(files, destination=str(tmpdir.join("out")))
+    with open(os.path.join(str(tmpdir.join("out")), "data", "sub", "b.txt")) as f:
+        assert f.read() == "hello"
+    assert len(paths) == 2
+
+def test_dataset_versions(server, client):
+    """
+    Tests that files are added to the latest version of a dataset
+    """
+    dataset = client.data.create_dataset(name="versioned")
+    server.add_file(dataset.id, "first.txt", b"1")
+    assert client.data.create_dataset_version(dataset.id).number == 2
+    server.add_file(dataset.id, "second.txt", b"2")
+    assert [f.path for f in client.data.get_dataset_files(dataset.id)] == ["second.txt"]
+    assert [f.path for f in client.data.get_dataset_files(dataset.id, version_number=1)] == ["first.txt"]
+
+def test_models_routes(client):
+    """
+    Tests prediction, data view retrieval and status, t-SNE and the
+    lifecycle of a design run
+    """
+    results = client.models.predict("7", [{"Property 0": "1.5", "Property 1": "2"}])
+    assert results[0].get_value("Property y").value == 3.5
+    assert client.models.get_data_view("7").name == "Synthetic data view 7"
+    assert client.models.get_data_view_service_status("7").predict.ready
+    assert len(client.models.tsne("7").get_projection("Property y").xs) == 100
+
+    run = client.models.submit_design_run("7", num_candidates=5, effort=1)
+    assert client.models.get_design_run_status("7", run.uuid).status == "Finished"
+    assert len(client.models.get_design_run_results("7", run.uuid).best_materials) == 5
+    assert client.models.kill_design_run("7", run.uuid) == run.uuid
+    assert client.models.get_design_run_status("7", run.uuid).status == "Killed"
+
+def test_injected_rate_limiting_is_retried(server, client):
+    """
+    Tests that injected 429s are retried by the client until the request
+    succeeds
+    """
+    server.inject(429, count=2, retry_after=1)
+    assert client.search.pif_search(PifSystemReturningQuery(size=5)).total_num_hits == 250
+    assert server.request_count("POST", "search/pif_search") == 3
+
+def test_injected_timeouts(server):
+    """
+    Tests that 524s are answered at the configured rate, and raised by the
+    client once its retries are exhausted
+    """
+    transport = Transport(retry_policy=RetryPolicy(max_attempts=1))
+    client = CitrinationClient("fake-key", server.url, transport=transport)
+    server.inject(524)
+    with pytest.raises(RequestTimeoutException):
+        client.models.get_data_view_service_status("1")
+
+    with FakeCitrinationServer(timeout_rate=0.5, seed=3) as flaky:
+        client = CitrinationClient("fake-key", flaky.url, transport=transport)
+        failures = 0
+        for _ in range(40):
+            try:
+                client.models.get_data_view_service_status("1")
+            except RequestTimeoutException:
+                failures += 1
+        assert 10 < failures < 30
+        assert flaky.request_count(route="data_views/{id}/status") == 40
@@ -0,0 +1,337 @@
+from citrination_client.util.files import write_atomically
+
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+import time
+
+def fingerprint(*parts):
+    """
+    Builds a cache key from strings, such as a route and a canonical JSON
+    request body.
+
+    :param parts: The strings identifying the cached value
+    :type parts: str
+    :return: A hex digest identifying the parts
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+class CacheStats(object):
+    """
+    Counts the hits and misses of a cache.
+    """
+
+    def __init__(self):
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    def record_hit(self):
+        with self._lock:
+            self._hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self._misses += 1
+
+    def record_eviction(self):
+        with self._lock:
+            self._evictions += 1
+
+    def __repr__(self):
+        return "hits={} misses={} evictions={}".format(self._hits, self._misses, self._evictions)
+
+class MemoryCache(object):
+    """
+    A thread-safe, in-memory, least recently used cache of strings, with
+    optional expiry and eviction by entry count and by total size.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None):
+        """
+        Constructor.
+
+        :param max_entries: The maximum number of entries to keep
+        :type max_entries: int
+        :param max_bytes: The maximum total length of the cached values, or
+            None for no limit
+        :type max_bytes: int
+        :param ttl: Seconds after which an entry expires, or None to keep
+            entries until they are evicted
+        :type ttl: float
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self):
+        return self._stats
+
+    @property
+    def size(self):
+        """
+        The total length of the cached values.
+        """
+        return self._size
+
+    def get(self, key):
+        """
+        Retrieves a cached value.
+
+        :param key: The key the value was cached under
+        :type key: str
+        :return: The value, or None if it is missing or has expired
+        :rtype: str
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._stats.record_miss()
+                return None
+            self._entries.pop(key)
+            self._entries[key] = entry
+            self._stats.record_hit()
+            return entry[1]
+
+    def set(self, key, value):
+        """
+        Caches a value, evicting the least recently used entries if the
+        cache is over its limits.
+
+        :param key: The key to cache the value under
+        :type key: str
+        :param value: The value to cache
+        :type value: str
+        """
+        if self._max_bytes is not None and len(value) > self._max_bytes:
+            return
+        expires_at = time.time() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value)
+            self._size += len(value)
+            while len(self._entries) > self._max_entries or \
+                    (self._max_bytes is not None and self._size > self._max_bytes):
+                self._remove(next(iter(self._entries)))
+                self._stats.record_eviction()
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        expires_at, value = self._entries.pop(key)
+        self._size -= len(value)
+
+    def __len__(self):
+        return len(self._entries)
+
+class DiskCache(object):
+    """
+    A cache of strings stored as files in a directory, so that they can
+    be shared between processes and survive restarts. Entries expire after
+    an optional time to live, and the least recently written are removed
+    when the directory grows past an optional size.
+    """
+
+    def __init__(self, directory, max_bytes=None, ttl=None):
+        """
+        Constructor.
+
+        :param directory: The directory to store entries in. It is created
+            if it does not exist.
+        :type directory: str
+        :param max_bytes: The maximum total size of the stored entries, or
+            None for no limit
+        :type max_bytes: int
+        :param ttl: Seconds after which an entry expires, or None to keep
+            entries until they are evicted
+        :type ttl: float
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        return self._stats
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def get(self, key):
+        """
+        Retrieves a stored value.
+
+        :param key: The key the value was stored under
+        :type key: str
+        :return: The value, or None if it is missing or has expired
+        :rtype: str
+        """
+        path = self._path(key)
+        try:
+            if self._ttl is not None and os.path.getmtime(path) + self._ttl < time.time():
+                os.remove(path)
+                self._stats.record_miss()
+                return None
+            with open(path, "rb") as f:
+                value = f.read().decode("utf-8")
+        except (IOError, OSError):
+            self._stats.record_miss()
+            return None
+        self._stats.record_hit()
+        return value
+
+    def set(self, key, value):
+        """
+        Stores a value, removing the oldest entries if the directory is over
+        its size limit.
+
+        :param key: The key to store the value under
+        :type key: str
+        :param value: The value to store
+        :type value: str
+        """
+        write_atomically(self._path(key), value.encode("utf-8"))
+        if self._max_bytes is not None:
+            self._evict()
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        for path in self._entry_paths():
+            _remove_quietly(path)
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for path in self._entry_paths():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self._max_bytes:
+                    break
+                _remove_quietly(path)
+                total -= size
+                self._stats.record_eviction()
+
+    def _entry_paths(self):
+        return [os.path.join(self._directory, name) for name in os.listdir(self._directory)
+                if name.endswith(".cache")]
+
+    def _path(self, key):
+        return os.path.join(self._directory, key + ".cache")
+
+class ResponseCache(object):
+    """
+    A cache of API responses: an in-memory LRU cache, optionally backed by
+    a directory of entries on disk. Values found only on disk are promoted
+    into memory.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=None, directory=None, max_disk_bytes=None):
+        """
+        Constructor.
+
+        :param max_entries: The maximum number of entries kept in memory
+        :type max_entries: int
+        :param max_bytes: The maximum total size of the entries kept in memory
+        :type max_bytes: int
+        :param ttl: Seconds after which an entry expires, or None to keep
+            entries until they are evicted
+        :type ttl: float
+        :param directory: A directory to also store entries in, or None to
+            only cache in memory
+        :type directory: str
+        :param max_disk_bytes: The maximum total size of the entries stored
+            on disk, or None for no limit
+        :type max_disk_bytes: int
+        """
+        self._memory = MemoryCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        self._disk = DiskCache(directory, max_bytes=max_disk_bytes, ttl=ttl) if directory else None
+        self._stats = CacheStats()
+
+    @property
+    def stats(self):
+        """
+        The hits and misses of the cache as a whole.
+        """
+        return self._stats
+
+    @property
+    def memory(self):
+        return self._memory
+
+    @property
+    def disk(self):
+        return self._disk
+
+    def get(self, key):
+        value = self._memory.get(key)
+        if value is None and self._disk is not None:
+            value = self._disk.get(key)
+            if value is not None:
+                self._memory.set(key, value)
+        if value is None:
+            self._stats.record_miss()
+        else:
+            self._stats.record_hit()
+        return value
+
+    def set(self, key, value):
+        self._memory.set(key, value)
+        if self._disk is not None:
+            self._disk.set(key, value)
+
+    def clear(self):
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
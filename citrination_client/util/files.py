@@ -0,0 +1,47 @@
+import hashlib
+import os
+import tempfile
+
+def write_atomically(path, data):
+    """
+    Writes a file such that readers see either its previous contents or
+    the new ones, never a partial write.
+
+    :param path: The path of the file to write
+    :type path: str
+    :param data: The contents of the file
+    :type data: bytes
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def file_digest(path, algorithm="sha256", block_size=1024 * 1024):
+    """
+    Computes the digest of a file's contents without reading it into memory
+    at once.
+
+    :param path: The path of the file
+    :type path: str
+    :param algorithm: The name of a hashlib algorithm, such as "sha256" or "md5"
+    :type algorithm: str
+    :param block_size: The number of bytes to read at a time
+    :type block_size: int
+    :return: The hex digest of the file
+    :rtype: str
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# os.replace overwrites an existing file on every platform, but is Python 3 only
+replace = getattr(os, "replace", os.rename)
@@ -0,0 +1,21 @@
+import importlib
+
+def import_optional(module_name, package_name=None):
+    """
+    Imports a dependency that is only needed by some features of the client,
+    such as NumPy for array results.
+
+    :param module_name: The name of the module to import
+    :type module_name: str
+    :param package_name: The name the module is installed under, if it
+        differs from the module name
+    :type package_name: str
+    :return: The module
+    :raises ImportError: With installation instructions, if the module is
+        not installed
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        raise ImportError("{} is required for this feature. Install it with: pip install {}".format(
+            module_name, package_name or module_name))
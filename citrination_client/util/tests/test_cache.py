@@ -0,0 +1,90 @@
+from citrination_client.util.cache import MemoryCache, DiskCache, ResponseCache, fingerprint
+import time
+
+def test_fingerprint_depends_on_every_part():
+    """
+    Tests that keys built from different parts differ, including when
+    the parts concatenate to the same string
+    """
+    assert fingerprint("a", "bc") == fingerprint("a", "bc")
+    assert fingerprint("a", "bc") != fingerprint("ab", "c")
+
+def test_memory_cache_evicts_least_recently_used():
+    """
+    Tests that once the cache is full, the entry used longest ago is
+    evicted first
+    """
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+    assert cache.stats.evictions == 1
+
+def test_memory_cache_evicts_by_size():
+    """
+    Tests that entries are evicted to keep the cache under its size limit
+    """
+    cache = MemoryCache(max_bytes=10)
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+    assert cache.get("a") is None
+    assert cache.size == 6
+    cache.set("c", "z" * 11)
+    assert cache.get("c") is None
+
+def test_memory_cache_expires_entries():
+    """
+    Tests that entries are not returned past their time to live
+    """
+    cache = MemoryCache(ttl=0.01)
+    cache.set("a", "1")
+    assert cache.get("a") == "1"
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_memory_cache_counts_hits_and_misses():
+    """
+    Tests that the stats of a cache count its lookups
+    """
+    cache = MemoryCache()
+    cache.get("a")
+    cache.set("a", "1")
+    cache.get("a")
+    cache.get("a")
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+
+def test_disk_cache_survives_new_instance(tmpdir):
+    """
+    Tests that entries stored on disk can be read by another cache
+    using the same directory
+    """
+    DiskCache(str(tmpdir)).set("a", u"ångström")
+    assert DiskCache(str(tmpdir)).get("a") == u"ångström"
+
+def test_disk_cache_evicts_oldest(tmpdir):
+    """
+    Tests that the oldest entries are removed when the directory grows
+    past its size limit
+    """
+    cache = DiskCache(str(tmpdir), max_bytes=10)
+    cache.set("a", "x" * 6)
+    time.sleep(0.01)
+    cache.set("b", "y" * 6)
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 6
+
+def test_response_cache_promotes_disk_entries(tmpdir):
+    """
+    Tests that an entry found on disk is copied into memory
+    """
+    ResponseCache(directory=str(tmpdir)).set("a", "1")
+    cache = ResponseCache(directory=str(tmpdir))
+    assert cache.get("a") == "1"
+    assert cache.memory.get("a") == "1"
+    assert cache.stats.hits == 1
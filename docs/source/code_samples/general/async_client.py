@@ -0,0 +1,15 @@
+import asyncio
+from citrination_client import PifSystemReturningQuery, DataQuery, DatasetQuery, Filter
+from citrination_client.aio import AsyncCitrinationClient
+
+async def count_records(client, dataset_ids):
+    queries = [
+        PifSystemReturningQuery(size=0, query=DataQuery(dataset=DatasetQuery(id=Filter(equal=i))))
+        for i in dataset_ids
+    ]
+    results = await asyncio.gather(*[client.search.pif_search(q) for q in queries])
+    return [r.total_num_hits for r in results]
+
+client = AsyncCitrinationClient("my_api_key", max_concurrency=64)
+counts = asyncio.run(count_records(client, ["1160", "150670"]))
+client.close()
@@ -9,13 +9,28 @@ setup(name='citrination-client',
           'requests<3',
           'pypif',
           'six<2',
-          'pyyaml'
+          'pyyaml',
+          'futures; python_version < "3"'
       ],
       extras_require={
         "dev": [
           'sphinx_rtd_theme',
           'sphinx',
         ],
+        "columnar": [
+          'numpy',
+          'pandas',
+          'pyarrow',
+        ],
+        "prometheus": [
+          'prometheus_client',
+        ],
+        "opentelemetry": [
+          'opentelemetry-api',
+        ],
+        "fast": [
+          'orjson; python_version >= "3.6"',
+        ],
         "test": [
           'requests_mock',
           'pytest',